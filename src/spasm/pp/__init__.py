@@ -19,6 +19,14 @@ If not, see <https://www.gnu.org/licenses/>. 
 ---
 """
 
-from .cli import PrettyPrinterCli
-
 __all__ = ["PrettyPrinterCli"]
+
+
+def __getattr__(name: str):
+    # the command line interface is imported on first use, thus importing e.g. `spasm.pp.processor`
+    # does not import it
+    if name == "PrettyPrinterCli":
+        from .cli import PrettyPrinterCli
+
+        return PrettyPrinterCli
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,637 @@
+"""
+---
+(c) 2024 David SPORN
+---
+This is part of SPASM -- Sporniket's toolbox for assembly language.
+
+SPASM is free software: you can redistribute it and/or
+modify it under the terms of the GNU General Public License as published by the
+Free Software Foundation, either version 3 of the License, or (at your option)
+any later version.
+
+SPASM is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY
+or FITNESS FOR A PARTICULAR PURPOSE.
+
+See the GNU General Public License for more details.
+You should have received a copy of the GNU General Public License along with SPASM.
+If not, see <https://www.gnu.org/licenses/>. 
+---
+"""
+
+import os
+from collections import deque
+from itertools import tee
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+from .cache import FormattedFilesCache, TextDigest, fingerprint_of
+from .processor import PARSER_ENGINES, RENDERER_ENGINES, SourceProcessor
+from .stats import InstrumentedSourceProcessor, ProcessingStats
+
+# errors that are reported for a given file, instead of stopping everything
+ERRORS_OF_FILES = (OSError, UnicodeError, ValueError)
+
+# what to do with each file :
+# * output the formatted file
+MODE__FORMAT = "format"
+# * replace the file by its formatted version when there is a difference
+MODE__REWRITE = "rewrite"
+# * find the first line that would be changed
+MODE__CHECK = "check"
+# * output the unified diff between the file and its formatted version
+MODE__DIFF = "diff"
+
+# count of unchanged lines around the changed lines of a diff
+SIZE_OF_DIFF_CONTEXT = 3
+
+
+class SourceFileFormatter:
+    """Formats whole source files, one after the other, each file starting with a fresh state.
+
+    When a range of lines is given, only the lines whose index (starting from 0) is inside this
+    range are processed, the other lines are left untouched (see
+    `SourceProcessor.process_line_range`).
+    """
+
+    def __init__(self, processor: SourceProcessor, stylesheet, lineRange: range = None):
+        self._processor = processor
+        self._stylesheet = stylesheet
+        self._lineRange = lineRange
+
+    def processLines(self, lines: List[str]) -> List[str]:
+        """The processed lines, starting from a fresh state."""
+        if self._lineRange is not None:
+            return list(self.iterateProcessedLines(lines))
+        self._processor.reset()
+        return [self._processor.process_line(line, self._stylesheet) for line in lines]
+
+    def iterateProcessedLines(self, lines: Iterable[str]) -> Iterator[str]:
+        """The processed lines, starting from a fresh state, each line being read and processed
+        while iterating."""
+        if self._lineRange is not None:
+            return self._processor.process_line_range(
+                lines, self._lineRange, self._stylesheet
+            )
+        return self._iterateProcessedLines(lines)
+
+    def _iterateProcessedLines(self, lines: Iterable[str]) -> Iterator[str]:
+        self._processor.reset()
+        for line in lines:
+            yield self._processor.process_line(line, self._stylesheet)
+
+    def format(self, source: str) -> str:
+        """The formatted file, as output in normal mode : each line, then an empty line."""
+        with open(source, "rt") as f:
+            lines = f.readlines()
+        result = self.processLines(lines)
+        result.append("")
+        result.append("")
+        return "\n".join(result)
+
+    def formatLines(self, source: str) -> Iterator[str]:
+        """The lines of the formatted file, as output in normal mode, each one with its line feed.
+
+        The file is read at once, thus reading errors are raised right away, whereas the lines are
+        processed while iterating.
+        """
+        with open(source, "rt") as f:
+            lines = f.readlines()
+        return self._iterateFormattedLines(lines)
+
+    def _iterateFormattedLines(self, lines: List[str]) -> Iterator[str]:
+        for processedLine in self.iterateProcessedLines(lines):
+            yield processedLine + "\n"
+        yield "\n"
+
+    def compareLines(self, lines: Iterable[str]) -> Iterator[Tuple[str, str]]:
+        """Pairs of each source line with its processed version, see `is_same_line`, each line
+        being read and processed while iterating."""
+        sourceLines, linesToProcess = tee(lines)
+        return zip(sourceLines, self.iterateProcessedLines(linesToProcess))
+
+    def check(self, source: str) -> Optional[int]:
+        """The number (starting from 1) of the first line that would be changed by formatting the
+        file, or None ; the remaining lines are NOT processed."""
+        return self._check(source)[0]
+
+    def _check(self, source: str) -> Tuple[Optional[int], Optional[dict]]:
+        # the fingerprint of a formatted file, see `_rewrite`
+        digest = TextDigest()
+        with open(source, "rt") as f:
+            stat = os.fstat(f.fileno())
+            for number, (line, processedLine) in enumerate(self.compareLines(f), 1):
+                if not is_same_line(line, processedLine):
+                    return number, None
+                digest.update(line)
+        return None, fingerprint_of(stat, digest.hexdigest())
+
+    def diff(self, source: str) -> Iterator[str]:
+        """The lines of the unified diff between the file and its formatted version, see
+        `unified_diff`.
+
+        The file is opened right away, thus opening errors are raised right away, whereas the lines
+        are read, processed and compared while iterating.
+        """
+        f = open(source, "rt")
+        return self._iterateDiff(f, source)
+
+    def _iterateDiff(self, f, source: str) -> Iterator[str]:
+        with f:
+            yield from unified_diff(self.compareLines(f), source)
+
+    def rewrite(self, source: str) -> bool:
+        """Replace the file by its formatted version WHEN THERE IS A DIFFERENCE, returns True in such a case."""
+        return self._rewrite(source)[0] is not None
+
+    def _rewrite(self, source: str) -> Tuple[Optional[int], dict]:
+        # The file is read and processed line by line, and nothing is written until a difference is
+        # found ; then the formatted file is written into a temporary file that replaces the source
+        # file at the end, thus a source file is never left half-written.
+        #
+        # The fingerprint describes the formatted file, the stat being taken BEFORE reading an
+        # unchanged file, thus a later modification cannot be mistaken for a formatted content.
+        target = os.path.realpath(source)
+        digest = TextDigest()
+        output = None
+        try:
+            with open(target, "rt") as f:
+                stat = os.fstat(f.fileno())
+                countOfSameLines = 0
+                for line, processedLine in self.compareLines(f):
+                    if output is None:
+                        if is_same_line(line, processedLine):
+                            digest.update(line)
+                            countOfSameLines += 1
+                            continue
+                        output = _TemporaryCopy(target, countOfSameLines)
+                    processedLine += "\n"
+                    output.write(processedLine)
+                    digest.update(processedLine)
+            if output is None:
+                return None, fingerprint_of(stat, digest.hexdigest())
+            output.commit()
+            return countOfSameLines + 1, fingerprint_of(
+                os.stat(target), digest.hexdigest()
+            )
+        finally:
+            if output is not None:
+                output.discard()
+
+    def perform(
+        self, source: str, mode: str = MODE__FORMAT, lazy: bool = False
+    ) -> dict:
+        """Either format, rewrite or check the given file (see `MODE__...`), reporting any problem
+        instead of raising it.
+
+        Returns:
+            dict: `path`, `output` (format and diff modes, the lines from `formatLines` or `diff`
+            when `lazy`),
+            `firstDifference` (the number of the first changed line, or None), `rewritten` (rewrite
+            mode), `fingerprint` of the file when it is formatted (rewrite and check modes),
+            `skipped` (known to be formatted, see `format_files`) and `error` (None when there is
+            none).
+
+        The observers of the processor, if any, are told of the start and end of the file ; a lazy
+        output ends the file once consumed.
+        """
+        result = _result_of(source)
+        self._processor.start_file(source)
+        try:
+            if mode == MODE__REWRITE:
+                result["firstDifference"], result["fingerprint"] = self._rewrite(source)
+                result["rewritten"] = result["firstDifference"] is not None
+            elif mode == MODE__CHECK:
+                result["firstDifference"], result["fingerprint"] = self._check(source)
+            elif mode == MODE__DIFF:
+                result["output"] = (
+                    self.diff(source) if lazy else "".join(self.diff(source))
+                )
+            else:
+                result["output"] = (
+                    self.formatLines(source) if lazy else self.format(source)
+                )
+        except ERRORS_OF_FILES as e:
+            result["error"] = str(e)
+        if lazy and result["output"] is not None and self._processor.has_observers():
+            result["output"] = self._endFileAfter(result["output"], source)
+        else:
+            self._processor.end_file(source)
+        return result
+
+    def _endFileAfter(self, output: Iterator[str], source: str) -> Iterator[str]:
+        try:
+            yield from output
+        finally:
+            self._processor.end_file(source)
+
+
+def is_same_line(line: str, processedLine: str) -> bool:
+    """True when the processed line does not change the given source line."""
+    # -- remove trailing "\n"
+    # -- because it triggers false difference
+    return processedLine == (line[:-1] if line.endswith("\n") else line)
+
+
+def unified_diff(
+    pairs: Iterable[Tuple[str, str]],
+    path: str,
+    *,
+    context: int = SIZE_OF_DIFF_CONTEXT,
+) -> Iterator[str]:
+    """The lines of the unified diff, each one with its line feed, from the given pairs of each
+    source line with its processed version (see `SourceFileFormatter.compareLines`).
+
+    As each source line gives exactly one processed line, the changed lines are compared one to one,
+    and only the lines of the current hunk are kept, instead of both versions of the file ; thus a
+    file changed everywhere is kept in a single hunk. Nothing is yielded when there is no
+    difference.
+
+    A last line without line feed is changed too when there is another difference, as rewriting
+    the file adds a line feed to it (see `SourceFileFormatter.rewrite`).
+    """
+    before = deque(maxlen=context)  # unchanged lines before the next hunk
+    hunk = []  # rows (number, line, processedLine, isSame) of the current hunk
+    countOfTrailingSameLines = 0
+    isFirstHunk = True
+    for number, (line, processedLine) in enumerate(pairs, 1):
+        isSame = is_same_line(line, processedLine) and (
+            line.endswith("\n") or (isFirstHunk and len(hunk) == 0)
+        )
+        if len(hunk) == 0:
+            if isSame:
+                before.append((number, line, processedLine, True))
+                continue
+            hunk.extend(before)
+            before.clear()
+        hunk.append((number, line, processedLine, isSame))
+        countOfTrailingSameLines = countOfTrailingSameLines + 1 if isSame else 0
+        if countOfTrailingSameLines > 2 * context:
+            # the next changed line, if any, will be in another hunk
+            before.extend(hunk[len(hunk) - context :])
+            del hunk[len(hunk) - context - 1 :]
+            if isFirstHunk:
+                yield f"--- {path}\n+++ {path}\n"
+                isFirstHunk = False
+            yield from _lines_of_hunk(hunk)
+            hunk = []
+            countOfTrailingSameLines = 0
+    if len(hunk) > 0:
+        if countOfTrailingSameLines > context:
+            del hunk[len(hunk) - countOfTrailingSameLines + context :]
+        if isFirstHunk:
+            yield f"--- {path}\n+++ {path}\n"
+        yield from _lines_of_hunk(hunk)
+
+
+def _lines_of_hunk(hunk: list) -> Iterator[str]:
+    start = hunk[0][0]
+    size = f"{start}" if len(hunk) == 1 else f"{start},{len(hunk)}"
+    yield f"@@ -{size} +{size} @@\n"
+    removed = []
+    added = []
+    for _, line, processedLine, isSame in hunk:
+        if isSame:
+            yield from removed
+            yield from added
+            removed.clear()
+            added.clear()
+            yield f" {processedLine}\n"
+        else:
+            removed.append(
+                f"-{line}"
+                if line.endswith("\n")
+                else f"-{line}\n\\ No newline at end of file\n"
+            )
+            added.append(f"+{processedLine}\n")
+    yield from removed
+    yield from added
+
+
+def _result_of(source: str, **values) -> dict:
+    result = {
+        "path": source,
+        "output": None,
+        "firstDifference": None,
+        "rewritten": False,
+        "fingerprint": None,
+        "skipped": False,
+        "error": None,
+    }
+    result.update(values)
+    return result
+
+
+class _TemporaryCopy:
+    """Temporary file in the directory of the given file, starting with the given count of lines of
+    this file, that replaces it when committed."""
+
+    def __init__(self, target: str, countOfLines: int):
+        import tempfile
+
+        self._target = target
+        directory, name = os.path.split(target)
+        fd, self._path = tempfile.mkstemp(
+            dir=directory, prefix=f".{name}.", suffix=".tmp"
+        )
+        self._file = os.fdopen(fd, "wt")
+        try:
+            with open(target, "rt") as f:
+                for _ in range(countOfLines):
+                    self._file.write(f.readline())
+        except BaseException:
+            self.discard()
+            raise
+
+    def write(self, text: str):
+        self._file.write(text)
+
+    def commit(self):
+        import shutil
+
+        self._file.close()
+        shutil.copymode(self._target, self._path)
+        os.replace(self._path, self._target)
+        self._path = None
+
+    def discard(self):
+        """Remove the temporary file, unless it has been committed."""
+        self._file.close()
+        if self._path is not None:
+            os.unlink(self._path)
+            self._path = None
+
+
+##############################################
+# Parallel processing
+##############################################
+
+
+def split_at_state_resets(
+    lines: List[str], linesPerChunk: int, processor: SourceProcessor
+) -> List[range]:
+    """Split the given lines into chunks of about `linesPerChunk` lines.
+
+    Each chunk, but the first one, starts right after a line that resets the state of the
+    processor, thus each chunk can be processed from a fresh state independently of the others.
+    """
+    result = []
+    start = 0
+    countOfLines = len(lines)
+    while start < countOfLines:
+        end = start + linesPerChunk
+        while end < countOfLines and not processor.is_state_reset_line(lines[end - 1]):
+            end += 1
+        end = min(end, countOfLines)
+        result.append(range(start, end))
+        start = end
+    return result
+
+
+class ChunkedSourceFileFormatter(SourceFileFormatter):
+    """Formats each source file by splitting it into chunks (see `split_at_state_resets`) that are
+    processed by the workers of the given executor, then stitched back in order.
+
+    When stats are given, the workers send the stats of each chunk along with it (see
+    `ProcessingStats.pop`), that are merged into the given stats."""
+
+    def __init__(
+        self,
+        processor: SourceProcessor,
+        stylesheet,
+        executor,
+        linesPerChunk: int,
+        stats: ProcessingStats = None,
+    ):
+        super().__init__(processor, stylesheet)
+        self._executor = executor
+        self._linesPerChunk = linesPerChunk
+        self._stats = stats
+
+    def iterateProcessedLines(self, lines: Iterable[str]) -> Iterator[str]:
+        # all the lines are needed to split them into chunks
+        return iter(self.processLines(list(lines)))
+
+    def processLines(self, lines: List[str]) -> List[str]:
+        chunks = split_at_state_resets(lines, self._linesPerChunk, self._processor)
+        if len(chunks) <= 1:
+            return super().processLines(lines)
+        result = []
+        chunksOfLines = [lines[c.start : c.stop] for c in chunks]
+        if self._stats is None:
+            for processedChunk in self._executor.map(
+                _process_lines_in_worker, chunksOfLines
+            ):
+                result += processedChunk
+            return result
+        for processedChunk, stats in self._executor.map(
+            _process_lines_with_stats_in_worker, chunksOfLines
+        ):
+            result += processedChunk
+            self._stats.merge(stats)
+        return result
+
+
+def _create_processor(
+    parserEngine: str, rendererEngine: str, stats: ProcessingStats = None
+) -> SourceProcessor:
+    parser = PARSER_ENGINES[parserEngine]()
+    renderer = RENDERER_ENGINES[rendererEngine]()
+    if stats is None:
+        return SourceProcessor(parser=parser, renderer=renderer)
+    return InstrumentedSourceProcessor(stats, parser=parser, renderer=renderer)
+
+
+def _create_formatter(
+    stylesheet,
+    parserEngine: str,
+    rendererEngine: str,
+    lineRange: range = None,
+    stats: ProcessingStats = None,
+):
+    return SourceFileFormatter(
+        _create_processor(parserEngine, rendererEngine, stats), stylesheet, lineRange
+    )
+
+
+_formatterOfWorker = None
+_statsOfWorker = None
+
+
+def _initialize_worker(
+    stylesheet,
+    parserEngine: str,
+    rendererEngine: str,
+    lineRange: range = None,
+    withStats: bool = False,
+):
+    global _formatterOfWorker, _statsOfWorker
+    if withStats:
+        _statsOfWorker = ProcessingStats()
+    _formatterOfWorker = _create_formatter(
+        stylesheet, parserEngine, rendererEngine, lineRange, _statsOfWorker
+    )
+
+
+def _perform_in_worker(task) -> dict:
+    source, mode = task
+    if _statsOfWorker is None:
+        return _formatterOfWorker.perform(source, mode)
+    result = _statsOfWorker.performOn(_formatterOfWorker, source, mode)
+    result["stats"] = _statsOfWorker.pop()
+    return result
+
+
+def _process_lines_in_worker(lines: List[str]) -> List[str]:
+    return _formatterOfWorker.processLines(lines)
+
+
+def _process_lines_with_stats_in_worker(lines: List[str]):
+    return _formatterOfWorker.processLines(lines), _statsOfWorker.pop()
+
+
+def format_files(
+    sources: List[str],
+    stylesheet,
+    *,
+    mode: str = MODE__FORMAT,
+    jobs: int = 1,
+    linesPerChunk: int = 0,
+    parserEngine: str = "state-machine",
+    rendererEngine: str = "slicing",
+    cache: FormattedFilesCache = None,
+    lazy: bool = False,
+    lineRange: range = None,
+    stats: ProcessingStats = None,
+) -> Iterator[dict]:
+    """Format, rewrite or check the given files (see `MODE__...`), using up to `jobs` worker
+    processes.
+
+    When `linesPerChunk` is greater than 0, the files are processed one after the other, each file
+    being split into chunks of about this count of lines that are processed in parallel ; otherwise
+    the files themselves are processed in parallel.
+
+    Unless in format mode, the files known by the given cache to be already formatted are skipped,
+    and the formatted files are remembered by the cache ; saving the cache is up to the caller.
+
+    When `lazy` and the files are processed one after the other in format mode, the output of each
+    file is an iterator over its formatted lines (see `SourceFileFormatter.formatLines`), that MUST
+    be consumed before getting the next result.
+
+    When a range of lines is given, only those lines of each file are processed ; then the files are
+    neither split into chunks, nor looked up in the cache.
+
+    When stats are given (see `ProcessingStats`), the lines and the files are measured into them,
+    including by the workers ; otherwise the processing is not instrumented at all. Counting the
+    results is up to the caller (see `ProcessingStats.countResult`).
+
+    Yields the result of each file (see `SourceFileFormatter.perform`), IN THE ORDER OF THE GIVEN FILES.
+    """
+    if lineRange is not None:
+        linesPerChunk = 0
+        cache = None
+    options = (
+        stylesheet,
+        mode,
+        jobs,
+        linesPerChunk,
+        parserEngine,
+        rendererEngine,
+        lazy,
+        lineRange,
+        stats,
+    )
+    if cache is None or mode == MODE__FORMAT:
+        yield from _format_files(sources, *options)
+        return
+
+    isSkipped = [cache.isFormatted(source) for source in sources]
+    pending = [source for i, source in enumerate(sources) if not isSkipped[i]]
+    index = 0
+    for result in _format_files(pending, *options):
+        while isSkipped[index]:
+            yield _skipped_result(sources[index])
+            index += 1
+        if result["fingerprint"] is not None:
+            cache.remember(result["path"], result["fingerprint"])
+        yield result
+        index += 1
+    for source in sources[index:]:
+        yield _skipped_result(source)
+
+
+def _skipped_result(source: str) -> dict:
+    return _result_of(source, skipped=True)
+
+
+def _format_files(
+    sources: List[str],
+    stylesheet,
+    mode: str,
+    jobs: int,
+    linesPerChunk: int,
+    parserEngine: str,
+    rendererEngine: str,
+    lazy: bool,
+    lineRange: range,
+    stats: Optional[ProcessingStats],
+) -> Iterator[dict]:
+    if jobs <= 1 or (len(sources) <= 1 and linesPerChunk <= 0):
+        formatter = _create_formatter(
+            stylesheet, parserEngine, rendererEngine, lineRange, stats
+        )
+        for source in sources:
+            yield (
+                formatter.perform(source, mode, lazy)
+                if stats is None
+                else stats.performOn(formatter, source, mode, lazy)
+            )
+        return
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    workers = jobs if linesPerChunk > 0 else min(jobs, len(sources))
+    executor = ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_initialize_worker,
+        initargs=(
+            stylesheet,
+            parserEngine,
+            rendererEngine,
+            lineRange,
+            stats is not None,
+        ),
+    )
+    # when the consumer stops early (e.g. broken output), do not process the remaining files
+    try:
+        if linesPerChunk > 0:
+            formatter = ChunkedSourceFileFormatter(
+                _create_processor(parserEngine, rendererEngine, stats),
+                stylesheet,
+                executor,
+                linesPerChunk,
+                stats,
+            )
+            for source in sources:
+                yield (
+                    formatter.perform(source, mode)
+                    if stats is None
+                    else stats.performOn(formatter, source, mode)
+                )
+        else:
+            results = executor.map(
+                _perform_in_worker,
+                [(source, mode) for source in sources],
+                chunksize=max(1, len(sources) // (workers * 4)),
+            )
+            if stats is None:
+                yield from results
+                return
+            for result in results:
+                stats.merge(result.pop("stats"))
+                yield result
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+def default_count_of_jobs() -> int:
+    return os.cpu_count() or 1
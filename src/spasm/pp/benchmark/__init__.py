@@ -0,0 +1,31 @@
+"""
+---
+(c) 2024 David SPORN
+---
+This is part of SPASM -- Sporniket's toolbox for assembly language.
+
+SPASM is free software: you can redistribute it and/or
+modify it under the terms of the GNU General Public License as published by the
+Free Software Foundation, either version 3 of the License, or (at your option)
+any later version.
+
+SPASM is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY
+or FITNESS FOR A PARTICULAR PURPOSE.
+
+See the GNU General Public License for more details.
+You should have received a copy of the GNU General Public License along with SPASM.
+If not, see <https://www.gnu.org/licenses/>. 
+---
+"""
+
+from .corpus import DEFAULT_SEED, generate_lines
+from .suite import BENCHMARKS, STYLESHEETS, BenchmarkSuite
+
+__all__ = [
+    "BENCHMARKS",
+    "DEFAULT_SEED",
+    "STYLESHEETS",
+    "BenchmarkSuite",
+    "generate_lines",
+]
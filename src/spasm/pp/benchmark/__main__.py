@@ -0,0 +1,168 @@
+"""
+---
+(c) 2024 David SPORN
+---
+This is part of SPASM -- Sporniket's toolbox for assembly language.
+
+SPASM is free software: you can redistribute it and/or
+modify it under the terms of the GNU General Public License as published by the
+Free Software Foundation, either version 3 of the License, or (at your option)
+any later version.
+
+SPASM is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY
+or FITNESS FOR A PARTICULAR PURPOSE.
+
+See the GNU General Public License for more details.
+You should have received a copy of the GNU General Public License along with SPASM.
+If not, see <https://www.gnu.org/licenses/>. 
+---
+"""
+
+import json
+import sys
+from argparse import ArgumentParser, RawDescriptionHelpFormatter
+from typing import List
+
+from ..processor import PARSER_ENGINES, RENDERER_ENGINES
+from .corpus import DEFAULT_SEED
+from .suite import BENCHMARKS, STYLESHEETS, BenchmarkSuite
+
+HEADER_OF_TABLE = (
+    f"{'benchmark':<10}{'stylesheet':<12}{'lines/s':>12}{'MB/s':>9}{'median':>12}"
+)
+
+
+def line_of_table(result: dict) -> str:
+    return (
+        f"{result['benchmark']:<10}{result['stylesheet'] or '-':<12}"
+        f"{result['linesPerSecond']:>12,.0f}{result['megabytesPerSecond']:>9.2f}"
+        f"{result['median'] * 1000:>10.1f}ms"
+    )
+
+
+class BenchmarkCli:
+    @staticmethod
+    def createArgParser() -> ArgumentParser:
+        parser = ArgumentParser(
+            prog="python3 -m spasm.pp.benchmark",
+            description="Measures the throughput of the pretty printer on a synthetic corpus.",
+            formatter_class=RawDescriptionHelpFormatter,
+            allow_abbrev=False,
+        )
+        parser.add_argument(
+            "--lines",
+            metavar="<count>",
+            type=int,
+            default=20000,
+            help="the count of lines of the corpus, defaults to 20000",
+        )
+        parser.add_argument(
+            "--seed",
+            metavar="<seed>",
+            type=int,
+            default=DEFAULT_SEED,
+            help=f"the seed of the generated corpus, defaults to {DEFAULT_SEED}",
+        )
+        parser.add_argument(
+            "--repeat",
+            metavar="<count>",
+            type=int,
+            default=5,
+            help="the count of measured runs of each benchmark, after a warm up run, defaults to 5",
+        )
+        parser.add_argument(
+            "--files",
+            metavar="<count>",
+            type=int,
+            default=8,
+            help="the count of files the corpus is split into for the rewrite benchmark, defaults to 8",
+        )
+        parser.add_argument(
+            "--benchmarks",
+            metavar="<names>",
+            type=str,
+            default=",".join(BENCHMARKS),
+            help=f"comma separated list of benchmarks to run, among {', '.join(BENCHMARKS)} (the default)",
+        )
+        parser.add_argument(
+            "--stylesheets",
+            metavar="<names>",
+            type=str,
+            default=",".join(STYLESHEETS),
+            help=f"comma separated list of builtin stylesheets, among {', '.join(STYLESHEETS)} (the default)",
+        )
+        parser.add_argument(
+            "--parser",
+            metavar="<engine>",
+            choices=list(PARSER_ENGINES),
+            default="state-machine",
+            help="the engine that parses statement lines, defaults to 'state-machine'",
+        )
+        parser.add_argument(
+            "--renderer",
+            metavar="<engine>",
+            choices=list(RENDERER_ENGINES),
+            default="slicing",
+            help="the engine that renders statement lines, defaults to 'slicing'",
+        )
+        parser.add_argument(
+            "--output",
+            metavar="<json file>",
+            type=str,
+            help="write the results into the given JSON file",
+        )
+        return parser
+
+    def retrieveNames(self, spec: str, allowed: List[str], name: str) -> List[str]:
+        result = [n.strip() for n in spec.split(",")]
+        if len(result) == 0 or any(n not in allowed for n in result):
+            raise ValueError(f"ERROR -- wrong value '{spec}' for parameter '{name}'")
+        return result
+
+    def run(self, argv: List[str] = None) -> int:
+        try:
+            args = BenchmarkCli.createArgParser().parse_args(argv)
+            for name in ["lines", "repeat", "files"]:
+                if getattr(args, name) < 1:
+                    raise ValueError(
+                        f"ERROR -- wrong value '{getattr(args, name)}' for parameter '{name}'"
+                    )
+            benchmarks = self.retrieveNames(args.benchmarks, BENCHMARKS, "benchmarks")
+            stylesheets = self.retrieveNames(
+                args.stylesheets, list(STYLESHEETS), "stylesheets"
+            )
+        except ValueError as e:
+            print(e, file=sys.stderr)
+            return 1
+
+        suite = BenchmarkSuite(
+            countOfLines=args.lines,
+            seed=args.seed,
+            repeat=args.repeat,
+            countOfFiles=args.files,
+            parserEngine=args.parser,
+            rendererEngine=args.renderer,
+        )
+        print(HEADER_OF_TABLE, flush=True)
+        results = suite.run(
+            benchmarks,
+            stylesheets,
+            lambda result: print(line_of_table(result), flush=True),
+        )
+        if args.output is not None:
+            try:
+                with open(args.output, "wt", encoding="utf-8") as f:
+                    json.dump(results, f, indent=2)
+            except OSError as e:
+                print(f"ERROR -- cannot write the results : {e}", file=sys.stderr)
+                return 1
+        return 0
+
+
+def main():
+    sys.exit(BenchmarkCli().run())
+
+
+if __name__ == "__main__":
+    main()
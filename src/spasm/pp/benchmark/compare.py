@@ -0,0 +1,323 @@
+"""
+---
+(c) 2024 David SPORN
+---
+This is part of SPASM -- Sporniket's toolbox for assembly language.
+
+SPASM is free software: you can redistribute it and/or
+modify it under the terms of the GNU General Public License as published by the
+Free Software Foundation, either version 3 of the License, or (at your option)
+any later version.
+
+SPASM is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY
+or FITNESS FOR A PARTICULAR PURPOSE.
+
+See the GNU General Public License for more details.
+You should have received a copy of the GNU General Public License along with SPASM.
+If not, see <https://www.gnu.org/licenses/>. 
+---
+"""
+
+import json
+import statistics
+import sys
+from argparse import ArgumentParser, RawDescriptionHelpFormatter
+from typing import List
+
+from .suite import VERSION_OF_RESULTS, BenchmarkSuite
+
+# default slowdown of a median duration, in percent, that is a regression
+DEFAULT_THRESHOLD = 10.0
+
+STATUS__OK = "ok"
+STATUS__REGRESSION = "REGRESSION"
+STATUS__IMPROVEMENT = "improvement"
+STATUS__MISSING = "missing"
+
+HEADER_OF_TABLE = (
+    f"{'benchmark':<10}{'stylesheet':<12}{'baseline':>18}{'current':>18}"
+    f"{'change':>9}  status"
+)
+
+
+def spread_of(timings: List[float]) -> float:
+    """The median absolute deviation of the given durations, that is robust to outliers."""
+    median = statistics.median(timings)
+    return statistics.median(abs(t - median) for t in timings)
+
+
+def key_of(result: dict) -> tuple:
+    return (result["benchmark"], result["stylesheet"])
+
+
+def compare_results(baseline: dict, current: dict, threshold: float) -> List[dict]:
+    """Compares the median durations of each benchmark and stylesheet of the baseline with the
+    current ones.
+
+    A metric regresses when its median duration is slower than the baseline one by more than the
+    given threshold (in percent), AND the slowdown is greater than the noise, i.e. the sum of the
+    spreads of both runs (see `spread_of`) ; the improvements are detected the same way.
+    """
+    currentResults = {key_of(r): r for r in current["results"]}
+    result = []
+    for base in baseline["results"]:
+        comparison = {
+            "benchmark": base["benchmark"],
+            "stylesheet": base["stylesheet"],
+            "baseline": statistics.median(base["timings"]),
+            "baselineSpread": spread_of(base["timings"]),
+            "current": None,
+            "currentSpread": None,
+            "change": None,
+            "status": STATUS__MISSING,
+        }
+        result.append(comparison)
+        other = currentResults.get(key_of(base))
+        if other is None:
+            continue
+        comparison["current"] = statistics.median(other["timings"])
+        comparison["currentSpread"] = spread_of(other["timings"])
+        difference = comparison["current"] - comparison["baseline"]
+        comparison["change"] = difference / comparison["baseline"] * 100
+        noise = comparison["baselineSpread"] + comparison["currentSpread"]
+        if abs(comparison["change"]) <= threshold or abs(difference) <= noise:
+            comparison["status"] = STATUS__OK
+        elif difference > 0:
+            comparison["status"] = STATUS__REGRESSION
+        else:
+            comparison["status"] = STATUS__IMPROVEMENT
+    return result
+
+
+def line_of_table(comparison: dict) -> str:
+    def duration(median, spread) -> str:
+        if median is None:
+            return "-"
+        return f"{median * 1000:.1f}±{spread * 1000:.1f}ms"
+
+    change = "-" if comparison["change"] is None else f"{comparison['change']:+.1f}%"
+    return (
+        f"{comparison['benchmark']:<10}{comparison['stylesheet'] or '-':<12}"
+        f"{duration(comparison['baseline'], comparison['baselineSpread']):>18}"
+        f"{duration(comparison['current'], comparison['currentSpread']):>18}"
+        f"{change:>9}  {comparison['status']}"
+    )
+
+
+def is_duration(value) -> bool:
+    return (
+        isinstance(value, (int, float)) and not isinstance(value, bool) and value >= 0
+    )
+
+
+def check_results(results: dict, name: str):
+    """Raises a `ValueError` when the given results, named for the error messages, are not well
+    formed, e.g. a hand-edited or truncated file ; the median of each timings MUST be positive to
+    compute a relative change."""
+    if not isinstance(results, dict):
+        raise ValueError(f"ERROR -- wrong {name} results, not a JSON object")
+    corpus = results.get("corpus")
+    if not isinstance(corpus, dict) or any(
+        not isinstance(corpus.get(k), int) for k in ["lines", "seed"]
+    ):
+        raise ValueError(
+            f"ERROR -- wrong {name} results, 'corpus' must give the 'lines' and 'seed' integers"
+        )
+    if any(not isinstance(results.get(k), str) for k in ["parser", "renderer"]):
+        raise ValueError(
+            f"ERROR -- wrong {name} results, 'parser' and 'renderer' must be given"
+        )
+    if not isinstance(results.get("repeat"), int) or results["repeat"] < 1:
+        raise ValueError(
+            f"ERROR -- wrong {name} results, 'repeat' must be a positive integer"
+        )
+    if not isinstance(results.get("results"), list):
+        raise ValueError(f"ERROR -- wrong {name} results, 'results' must be a list")
+    for index, result in enumerate(results["results"]):
+        if (
+            not isinstance(result, dict)
+            or not isinstance(result.get("benchmark"), str)
+            or not isinstance(result.get("stylesheet"), (str, type(None)))
+        ):
+            raise ValueError(
+                f"ERROR -- wrong {name} results, the result #{index} must give the 'benchmark' and 'stylesheet' names"
+            )
+        timings = result.get("timings")
+        if (
+            not isinstance(timings, list)
+            or len(timings) == 0
+            or not all(is_duration(t) for t in timings)
+        ):
+            raise ValueError(
+                f"ERROR -- wrong {name} results, the timings of {result['benchmark']} ({result['stylesheet'] or '-'}) must be a non-empty list of durations"
+            )
+        if statistics.median(timings) <= 0:
+            raise ValueError(
+                f"ERROR -- wrong {name} results, the median duration of {result['benchmark']} ({result['stylesheet'] or '-'}) must be positive"
+            )
+
+
+def check_comparable(baseline: dict, current: dict):
+    """Raises a `ValueError` when the given results are not well formed (see `check_results`) or
+    have not been measured the same way."""
+    check_results(baseline, "baseline")
+    check_results(current, "current")
+    for results in [baseline, current]:
+        if results.get("version") != VERSION_OF_RESULTS:
+            raise ValueError(
+                f"ERROR -- unsupported version of results : {results.get('version')}"
+            )
+    for name in ["corpus", "parser", "renderer"]:
+        if baseline.get(name) != current.get(name):
+            raise ValueError(
+                f"ERROR -- the results are not comparable, the {name} differs : "
+                f"{baseline.get(name)} != {current.get(name)}"
+            )
+
+
+class ComparisonCli:
+    @staticmethod
+    def createArgParser() -> ArgumentParser:
+        parser = ArgumentParser(
+            prog="python3 -m spasm.pp.benchmark.compare",
+            description="Compares the results of a benchmark run with a baseline, and fails when a metric regresses.",
+            formatter_class=RawDescriptionHelpFormatter,
+            allow_abbrev=False,
+        )
+        parser.add_argument(
+            "baseline",
+            metavar="<baseline json file>",
+            type=str,
+            help="the results of the reference run, written by 'python3 -m spasm.pp.benchmark --output'",
+        )
+        parser.add_argument(
+            "current",
+            metavar="<current json file>",
+            type=str,
+            nargs="?",
+            help="the results to compare ; when not given, the benchmarks of the baseline are run again with the same corpus",
+        )
+        parser.add_argument(
+            "--threshold",
+            metavar="<percent>",
+            type=float,
+            default=DEFAULT_THRESHOLD,
+            help=f"the slowdown of a median duration that is a regression, when greater than the noise, defaults to {DEFAULT_THRESHOLD}",
+        )
+        parser.add_argument(
+            "--repeat",
+            metavar="<count>",
+            type=int,
+            help="the count of measured runs of the fresh run, defaults to the one of the baseline",
+        )
+        parser.add_argument(
+            "--allow-missing",
+            action="store_true",
+            help="do not fail when some metrics of the baseline are missing from the current results",
+        )
+        parser.add_argument(
+            "--output",
+            metavar="<json file>",
+            type=str,
+            help="write the results of the fresh run into the given JSON file",
+        )
+        return parser
+
+    def loadResults(self, path: str) -> dict:
+        try:
+            with open(path, "rt", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            raise ValueError(f"ERROR -- cannot read the results '{path}' : {e}")
+
+    def runAgain(self, baseline: dict, repeat: int) -> dict:
+        """Runs the benchmarks of the baseline again, the same way."""
+        benchmarks = []
+        stylesheets = []
+        for result in baseline["results"]:
+            if result["benchmark"] not in benchmarks:
+                benchmarks.append(result["benchmark"])
+            if (
+                result["stylesheet"] is not None
+                and result["stylesheet"] not in stylesheets
+            ):
+                stylesheets.append(result["stylesheet"])
+        suite = BenchmarkSuite(
+            countOfLines=baseline["corpus"]["lines"],
+            seed=baseline["corpus"]["seed"],
+            repeat=repeat or baseline["repeat"],
+            countOfFiles=baseline.get("files", 8),
+            parserEngine=baseline["parser"],
+            rendererEngine=baseline["renderer"],
+        )
+        return suite.run(benchmarks, stylesheets)
+
+    def run(self, argv: List[str] = None) -> int:
+        try:
+            args = ComparisonCli.createArgParser().parse_args(argv)
+            if args.threshold < 0:
+                raise ValueError(
+                    f"ERROR -- wrong value '{args.threshold}' for parameter 'threshold'"
+                )
+            if args.repeat is not None and args.repeat < 1:
+                raise ValueError(
+                    f"ERROR -- wrong value '{args.repeat}' for parameter 'repeat'"
+                )
+            baseline = self.loadResults(args.baseline)
+            if args.current is not None:
+                current = self.loadResults(args.current)
+            else:
+                check_comparable(baseline, baseline)
+                current = self.runAgain(baseline, args.repeat)
+                if args.output is not None:
+                    with open(args.output, "wt", encoding="utf-8") as f:
+                        json.dump(current, f, indent=2)
+            check_comparable(baseline, current)
+        except ValueError as e:
+            print(e, file=sys.stderr)
+            return 1
+        except OSError as e:
+            print(f"ERROR -- cannot write the results : {e}", file=sys.stderr)
+            return 1
+
+        comparisons = compare_results(baseline, current, args.threshold)
+        print(HEADER_OF_TABLE)
+        for comparison in comparisons:
+            print(line_of_table(comparison))
+        return self.reportFailures(comparisons, args)
+
+    def reportFailures(self, comparisons: List[dict], args) -> int:
+        """Prints the regressions and the missing metrics, returns the return code."""
+        returnCode = 0
+        regressions = [c for c in comparisons if c["status"] == STATUS__REGRESSION]
+        if len(regressions) > 0:
+            report = "\n".join(
+                f"* {c['benchmark']} ({c['stylesheet'] or '-'}) : {c['change']:+.1f}%"
+                for c in regressions
+            )
+            print(
+                f"ERROR -- some metrics regress by more than {args.threshold}% :\n{report}",
+                file=sys.stderr,
+            )
+            returnCode = 1
+        missing = [c for c in comparisons if c["status"] == STATUS__MISSING]
+        if len(missing) > 0 and not args.allow_missing:
+            # e.g. a dropped benchmark MUST NOT bypass the gate
+            report = "\n".join(
+                f"* {c['benchmark']} ({c['stylesheet'] or '-'})" for c in missing
+            )
+            print(
+                f"ERROR -- some metrics of the baseline are missing :\n{report}",
+                file=sys.stderr,
+            )
+            returnCode = 1
+        return returnCode
+
+
+def main():
+    sys.exit(ComparisonCli().run())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,273 @@
+"""
+---
+(c) 2024 David SPORN
+---
+This is part of SPASM -- Sporniket's toolbox for assembly language.
+
+SPASM is free software: you can redistribute it and/or
+modify it under the terms of the GNU General Public License as published by the
+Free Software Foundation, either version 3 of the License, or (at your option)
+any later version.
+
+SPASM is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY
+or FITNESS FOR A PARTICULAR PURPOSE.
+
+See the GNU General Public License for more details.
+You should have received a copy of the GNU General Public License along with SPASM.
+If not, see <https://www.gnu.org/licenses/>. 
+---
+"""
+
+import random
+from typing import List
+
+# seed of the corpus used by default, thus two runs measure the same sources
+DEFAULT_SEED = 68000
+
+# kinds of generated lines, with their weights
+_WEIGHTS_OF_KINDS = {
+    "blank": 8,
+    "comment_line": 10,
+    "statement": 64,
+    "data": 8,
+    "macro": 2,
+    "equate": 4,
+    "label_only": 4,
+}
+
+# mnemonics with their count of operands
+_MNEMONICS = [
+    ("move.l", 2),
+    ("move.w", 2),
+    ("move.b", 2),
+    ("moveq", 2),
+    ("movem.l", 2),
+    ("lea", 2),
+    ("add.l", 2),
+    ("addq.w", 2),
+    ("sub.w", 2),
+    ("cmp.b", 2),
+    ("cmpi.w", 2),
+    ("and.w", 2),
+    ("or.l", 2),
+    ("lsl.w", 2),
+    ("dbra", 2),
+    ("clr.l", 1),
+    ("tst.w", 1),
+    ("swap", 1),
+    ("bne.s", 1),
+    ("beq.w", 1),
+    ("bra", 1),
+    ("bsr", 1),
+    ("jsr", 1),
+    ("pea", 1),
+    ("rts", 0),
+    ("nop", 0),
+]
+
+_DATA_REGISTERS = [f"d{i}" for i in range(8)]
+_ADDRESS_REGISTERS = [f"a{i}" for i in range(7)] + ["sp"]
+
+_WORDS = [
+    "initialize",
+    "the",
+    "screen",
+    "buffer",
+    "copy",
+    "next",
+    "line",
+    "of",
+    "sprite",
+    "loop",
+    "until",
+    "done",
+    "save",
+    "registers",
+    "restore",
+    "counter",
+    "palette",
+    "wait",
+    "for",
+    "vertical",
+    "blank",
+    "-- see",
+    "below",
+    "TODO",
+]
+
+_LABEL_PARTS = [
+    "init",
+    "main",
+    "loop",
+    "draw",
+    "sprite",
+    "copy",
+    "screen",
+    "buffer",
+    "palette",
+    "wait_vbl",
+    "handler",
+    "music",
+    "player",
+    "exit",
+    "setup_the_hardware_registers",
+]
+
+
+class _CorpusGenerator:
+    def __init__(self, seed: int):
+        self._random = random.Random(seed)
+        self._countOfLabels = 0
+
+    def lines(self, countOfLines: int) -> List[str]:
+        result = []
+        kinds = list(_WEIGHTS_OF_KINDS)
+        weights = list(_WEIGHTS_OF_KINDS.values())
+        while len(result) < countOfLines:
+            kind = self._random.choices(kinds, weights)[0]
+            result += getattr(self, f"_{kind}")()
+        return [f"{line}\n" for line in result[:countOfLines]]
+
+    # -- pieces of lines
+
+    def _separator(self) -> str:
+        return self._random.choice([" ", "  ", "\t", "\t\t", " \t"])
+
+    def _words(self, count: int) -> str:
+        return " ".join(self._random.choice(_WORDS) for _ in range(count))
+
+    def _label(self) -> str:
+        self._countOfLabels += 1
+        shape = self._random.random()
+        if shape < 0.3:
+            # local label
+            return f".{self._random.choice(['l', 'loop', 'next'])}{self._countOfLabels}"
+        parts = self._random.randint(1, 3)
+        name = "_".join(self._random.choice(_LABEL_PARTS) for _ in range(parts))
+        return f"{name}{self._countOfLabels}"
+
+    def _labelWithPostfix(self) -> str:
+        return self._label() + (":" if self._random.random() < 0.5 else "")
+
+    def _operand(self) -> str:
+        choice = self._random.random()
+        if choice < 0.3:
+            return self._random.choice(_DATA_REGISTERS)
+        if choice < 0.45:
+            return self._random.choice(_ADDRESS_REGISTERS)
+        if choice < 0.6:
+            return f"#${self._random.randint(0, 0xFFFF):x}"
+        register = self._random.choice(_ADDRESS_REGISTERS)
+        return self._random.choice(
+            [
+                f"({register})",
+                f"({register})+",
+                f"-({register})",
+                f"{self._random.randint(1, 512)}({register})",
+                f"{self._label()}(pc)",
+                "d0-d7/a0-a6",
+            ]
+        )
+
+    def _destination(self) -> str:
+        register = self._random.choice(_ADDRESS_REGISTERS)
+        return self._random.choice(
+            [
+                self._random.choice(_DATA_REGISTERS),
+                register,
+                f"({register})",
+                f"-({register})",
+                f"{self._random.randint(1, 512)}({register})",
+            ]
+        )
+
+    def _trailingComment(self) -> str:
+        if self._random.random() < 0.35:
+            return f"{self._separator()}; {self._words(self._random.randint(1, 6))}"
+        return ""
+
+    # -- kinds of lines
+
+    def _blank(self) -> List[str]:
+        return [self._random.choice(["", "", " ", "\t"])]
+
+    def _comment_line(self) -> List[str]:
+        shape = self._random.random()
+        if shape < 0.1:
+            return [self._random.choice(["*", ";"]) * self._random.randint(20, 70)]
+        prefix = self._random.choice(["*", ";", "**", ";;"])
+        indent = self._random.choice(["", " ", "\t", "\t\t", " \t"])
+        return [f"{prefix}{indent}{self._words(self._random.randint(1, 10))}"]
+
+    def _statement(self) -> List[str]:
+        label = self._labelWithPostfix() if self._random.random() < 0.25 else ""
+        mnemonic, countOfOperands = self._random.choice(_MNEMONICS)
+        operands = ",".join([self._operand(), self._destination()][:countOfOperands])
+        if countOfOperands > 0:
+            mnemonic += f"{self._separator()}{operands}"
+        line = f"{label}{self._separator()}{mnemonic}{self._trailingComment()}"
+        if self._random.random() < 0.05:
+            # commented out operation, or comment only statement
+            return [f"{self._separator()}; {line.strip()}"]
+        return [line]
+
+    def _data(self) -> List[str]:
+        label = self._labelWithPostfix() if self._random.random() < 0.5 else ""
+        shape = self._random.random()
+        if shape < 0.4:
+            text = self._words(self._random.randint(1, 5))
+            operands = self._random.choice(
+                [
+                    f'"{text} ; not a comment",13,10,0',
+                    f"'{text}, it''s',0",
+                    f'"{text}"',
+                ]
+            )
+            directive = "dc.b"
+        elif shape < 0.8:
+            directive = self._random.choice(["dc.w", "dc.l"])
+            operands = ",".join(
+                f"${self._random.randint(0, 0xFFFF):04x}"
+                for _ in range(self._random.randint(1, 8))
+            )
+        else:
+            directive = self._random.choice(["ds.b", "ds.w", "ds.l"])
+            operands = str(self._random.randint(1, 1024))
+        return [
+            f"{label}{self._separator()}{directive}{self._separator()}{operands}"
+            f"{self._trailingComment()}"
+        ]
+
+    def _macro(self) -> List[str]:
+        name = self._label().lstrip(".")
+        directive = self._random.choice(["macro", "macro.w", "macro.l"])
+        body = [
+            f"{self._separator()}move.l{self._separator()}\\{i},-(sp)"
+            for i in range(1, self._random.randint(2, 4))
+        ]
+        return [
+            f"{name}{self._separator()}{directive}{self._trailingComment()}",
+            *body,
+            f"{self._separator()}endm",
+        ]
+
+    def _equate(self) -> List[str]:
+        name = self._label().lstrip(".").upper()
+        value = self._random.choice(
+            [str(self._random.randint(0, 640)), f"${self._random.randint(0, 0xFFFF):x}"]
+        )
+        return [f"{name}{self._separator()}equ{self._separator()}{value}"]
+
+    def _label_only(self) -> List[str]:
+        return [self._labelWithPostfix()]
+
+
+def generate_lines(countOfLines: int, *, seed: int = DEFAULT_SEED) -> List[str]:
+    """Generates a synthetic source for the 68000, as the given count of lines, each with its line
+    feed ; the same seed gives the same lines.
+
+    The source mixes blank lines, comment lines (with tabulations), statements with labels of
+    various lengths, data with string literals, macros and equates ; some lines have a trailing
+    comment, and some operations are commented out."""
+    return _CorpusGenerator(seed).lines(countOfLines)
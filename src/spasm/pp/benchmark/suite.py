@@ -0,0 +1,261 @@
+"""
+---
+(c) 2024 David SPORN
+---
+This is part of SPASM -- Sporniket's toolbox for assembly language.
+
+SPASM is free software: you can redistribute it and/or
+modify it under the terms of the GNU General Public License as published by the
+Free Software Foundation, either version 3 of the License, or (at your option)
+any later version.
+
+SPASM is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY
+or FITNESS FOR A PARTICULAR PURPOSE.
+
+See the GNU General Public License for more details.
+You should have received a copy of the GNU General Public License along with SPASM.
+If not, see <https://www.gnu.org/licenses/>. 
+---
+"""
+
+import gc
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Callable, List
+
+from ..cache import version_of_tool
+from ..consts import MARKERS__COMMENT
+from ..processor import PARSER_ENGINES, RENDERER_ENGINES
+from ..stylesheet.builtin import HERITAGE, SPORNIKET
+from ..stylesheet.compiled import compile_stylesheet
+from .corpus import generate_lines
+
+# bump when the layout of the results changes
+VERSION_OF_RESULTS = 1
+
+# the benchmarks, in the order they are run
+BENCHMARK__PARSE = "parse"
+BENCHMARK__RENDER = "render"
+BENCHMARK__STDIN = "stdin"
+BENCHMARK__REWRITE = "rewrite"
+BENCHMARKS = [BENCHMARK__PARSE, BENCHMARK__RENDER, BENCHMARK__STDIN, BENCHMARK__REWRITE]
+
+STYLESHEETS = {"heritage": HERITAGE, "sporniket": SPORNIKET}
+
+
+def measure(run: Callable, repeat: int, prepare: Callable = None) -> List[float]:
+    """The durations (in seconds) of the given count of runs, after a warm up run ; like `timeit`,
+    the garbage collector is disabled while running.
+
+    `prepare` (optional) is called before each run, out of the measure."""
+    result = []
+    isGcEnabled = gc.isenabled()
+    gc.disable()
+    try:
+        for i in range(repeat + 1):
+            if prepare is not None:
+                prepare()
+            start = time.perf_counter()
+            run()
+            if i > 0:
+                result.append(time.perf_counter() - start)
+    finally:
+        if isGcEnabled:
+            gc.enable()
+    return result
+
+
+def result_of(
+    benchmark: str, stylesheet: str, lines: List[str], timings: List[float]
+) -> dict:
+    """The result of a benchmark that has processed the given lines, each run having the given
+    duration ; the throughput is computed from the median duration."""
+    countOfBytes = sum(len(line.encode("utf-8")) for line in lines)
+    median = statistics.median(timings)
+    return {
+        "benchmark": benchmark,
+        "stylesheet": stylesheet,
+        "lines": len(lines),
+        "bytes": countOfBytes,
+        "timings": timings,
+        "median": median,
+        "linesPerSecond": len(lines) / median,
+        "megabytesPerSecond": countOfBytes / median / 1_000_000,
+    }
+
+
+def statement_lines_of(lines: List[str]) -> List[str]:
+    """The given lines that are statement lines, as given to the parser by `SourceProcessor`."""
+    result = []
+    for line in lines:
+        cleaned = line.rstrip()
+        if len(cleaned) > 0 and cleaned[0] not in MARKERS__COMMENT:
+            result.append(cleaned)
+    return result
+
+
+class BenchmarkSuite:
+    """Measures the throughput of the pretty printer on a synthetic corpus (see `generate_lines`)
+    ---
+    * `parse` : parsing the statement lines, whatever the stylesheet.
+    * `render` : rendering the parsed statement lines.
+    * `stdin` : the whole command, formatting the corpus from its standard input.
+    * `rewrite` : the whole command, rewriting the corpus split into several files, without cache.
+
+    The commands are run in a sub-process, thus including the start up time.
+    """
+
+    def __init__(
+        self,
+        *,
+        countOfLines: int,
+        seed: int,
+        repeat: int,
+        countOfFiles: int = 8,
+        parserEngine: str = "state-machine",
+        rendererEngine: str = "slicing",
+    ):
+        self.countOfLines = countOfLines
+        self.seed = seed
+        self.repeat = repeat
+        self.countOfFiles = countOfFiles
+        self.parserEngine = parserEngine
+        self.rendererEngine = rendererEngine
+        self.lines = generate_lines(countOfLines, seed=seed)
+
+    def run(self, benchmarks: List[str], stylesheets: List[str], report=None) -> dict:
+        """Runs the given benchmarks under each given stylesheet, and gives the results.
+
+        `report` (optional) is called with each result once measured."""
+        results = []
+        for benchmark in benchmarks:
+            for stylesheet in [None] if benchmark == BENCHMARK__PARSE else stylesheets:
+                result = getattr(self, f"_{benchmark}")(stylesheet)
+                results.append(result)
+                if report is not None:
+                    report(result)
+        return {
+            "version": VERSION_OF_RESULTS,
+            "tool": version_of_tool(),
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "corpus": {"lines": self.countOfLines, "seed": self.seed},
+            "files": self.countOfFiles,
+            "parser": self.parserEngine,
+            "renderer": self.rendererEngine,
+            "repeat": self.repeat,
+            "results": results,
+        }
+
+    # -- in process benchmarks
+
+    def _parse(self, stylesheet: str) -> dict:
+        lines = statement_lines_of(self.lines)
+        parse = PARSER_ENGINES[self.parserEngine]().parse
+
+        def run():
+            for line in lines:
+                parse(line)
+
+        return result_of(BENCHMARK__PARSE, stylesheet, lines, measure(run, self.repeat))
+
+    def _render(self, stylesheet: str) -> dict:
+        lines = statement_lines_of(self.lines)
+        parse = PARSER_ENGINES[self.parserEngine]().parse
+        statementLines = [parse(line) for line in lines]
+        render = RENDERER_ENGINES[self.rendererEngine]().render
+        plan = compile_stylesheet(STYLESHEETS[stylesheet])
+
+        def run():
+            for statementLine in statementLines:
+                render(statementLine, plan)
+
+        return result_of(
+            BENCHMARK__RENDER, stylesheet, lines, measure(run, self.repeat)
+        )
+
+    # -- sub-process benchmarks
+
+    def _command(self, stylesheet: str) -> List[str]:
+        return [
+            sys.executable,
+            "-m",
+            "spasm.pp",
+            "--stylesheet",
+            f"builtin:{stylesheet}",
+            "--parser",
+            self.parserEngine,
+            "--renderer",
+            self.rendererEngine,
+        ]
+
+    def _environment(self) -> dict:
+        # the package MUST be importable by the sub-process, e.g. when run from the sources
+        pathOfPackages = os.path.dirname(
+            os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
+        )
+        pythonPath = os.environ.get("PYTHONPATH")
+        return dict(
+            os.environ,
+            PYTHONPATH=(
+                pathOfPackages
+                if not pythonPath
+                else os.pathsep.join([pathOfPackages, pythonPath])
+            ),
+        )
+
+    def _stdin(self, stylesheet: str) -> dict:
+        command = self._command(stylesheet)
+        env = self._environment()
+        with tempfile.TemporaryDirectory(prefix="spasm-pp-bench.") as tmp_dir:
+            pathOfSource = os.path.join(tmp_dir, "source.s")
+            with open(pathOfSource, "wt") as f:
+                f.writelines(self.lines)
+
+            def run():
+                with open(pathOfSource, "rb") as source:
+                    subprocess.run(
+                        command,
+                        stdin=source,
+                        stdout=subprocess.DEVNULL,
+                        env=env,
+                        check=True,
+                    )
+
+            timings = measure(run, self.repeat)
+        return result_of(BENCHMARK__STDIN, stylesheet, self.lines, timings)
+
+    def _rewrite(self, stylesheet: str) -> dict:
+        command = self._command(stylesheet) + ["--rewrite", "--no-cache"]
+        env = self._environment()
+        sizeOfFiles = -(-len(self.lines) // self.countOfFiles)
+        with tempfile.TemporaryDirectory(prefix="spasm-pp-bench.") as tmp_dir:
+            pristine = os.path.join(tmp_dir, "pristine")
+            workspace = os.path.join(tmp_dir, "workspace")
+            os.makedirs(pristine)
+            names = []
+            for i in range(0, len(self.lines), sizeOfFiles):
+                names.append(f"source{len(names)}.s")
+                with open(os.path.join(pristine, names[-1]), "wt") as f:
+                    f.writelines(self.lines[i : i + sizeOfFiles])
+            targets = [os.path.join(workspace, name) for name in names]
+
+            def prepare():
+                # the files MUST be rewritten each time
+                shutil.rmtree(workspace, ignore_errors=True)
+                shutil.copytree(pristine, workspace)
+
+            def run():
+                subprocess.run(
+                    command + targets, stdout=subprocess.DEVNULL, env=env, check=True
+                )
+
+            timings = measure(run, self.repeat, prepare)
+        return result_of(BENCHMARK__REWRITE, stylesheet, self.lines, timings)
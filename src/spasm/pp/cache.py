@@ -0,0 +1,318 @@
+"""
+---
+(c) 2024 David SPORN
+---
+This is part of SPASM -- Sporniket's toolbox for assembly language.
+
+SPASM is free software: you can redistribute it and/or
+modify it under the terms of the GNU General Public License as published by the
+Free Software Foundation, either version 3 of the License, or (at your option)
+any later version.
+
+SPASM is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY
+or FITNESS FOR A PARTICULAR PURPOSE.
+
+See the GNU General Public License for more details.
+You should have received a copy of the GNU General Public License along with SPASM.
+If not, see <https://www.gnu.org/licenses/>. 
+---
+"""
+
+import os
+import time
+from stat import S_ISREG
+
+try:
+    import fcntl
+except ImportError:  # e.g. Windows, the cache is still replaced atomically
+    fcntl = None
+
+from .stylesheet.builtin import HERITAGE
+from .stylesheet.frozen import FrozenStylesheet, freeze
+
+# bump when the layout of the cache file changes
+VERSION_OF_CACHE = 1
+
+# an entry whose file has been modified less than this time (in ns) before being checked may be
+# followed by another modification having the same size and mtime, thus it is verified by digest.
+RACY_DELAY = 2_000_000_000
+
+
+def version_of_tool() -> str:
+    try:
+        from importlib.metadata import version
+
+        return version("spasm-by-sporniket")
+    except Exception:
+        return "unknown"
+
+
+def _user_cache_directory() -> str:
+    """The cache directory of spasm inside the user cache directory (`$XDG_CACHE_HOME`, or
+    `~/.cache`)."""
+    baseDir = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+        os.path.expanduser("~"), ".cache"
+    )
+    return os.path.join(baseDir, "spasm")
+
+
+def default_path_of_cache() -> str:
+    """The cache file of the formatted files inside the user cache directory."""
+    return os.path.join(_user_cache_directory(), "pp-formatted-files.json")
+
+
+def default_path_of_stylesheets_cache() -> str:
+    """The cache directory of the validated stylesheets inside the user cache directory."""
+    return os.path.join(_user_cache_directory(), "pp-stylesheets")
+
+
+class TextDigest:
+    """Digest of a text given piece by piece, see `digest_of_text`."""
+
+    __slots__ = ["_hash"]
+
+    def __init__(self):
+        import hashlib
+
+        self._hash = hashlib.sha256()
+
+    def update(self, text: str):
+        self._hash.update(text.encode("utf-8", "surrogateescape"))
+
+    def hexdigest(self) -> str:
+        return self._hash.hexdigest()
+
+
+def digest_of_text(text: str) -> str:
+    digest = TextDigest()
+    digest.update(text)
+    return digest.hexdigest()
+
+
+def digest_of_stylesheet(stylesheet) -> str:
+    """Digest of the given validated stylesheet (the source of a compiled one is used)."""
+    import json
+
+    source = getattr(stylesheet, "source", stylesheet)
+    if isinstance(source, FrozenStylesheet):
+        source = source.toDict()
+    return digest_of_text(json.dumps(source, sort_keys=True))
+
+
+def fingerprint_of(stat: os.stat_result, digest: str) -> dict:
+    return {"size": stat.st_size, "mtime": stat.st_mtime_ns, "digest": digest}
+
+
+class FormattedFilesCache:
+    """Persistent record of the source files that are known to be already formatted
+    ---
+    Each file is recorded by its absolute path, with its size, mtime and the digest of its content,
+    along with the context of the formatting (the digest of the effective stylesheet and the version
+    of the tool) ; an entry of another context is ignored.
+
+    A file whose size and mtime are unchanged is considered as formatted without being read. When
+    only its mtime has changed, its content is read and compared by digest.
+
+    Updates are collected in memory, then `save()` merges them into the current content of the cache
+    file under an exclusive lock and replaces the file atomically, thus concurrent runs do not lose
+    nor corrupt each other's entries.
+    """
+
+    def __init__(self, path: str, stylesheet, *, version: str = None):
+        self.path = path
+        self.context = digest_of_text(
+            f"{digest_of_stylesheet(stylesheet)}:{version or version_of_tool()}"
+        )
+        self._entries = self._load()
+        self._updates = {}
+
+    def _load(self) -> dict:
+        import json
+
+        try:
+            with open(self.path, "rt", encoding="utf-8") as f:
+                content = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(content, dict) or content.get("version") != VERSION_OF_CACHE:
+            return {}
+        entries = content.get("entries")
+        return entries if isinstance(entries, dict) else {}
+
+    def isFormatted(self, source: str) -> bool:
+        """True when the given file is known to be formatted, without reading it when possible."""
+        key = os.path.abspath(source)
+        entry = self._entries.get(key)
+        if entry is None or entry.get("context") != self.context:
+            return False
+        try:
+            stat = os.stat(source)
+            if stat.st_size != entry["size"]:
+                return False
+            if (
+                stat.st_mtime_ns == entry["mtime"]
+                and entry["checked"] - stat.st_mtime_ns > RACY_DELAY
+            ):
+                return True
+            with open(source, "rt") as f:
+                digest = digest_of_text(f.read())
+        except (OSError, UnicodeError):
+            return False
+        if digest != entry["digest"]:
+            return False
+        self.remember(source, fingerprint_of(stat, digest))
+        return True
+
+    def remember(self, source: str, fingerprint: dict):
+        """Record the given file as formatted, with the fingerprint taken at the time it was known
+        to be formatted (see `fingerprint_of`)."""
+        key = os.path.abspath(source)
+        entry = dict(fingerprint, context=self.context, checked=time.time_ns())
+        self._entries[key] = entry
+        self._updates[key] = entry
+
+    def save(self):
+        """Merge the updates into the cache file, if any."""
+        if len(self._updates) == 0:
+            return
+        import json
+        import tempfile
+
+        directory = os.path.dirname(self.path) or "."
+        os.makedirs(directory, exist_ok=True)
+        with open(f"{self.path}.lock", "a") as lock:
+            if fcntl is not None:
+                fcntl.flock(lock.fileno(), fcntl.LOCK_EX)
+            entries = self._load()
+            entries.update(self._updates)
+            fd, tmpPath = tempfile.mkstemp(
+                dir=directory, prefix=".pp-formatted-files.", suffix=".tmp"
+            )
+            try:
+                with os.fdopen(fd, "wt", encoding="utf-8") as f:
+                    json.dump({"version": VERSION_OF_CACHE, "entries": entries}, f)
+                os.replace(tmpPath, self.path)
+            except BaseException:
+                os.unlink(tmpPath)
+                raise
+        self._entries = entries
+        self._updates = {}
+
+
+_KEYS_OF_STYLESHEET_ENTRY = {"size", "mtime", "digest", "checked", "overrides"}
+
+
+class ValidatedStylesheetsCache:
+    """Persistent record of the validated stylesheet files
+    ---
+    Each stylesheet file has its own entry inside the cache directory, named after the digest of
+    its absolute path, and written with `marshal`. An entry records the size, mtime and the digest
+    of the content of the file, along with the version of the tool, and the validated overriding
+    values ; those values do not depend on the reference stylesheet, thus an entry is used whatever
+    the reference.
+
+    Like `FormattedFilesCache`, a file whose size and mtime are unchanged is not read. Otherwise,
+    or when its entry is missing or stale, it is loaded with `StylesheetLoader`, that reports the
+    errors ; only valid stylesheets are recorded.
+    """
+
+    def __init__(self, directory: str, *, version: str = None):
+        self.directory = directory
+        self._version = version
+
+    @property
+    def version(self) -> str:
+        # resolved on first use, as getting the version of the tool is slow to import
+        if self._version is None:
+            self._version = version_of_tool()
+        return self._version
+
+    def pathOfEntry(self, pathToFile: str) -> str:
+        return os.path.join(
+            self.directory, f"{digest_of_text(os.path.abspath(pathToFile))}.marshal"
+        )
+
+    def load(self, pathToFile: str, *, reference=HERITAGE) -> FrozenStylesheet:
+        """Gives the validated stylesheet of the given file, like `StylesheetLoader.perform`.
+
+        The stylesheet loader (and thus the JSON parser and the validation) is imported only when
+        the file has to be validated."""
+        try:
+            statOfFile = os.stat(pathToFile)
+        except OSError:
+            statOfFile = None
+        if statOfFile is None or not S_ISREG(statOfFile.st_mode):
+            return self._validate(pathToFile, reference)  # reports the error
+
+        pathOfEntry = self.pathOfEntry(pathToFile)
+        entry = self._read(pathOfEntry)
+        if (
+            entry is not None
+            and statOfFile.st_size == entry["size"]
+            and statOfFile.st_mtime_ns == entry["mtime"]
+            and entry["checked"] - statOfFile.st_mtime_ns > RACY_DELAY
+        ):
+            return FrozenStylesheet(entry["overrides"], freeze(reference))
+
+        with open(pathToFile) as sourceJson:
+            content = sourceJson.read()
+        digest = digest_of_text(content)
+        if entry is not None and digest == entry["digest"]:
+            overrides = entry["overrides"]
+            result = FrozenStylesheet(overrides, freeze(reference))
+        else:
+            result = self._validate(pathToFile, reference, content)
+            overrides = result.overrides()
+        self._write(
+            pathOfEntry,
+            dict(
+                fingerprint_of(statOfFile, digest),
+                version=self.version,
+                checked=time.time_ns(),
+                overrides=overrides,
+            ),
+        )
+        return result
+
+    def _validate(self, pathToFile: str, reference, content: str = None):
+        from .stylesheet.loader import StylesheetLoader
+
+        loader = StylesheetLoader(pathToFile, reference=reference)
+        return loader.perform() if content is None else loader.performOn(content)
+
+    def _read(self, pathOfEntry: str):
+        import marshal
+
+        try:
+            with open(pathOfEntry, "rb") as f:
+                entry = marshal.load(f)
+        except Exception:  # missing, or unreadable by this version of python
+            return None
+        if (
+            not isinstance(entry, dict)
+            or entry.get("layout") != VERSION_OF_CACHE
+            or entry.get("version") != self.version
+            or not _KEYS_OF_STYLESHEET_ENTRY <= entry.keys()
+        ):
+            return None
+        return entry
+
+    def _write(self, pathOfEntry: str, entry: dict):
+        import marshal
+        import tempfile
+
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            fd, tmpPath = tempfile.mkstemp(
+                dir=self.directory, prefix=".pp-stylesheet.", suffix=".tmp"
+            )
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    marshal.dump(dict(entry, layout=VERSION_OF_CACHE), f)
+                os.replace(tmpPath, pathOfEntry)
+            except BaseException:
+                os.unlink(tmpPath)
+                raise
+        except OSError:
+            pass  # the stylesheet will be validated again next time
@@ -22,12 +22,50 @@ If not, see <https://www.gnu.org/licenses/>. 
 import os
 import sys
 from argparse import ArgumentParser, RawDescriptionHelpFormatter
+from contextlib import nullcontext
+from typing import List
 
-from .processor import SourceProcessor
+from .batch import (
+    ERRORS_OF_FILES,
+    MODE__CHECK,
+    MODE__DIFF,
+    MODE__FORMAT,
+    MODE__REWRITE,
+    SourceFileFormatter,
+    default_count_of_jobs,
+    format_files,
+)
+from .cache import (
+    FormattedFilesCache,
+    ValidatedStylesheetsCache,
+    default_path_of_cache,
+    default_path_of_stylesheets_cache,
+)
+from .output import (
+    DEFAULT_SIZE_OF_OUTPUT_BUFFER,
+    BufferedOutputWriter,
+    silence_broken_output,
+)
+from .processor import PARSER_ENGINES, RENDERER_ENGINES, SourceProcessor
+from .stats import (
+    PHASE__STYLESHEETS,
+    InstrumentedSourceProcessor,
+    MeasuredOutput,
+    ProcessingStats,
+)
 from .stylesheet.builtin import SPORNIKET, HERITAGE
-from .stylesheet.loader import StylesheetLoader
+from .stylesheet.compiled import compile_stylesheet
+from .stylesheet.discovery import (
+    NAME_OF_STYLESHEET_FILE,
+    StylesheetDiscovery,
+    without_inherit,
+)
+from .stylesheet.frozen import freeze
 from ._utils import _is_empty_string
 
+# The modules that are needed by some modes only (e.g. the loader and validator of `file:`
+# stylesheets, the daemon, the watcher) are imported when needed, for a faster start.
+
 
 class PrettyPrinterCli:
     @staticmethod
@@ -63,7 +101,61 @@ If not, see <https://www.gnu.org/licenses/>. 
             "--stylesheet",
             metavar="<stylesheet>",
             type=str,
-            help="the formatting rules to follow, either 'builtin:heritage' (the default) or 'builtin:sporniket'",
+            help=f"the formatting rules to follow, either 'builtin:heritage' (the default) or 'builtin:sporniket' or 'file:path/to/file' ; when not given, each source file of the list follows the nearest '{NAME_OF_STYLESHEET_FILE}' file of its folders, if any",
+        )
+
+        parser.add_argument(
+            "--parser",
+            metavar="<engine>",
+            choices=list(PARSER_ENGINES.keys()),
+            default="state-machine",
+            help="the engine parsing statement lines, either 'state-machine' (the default) or 'pattern' (faster, same results)",
+        )
+
+        parser.add_argument(
+            "--renderer",
+            metavar="<engine>",
+            choices=list(RENDERER_ENGINES.keys()),
+            default="slicing",
+            help="the engine rendering statement lines, either 'slicing' (the default) or 'column' (faster, same results)",
+        )
+
+        parser.add_argument(
+            "-j",
+            "--jobs",
+            metavar="<count>",
+            type=int,
+            default=default_count_of_jobs(),
+            help=f"the count of worker processes formatting the given list of files, defaults to the count of CPUs ({default_count_of_jobs()})",
+        )
+
+        parser.add_argument(
+            "--chunk-lines",
+            metavar="<count>",
+            type=int,
+            default=0,
+            help="when greater than 0 and using several jobs, each file is split into chunks of about <count> lines that are formatted in parallel, instead of formatting several files in parallel",
+        )
+
+        parser.add_argument(
+            "--lines",
+            metavar="<start>-<end>",
+            type=str,
+            help="only pretty-print the lines from <start> to <end> (starting from 1, both included), the other lines are left untouched",
+        )
+
+        parser.add_argument(
+            "--output-buffer",
+            metavar="<size>",
+            type=int,
+            default=DEFAULT_SIZE_OF_OUTPUT_BUFFER,
+            help=f"the count of characters collected before writing to the standard output, 0 to write each line immediately, defaults to {DEFAULT_SIZE_OF_OUTPUT_BUFFER}",
+        )
+
+        parser.add_argument(
+            "--no-cache",
+            action="store_true",
+            help=f"do not use the cache of the validated stylesheet files ({default_path_of_stylesheets_cache()}) and, in rewrite, check or diff mode, the cache of the files known to be already formatted ({default_path_of_cache()})",
         )
 
         parser.add_argument(
@@ -81,14 +173,89 @@ If not, see <https://www.gnu.org/licenses/>. 
             action="store_true",
             help=f"Replace the source files by their pretty-printed version WHEN THERE IS A DIFFERENCE.",
         )
+        commandGroup.add_argument(
+            "-c",
+            "--check",
+            action="store_true",
+            help="Report the source files that are not pretty-printed, without modifying them ; the exit code is not 0 when there are such files.",
+        )
+        commandGroup.add_argument(
+            "-d",
+            "--diff",
+            action="store_true",
+            help="Output the unified diff between the source files and their pretty-printed version, without modifying them.",
+        )
+
+        commandGroup.add_argument(
+            "-w",
+            "--watch",
+            action="store_true",
+            help="Keep running until interrupted, and rewrite the given source files, and the source files (*.s) inside the given directories, each time they are modified.",
+        )
+        commandGroup.add_argument(
+            "--daemon",
+            metavar="<socket>",
+            type=str,
+            help="Serve formatting requests over the given Unix domain socket, until interrupted ; the given stylesheet is the default one of the requests.",
+        )
+        commandGroup.add_argument(
+            "--connect",
+            metavar="<socket>",
+            type=str,
+            help="Format the standard input using the daemon listening on the given Unix domain socket.",
+        )
+
+        parser.add_argument(
+            "--watch-interval",
+            metavar="<seconds>",
+            type=float,
+            default=1.0,
+            help="in watch mode, the time between two polls of the files, defaults to 1 second ; a modified file is processed once it did not change during this time",
+        )
+
+        parser.add_argument(
+            "--report",
+            metavar="<json file>",
+            type=str,
+            help="in check mode, write the list of the source files that are not pretty-printed, with the first line that differs, into the given JSON file",
+        )
+
+        parser.add_argument(
+            "--stats",
+            action="store_true",
+            help="at the end, print the durations of each phase (stylesheets, parsing, rendering, comment lines, files, output) and the counts of lines, files and bytes to the standard error",
+        )
+
+        parser.add_argument(
+            "--stats-json",
+            metavar="<json file>",
+            type=str,
+            help="at the end, write the same stats as '--stats' into the given JSON file",
+        )
+
+        parser.add_argument(
+            "--profile-out",
+            metavar="<file>",
+            type=str,
+            help="run under cProfile and dump the stats of the profile into the given file, e.g. to be loaded by 'pstats' ; the worker processes of several jobs are not profiled",
+        )
+
+        parser.add_argument(
+            "--trace-memory",
+            action="store_true",
+            help="trace the memory allocations, then print the peak of the traced allocations and the top allocation sites to the standard error",
+        )
 
         return parser
 
     def __init__(self):
         self._processor = SourceProcessor()
+        self._output = None
+        self._stylesheetsCache = None
+        self._stats = None
 
     def processLine(self, line: str, stylesheet):
-        print(self._processor.process_line(line, stylesheet))
+        self._output.write(self._processor.process_line(line, stylesheet) + "\n")
 
     def retrieveStyleSheet(self, stylesheetSpec: str):
         ERROR = ValueError(
@@ -106,98 +273,481 @@ If not, see <https://www.gnu.org/licenses/>. 
         specValue = stylesheetSpec[specKindMarkPosition + 1 :]
         if specKind == "builtin":
             if specValue == "sporniket":
-                return SPORNIKET
+                return freeze(SPORNIKET)
             elif specValue == "heritage":
-                return HERITAGE
+                return freeze(HERITAGE)
             else:
                 raise ERROR
         elif specKind == "file":
-            return StylesheetLoader(specValue).perform()
+            # an explicit stylesheet file does not inherit anything
+            return without_inherit(self.loadStylesheetFile(specValue), freeze(HERITAGE))
         else:
             raise ERROR
 
+    def loadStylesheetFile(self, path: str):
+        """The validated stylesheet of the given file, as is, including its `inherit` key (see
+        `StylesheetDiscovery`)."""
+        if self._stylesheetsCache is not None:
+            return self._stylesheetsCache.load(path)
+        from .stylesheet.loader import StylesheetLoader
+
+        return StylesheetLoader(path).perform()
+
+    def retrieveLineRange(self, linesSpec: str) -> range:
+        """The indexes (starting from 0) of the lines specified as `<start>-<end>` (starting from 1,
+        both included)."""
+        ERROR = ValueError(f"ERROR -- wrong value '{linesSpec}' for parameter 'lines'")
+
+        start, separator, end = linesSpec.partition("-")
+        if separator != "-" or not start.isdigit() or not end.isdigit():
+            raise ERROR
+        start, end = int(start), int(end)
+        if start < 1 or end < start:
+            raise ERROR
+        return range(start - 1, end)
+
     def run(self):
+        args = PrettyPrinterCli.createArgParser().parse_args()
+        if args.profile_out is None and not args.trace_memory:
+            return self.perform(args)
+        return self.performProfiled(args)
+
+    def performProfiled(self, args) -> int:
+        """Same as `perform`, under cProfile and/or tracing the memory allocations."""
+        from .profiling import ProfiledRun
+
+        profiledRun = ProfiledRun(
+            pathOfProfile=args.profile_out, traceMemory=args.trace_memory
+        )
+        returnCode = profiledRun.call(lambda: self.perform(args))
+        if profiledRun.memoryReport is not None:
+            print(profiledRun.memoryReport.summary(), file=sys.stderr)
         try:
-            args = PrettyPrinterCli.createArgParser().parse_args()
-            stylesheet = (
-                HERITAGE
-                if _is_empty_string(args.stylesheet)
-                else self.retrieveStyleSheet(args.stylesheet)
+            profiledRun.dumpProfile()
+        except OSError as e:
+            print(f"ERROR -- cannot write the profile : {e}", file=sys.stderr)
+            return 1
+        return returnCode
+
+    def perform(self, args) -> int:
+        try:
+            self.checkArguments(args)
+            if args.stats or args.stats_json is not None:
+                self._stats = ProcessingStats()
+            lineRange = (
+                None if args.lines is None else self.retrieveLineRange(args.lines)
             )
+            if not args.no_cache:
+                self._stylesheetsCache = ValidatedStylesheetsCache(
+                    default_path_of_stylesheets_cache()
+                )
+            if args.daemon is not None or args.connect is not None:
+                return self.runDaemonOrClient(args)
+            self._processor = self.createProcessor(args)
+            with self.measure(PHASE__STYLESHEETS):
+                stylesheet = compile_stylesheet(
+                    freeze(HERITAGE)
+                    if _is_empty_string(args.stylesheet)
+                    else self.retrieveStyleSheet(args.stylesheet)
+                )
         except ValueError as e:
             print(e, file=sys.stderr)
             return 1
+
+        if args.watch:
+            return self.runWatcher(args, stylesheet)
+
+        self._output = self.createOutput(args)
+        try:
+            returnCode = self.processSources(args, stylesheet, lineRange)
+        except BrokenPipeError:
+            # e.g. piped into `head`, there is no point to go on
+            silence_broken_output(sys.stdout)
+            returnCode = 1
+        if self._stats is not None:
+            return self.reportStats(args, returnCode)
+        return returnCode
+
+    def checkArguments(self, args):
+        """Raises a `ValueError` when the given arguments are wrong or do not go together."""
+        if args.jobs < 1:
+            raise ValueError(f"ERROR -- wrong value '{args.jobs}' for parameter 'jobs'")
+        if args.chunk_lines < 0:
+            raise ValueError(
+                f"ERROR -- wrong value '{args.chunk_lines}' for parameter 'chunk-lines'"
+            )
+        if args.report is not None and not args.check:
+            raise ValueError("ERROR -- parameter 'report' requires check mode")
+        if args.watch_interval <= 0:
+            raise ValueError(
+                f"ERROR -- wrong value '{args.watch_interval}' for parameter 'watch-interval'"
+            )
+        if args.output_buffer < 0:
+            raise ValueError(
+                f"ERROR -- wrong value '{args.output_buffer}' for parameter 'output-buffer'"
+            )
+        if (args.stats or args.stats_json is not None) and (
+            args.watch or args.daemon is not None or args.connect is not None
+        ):
+            raise ValueError(
+                "ERROR -- stats are not available in watch, daemon and client modes"
+            )
+
+    def createProcessor(self, args) -> SourceProcessor:
+        """The source processor using the engines given by the arguments, instrumented when the
+        stats are measured."""
+        parser = PARSER_ENGINES[args.parser]()
+        renderer = RENDERER_ENGINES[args.renderer]()
+        if self._stats is None:
+            return SourceProcessor(parser=parser, renderer=renderer)
+        return InstrumentedSourceProcessor(
+            self._stats, parser=parser, renderer=renderer
+        )
+
+    def createOutput(self, args):
+        """The buffered standard output, measured when the stats are measured."""
+        output = BufferedOutputWriter(
+            sys.stdout, args.output_buffer, lineBuffered=sys.stdout.isatty()
+        )
+        if self._stats is None:
+            return output
+        return MeasuredOutput(output, self._stats)
+
+    def measure(self, phase: str):
+        """A context manager measuring the duration of its block into the given phase of the stats,
+        if any."""
+        return nullcontext() if self._stats is None else self._stats.measure(phase)
+
+    def reportStats(self, args, returnCode: int) -> int:
+        """Print and/or write the stats, returns the given return code, unless the stats cannot be
+        written."""
+        self._stats.stop()
+        if args.stats:
+            print(self._stats.summary(), file=sys.stderr)
+        if args.stats_json is not None:
+            import json
+
+            try:
+                with open(args.stats_json, "wt") as f:
+                    json.dump(self._stats.toDict(), f, indent=2)
+                    f.write("\n")
+            except OSError as e:
+                print(f"ERROR -- cannot write the stats : {e}", file=sys.stderr)
+                return 1
+        return returnCode
+
+    def runWatcher(self, args, stylesheet) -> int:
+        from .watch import DiscoveringFormatter, SourceWatcher
+
+        if len(args.sources) == 0:
+            print(
+                "ERROR -- watch mode requires a list of files or directories",
+                file=sys.stderr,
+            )
+            return 1
+        missing = [f"* MISSING : {p}" for p in args.sources if not os.path.exists(p)]
+        if len(missing) > 0:
+            report = "\n".join(missing)
+            print(f"ERROR -- in given list of files :\n{report}", file=sys.stderr)
+            return 1
+
+        def report(result):
+            if result["error"] is not None:
+                print(
+                    f"ERROR -- while processing {result['path']} : {result['error']}",
+                    file=sys.stderr,
+                    flush=True,
+                )
+            elif result["rewritten"]:
+                print(f"* REWRITTEN : {result['path']}", flush=True)
+
+        if _is_empty_string(args.stylesheet):
+            # like the other modes processing files
+            formatter = DiscoveringFormatter(
+                self.createStylesheetDiscovery(),
+                lambda s: SourceFileFormatter(self._processor, compile_stylesheet(s)),
+            )
         else:
-            if len(args.sources) > 0:
-                # EITHER process given list of files...
-                sourcesErrors = []
-
-                # -- Check the list of files
-                for source in args.sources:
-                    if os.path.exists(source):
-                        if os.path.isfile(source):
-                            # NO PROBLEM
-                            continue
-                        else:
-                            sourcesErrors += [
-                                {"errorType": "NOT_A_FILE", "path": source}
-                            ]
-                    else:
-                        sourcesErrors += [{"errorType": "MISSING_FILE", "path": source}]
-                if len(sourcesErrors) > 0:
-                    report = []
-                    for e in sourcesErrors:
-                        message = (
-                            f"* MISSING : {e['path']}"
-                            if e["errorType"] == "MISSING_FILE"
-                            else f"* NOT A FILE : {e['path']}"
-                        )
-                        report += [message]
-                    report = "\n".join(report)
-                    print(
-                        f"ERROR -- in given list of files :\n{report}", file=sys.stderr
+            formatter = SourceFileFormatter(self._processor, stylesheet)
+        watcher = SourceWatcher(args.sources, formatter, report)
+        try:
+            watcher.watch(args.watch_interval)
+        except KeyboardInterrupt:
+            pass
+        return 0
+
+    def runDaemonOrClient(self, args) -> int:
+        if len(args.sources) > 0:
+            raise ValueError(
+                "ERROR -- daemon and client modes do not process a list of files"
+            )
+        if args.daemon is not None:
+            return self.runDaemon(args)
+        return self.runClient(args)
+
+    def runDaemon(self, args) -> int:
+        from .daemon import DEFAULT_STYLESHEET, FormatterDaemon
+
+        daemon = FormatterDaemon(
+            args.daemon,
+            self.retrieveStyleSheet,
+            self.retrieveLineRange,
+            defaultStylesheet=(
+                DEFAULT_STYLESHEET
+                if _is_empty_string(args.stylesheet)
+                else _absolute_stylesheet_spec(args.stylesheet)
+            ),
+            parserEngine=args.parser,
+            rendererEngine=args.renderer,
+        )
+        try:
+            daemon.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        return 0
+
+    def runClient(self, args) -> int:
+        from .daemon import request_daemon
+
+        request = {"source": sys.stdin.read()}
+        if not _is_empty_string(args.stylesheet):
+            request["stylesheet"] = _absolute_stylesheet_spec(args.stylesheet)
+        if args.lines is not None:
+            request["lines"] = args.lines
+        try:
+            response = request_daemon(args.connect, request)
+        except (OSError, ValueError) as e:
+            print(
+                f"ERROR -- cannot get a response from the daemon on '{args.connect}' : {e}",
+                file=sys.stderr,
+            )
+            return 1
+        if response.get("error") is not None:
+            print(response["error"], file=sys.stderr)
+            return 1
+        sys.stdout.write(response["output"])
+        return 0
+
+    def processSources(self, args, stylesheet, lineRange: range = None) -> int:
+        try:
+            return self._processSources(args, stylesheet, lineRange)
+        finally:
+            self._output.flush()
+
+    def discoverStylesheets(self, sources: List[str], *, consecutive: bool) -> list:
+        """The given source files grouped by effective stylesheet, discovered from the stylesheet
+        files of their folders (see `StylesheetDiscovery.group`)."""
+        return self.createStylesheetDiscovery().group(sources, consecutive=consecutive)
+
+    def createStylesheetDiscovery(self) -> StylesheetDiscovery:
+        """The discovery of the stylesheet files, defaulting to the builtin heritage stylesheet."""
+        return StylesheetDiscovery(self.loadStylesheetFile, freeze(HERITAGE))
+
+    def formatGroups(self, args, groups: list, mode: str, lineRange: range):
+        """Formats each group of source files with its stylesheet, see `format_files`."""
+        for stylesheet, sources in groups:
+            with self.measure(PHASE__STYLESHEETS):
+                stylesheet = compile_stylesheet(stylesheet)
+            cache = (
+                FormattedFilesCache(default_path_of_cache(), stylesheet)
+                if mode != MODE__FORMAT and not args.no_cache
+                else None
+            )
+            yield from format_files(
+                sources,
+                stylesheet,
+                mode=mode,
+                jobs=args.jobs,
+                linesPerChunk=args.chunk_lines,
+                parserEngine=args.parser,
+                rendererEngine=args.renderer,
+                cache=cache,
+                lazy=True,
+                lineRange=lineRange,
+                stats=self._stats,
+            )
+            if cache is not None:
+                try:
+                    cache.save()
+                except OSError as e:
+                    print(f"WARNING -- cannot save the cache : {e}", file=sys.stderr)
+
+    def _processSources(self, args, stylesheet, lineRange: range) -> int:
+        if len(args.sources) > 0:
+            # EITHER process given list of files...
+            return self.processFiles(args, stylesheet, lineRange)
+        # ...OR process standard input
+        return self.processStandardInput(args, stylesheet, lineRange)
+
+    def processFiles(self, args, stylesheet, lineRange: range) -> int:
+        # -- Check the list of files
+        if not self.checkSources(args.sources):
+            return 1
+
+        # -- Proceed
+        mode = mode_of(args)
+        if _is_empty_string(args.stylesheet):
+            try:
+                # in format and diff modes, the output of the files is in the given order
+                with self.measure(PHASE__STYLESHEETS):
+                    groups = self.discoverStylesheets(
+                        args.sources,
+                        consecutive=mode in [MODE__FORMAT, MODE__DIFF],
                     )
-                    return 1
-
-                # -- Proceed
-                for source in args.sources:
-                    with open(source, "rt") as f:
-                        lines = f.readlines()
-                    if args.rewrite:
-                        # Rewrite mode
-                        result = []
-                        isDifferent = False
-                        for line in lines:
-                            # -- remove trailing "\n"
-                            # -- because it triggers false difference
-                            sourceLine = line[:-1] if line.endswith("\n") else line
-                            processedLine = self._processor.process_line(
-                                sourceLine, stylesheet
-                            )
-                            result += [processedLine]
-                            isDifferent = isDifferent or processedLine != sourceLine
-                        if isDifferent:
-                            with open(source, "wt") as f:
-                                f.write("\n".join(result))
-                                f.write("\n")
-                    else:
-                        # Normal mode
-                        for line in lines:
-                            self.processLine(line, stylesheet)
-                        print("")
+            except ValueError as e:
+                print(e, file=sys.stderr)
+                return 1
+        else:
+            groups = [(stylesheet, args.sources)]
+        filesErrors = []
+        unformattedFiles = []
+        for result in self.formatGroups(args, groups, mode, lineRange):
+            self.outputResult(result, mode, filesErrors, unformattedFiles)
+        if args.report is not None:
+            try:
+                self.writeReport(args.report, args.sources, unformattedFiles)
+            except OSError as e:
+                print(f"ERROR -- cannot write the report : {e}", file=sys.stderr)
+                return 1
+        return self.reportProblems(filesErrors, unformattedFiles)
+
+    def checkSources(self, sources: List[str]) -> bool:
+        """Checks that the given sources are existing files, prints the errors if any."""
+        sourcesErrors = []
+        for source in sources:
+            if os.path.exists(source):
+                if os.path.isfile(source):
+                    # NO PROBLEM
+                    continue
+                else:
+                    sourcesErrors += [{"errorType": "NOT_A_FILE", "path": source}]
             else:
-                # ...OR process standard input
+                sourcesErrors += [{"errorType": "MISSING_FILE", "path": source}]
+        if len(sourcesErrors) > 0:
+            report = []
+            for e in sourcesErrors:
+                message = (
+                    f"* MISSING : {e['path']}"
+                    if e["errorType"] == "MISSING_FILE"
+                    else f"* NOT A FILE : {e['path']}"
+                )
+                report += [message]
+            report = "\n".join(report)
+            print(f"ERROR -- in given list of files :\n{report}", file=sys.stderr)
+            return False
+        return True
 
-                # -- unless it is rewrite mode
-                if args.rewrite:
-                    print(
-                        "ERROR -- rewrite mode requires a list of files",
-                        file=sys.stderr,
-                    )
-                    return 1
+    def outputResult(
+        self, result: dict, mode: str, filesErrors: list, unformattedFiles: list
+    ):
+        """Outputs the given result of a file according to the given mode, collecting the errors
+        and the unformatted files into the given lists."""
+        if self._stats is not None:
+            self._stats.countResult(result)
+        if result["error"] is not None:
+            filesErrors += [f"* {result['path']} : {result['error']}"]
+        elif mode == MODE__CHECK:
+            if result["firstDifference"] is not None:
+                unformattedFiles += [result]
+        elif isinstance(result["output"], str):
+            self._output.write(result["output"])
+        elif result["output"] is not None:
+            try:
+                self._output.writelines(result["output"])
+            except BrokenPipeError:
+                # not a problem of the file, see `run`
+                raise
+            except ERRORS_OF_FILES as e:
+                # the lines are read while being written
+                filesErrors += [f"* {result['path']} : {e}"]
+
+    def reportProblems(self, filesErrors: list, unformattedFiles: list) -> int:
+        """Prints the unformatted files and the errors of the files, returns the return code."""
+        if len(unformattedFiles) > 0:
+            report = "\n".join(
+                f"* {r['path']} : line {r['firstDifference']}" for r in unformattedFiles
+            )
+            print(
+                f"ERROR -- some files are not pretty-printed :\n{report}",
+                file=sys.stderr,
+            )
+        if len(filesErrors) > 0:
+            report = "\n".join(filesErrors)
+            print(
+                f"ERROR -- while processing given list of files :\n{report}",
+                file=sys.stderr,
+            )
+            return 1
+        if len(unformattedFiles) > 0:
+            return 1
+        return 0
+
+    def processStandardInput(self, args, stylesheet, lineRange: range) -> int:
+        # -- unless it is rewrite mode
+        if args.rewrite:
+            print(
+                "ERROR -- rewrite mode requires a list of files",
+                file=sys.stderr,
+            )
+            return 1
+
+        # -- or check mode
+        if args.check:
+            print(
+                "ERROR -- check mode requires a list of files",
+                file=sys.stderr,
+            )
+            return 1
 
-                # -- Proceed
-                for line in sys.stdin:
-                    self.processLine(line, stylesheet)
+        # -- or diff mode
+        if args.diff:
+            print(
+                "ERROR -- diff mode requires a list of files",
+                file=sys.stderr,
+            )
+            return 1
 
+        # -- Proceed
+        lines = sys.stdin if self._stats is None else self._stats.countInput(sys.stdin)
+        if lineRange is not None:
+            for line in self._processor.process_line_range(
+                lines, lineRange, stylesheet
+            ):
+                self._output.write(line + "\n")
             return 0
+        for line in lines:
+            self.processLine(line, stylesheet)
+        return 0
+
+    def writeReport(self, path: str, sources, unformattedFiles):
+        """Write the JSON report of check mode."""
+        import json
+
+        report = {
+            "checked": len(sources),
+            "unformatted": [
+                {"path": r["path"], "line": r["firstDifference"]}
+                for r in unformattedFiles
+            ],
+        }
+        with open(path, "wt") as f:
+            json.dump(report, f, indent=2)
+            f.write("\n")
+
+
+def mode_of(args) -> str:
+    """The mode of processing the list of files given by the arguments."""
+    if args.rewrite:
+        return MODE__REWRITE
+    if args.check:
+        return MODE__CHECK
+    if args.diff:
+        return MODE__DIFF
+    return MODE__FORMAT
+
+
+def _absolute_stylesheet_spec(spec: str) -> str:
+    # the daemon does not share the current directory of the client
+    if spec.startswith("file:"):
+        return f"file:{os.path.abspath(spec[len('file:'):])}"
+    return spec
@@ -0,0 +1,212 @@
+"""
+---
+(c) 2024 David SPORN
+---
+This is part of SPASM -- Sporniket's toolbox for assembly language.
+
+SPASM is free software: you can redistribute it and/or
+modify it under the terms of the GNU General Public License as published by the
+Free Software Foundation, either version 3 of the License, or (at your option)
+any later version.
+
+SPASM is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY
+or FITNESS FOR A PARTICULAR PURPOSE.
+
+See the GNU General Public License for more details.
+You should have received a copy of the GNU General Public License along with SPASM.
+If not, see <https://www.gnu.org/licenses/>. 
+---
+"""
+
+import io
+import json
+import os
+import socket
+import socketserver
+import stat
+import threading
+from typing import Callable
+
+from .processor import PARSER_ENGINES, RENDERER_ENGINES, SourceProcessor
+from .stylesheet.compiled import CompiledStylesheet, compile_stylesheet
+
+# the stylesheet of a request that does not specify one
+DEFAULT_STYLESHEET = "builtin:heritage"
+
+
+class StylesheetRegistry:
+    """Compiled stylesheets by specification (e.g. `builtin:heritage` or `file:path/to/file`)
+    ---
+    A `file:` stylesheet is loaded again when the modification time or the size of its file change.
+    """
+
+    def __init__(self, retrieveStyleSheet: Callable):
+        """Constructor
+
+        Args:
+            retrieveStyleSheet (Callable): gives the validated stylesheet of a specification, or
+                raises a `ValueError`, e.g. `PrettyPrinterCli.retrieveStyleSheet`.
+        """
+        self._retrieveStyleSheet = retrieveStyleSheet
+        self._compiled = {}
+        self._lock = threading.Lock()
+
+    def get(self, spec: str) -> CompiledStylesheet:
+        with self._lock:
+            signature = None
+            if spec.startswith("file:"):
+                try:
+                    stat = os.stat(spec[len("file:") :])
+                    signature = (stat.st_mtime_ns, stat.st_size)
+                except OSError:
+                    pass  # reported by `retrieveStyleSheet`
+            known = self._compiled.get(spec)
+            if known is not None and known[0] == signature:
+                return known[1]
+            compiled = compile_stylesheet(self._retrieveStyleSheet(spec))
+            self._compiled[spec] = (signature, compiled)
+            return compiled
+
+
+class FormatterDaemon:
+    """Resident formatter serving requests over a Unix domain socket
+    ---
+    The protocol is made of JSON lines : each request is a JSON object on a single line, answered by
+    a JSON object on a single line, and a client MAY send several requests over a connection.
+
+    * request : `source` (the text to format), `stylesheet` (optional, a specification like the
+      `--stylesheet` option, a `file:` path being absolute ; defaults to the one of the daemon) and `lines` (optional, a range like the
+      `--lines` option).
+    * response : either `output` (the formatted text, each line with its line feed, as the standard
+      input mode), or `error` (the message of the error).
+
+    Each connection is served by its own thread, and the compiled stylesheets are shared (see
+    `StylesheetRegistry`).
+    """
+
+    def __init__(
+        self,
+        socketPath: str,
+        retrieveStyleSheet: Callable,
+        retrieveLineRange: Callable,
+        *,
+        defaultStylesheet: str = DEFAULT_STYLESHEET,
+        parserEngine: str = "state-machine",
+        rendererEngine: str = "slicing",
+    ):
+        self.socketPath = socketPath
+        self._stylesheets = StylesheetRegistry(retrieveStyleSheet)
+        self._retrieveLineRange = retrieveLineRange
+        self._defaultStylesheet = defaultStylesheet
+        self._parserEngine = parserEngine
+        self._rendererEngine = rendererEngine
+        self._server = None
+        self.ready = threading.Event()
+
+    def handle(self, request) -> dict:
+        """The response to the given request."""
+        try:
+            if not isinstance(request, dict) or not isinstance(
+                request.get("source"), str
+            ):
+                raise ValueError("ERROR -- wrong request, 'source' is required")
+            for name in ["stylesheet", "lines"]:
+                if not isinstance(request.get(name, ""), (str, type(None))):
+                    raise ValueError(
+                        f"ERROR -- wrong request, '{name}' must be a string"
+                    )
+            stylesheet = self._stylesheets.get(
+                request.get("stylesheet") or self._defaultStylesheet
+            )
+            lines = request.get("lines")
+            lineRange = None if lines is None else self._retrieveLineRange(lines)
+            processor = SourceProcessor(
+                parser=PARSER_ENGINES[self._parserEngine](),
+                renderer=RENDERER_ENGINES[self._rendererEngine](),
+            )
+            # split on line feeds only, like the lines of the standard input, unlike `splitlines`
+            sourceLines = io.StringIO(request["source"])
+            if lineRange is not None:
+                processedLines = processor.process_line_range(
+                    sourceLines, lineRange, stylesheet
+                )
+            else:
+                processedLines = (
+                    processor.process_line(line, stylesheet) for line in sourceLines
+                )
+            return {"output": "".join(f"{line}\n" for line in processedLines)}
+        except (OSError, ValueError) as e:
+            return {"error": str(e)}
+
+    def serve_forever(self):
+        """Listen to the socket until `shutdown()` is called, or until interrupted ; `ready` is set
+        once listening."""
+        if not hasattr(socketserver, "ThreadingUnixStreamServer"):
+            raise ValueError("ERROR -- daemon mode requires Unix domain sockets")
+        _remove_stale_socket(self.socketPath)
+        daemon = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                for line in self.rfile:
+                    try:
+                        request = json.loads(line)
+                    except ValueError:
+                        response = {"error": "ERROR -- wrong request, not JSON"}
+                    else:
+                        response = daemon.handle(request)
+                    self.wfile.write(json.dumps(response).encode("utf-8") + b"\n")
+                    self.wfile.flush()
+
+        # only the user can connect
+        previousUmask = os.umask(0o077)
+        try:
+            self._server = socketserver.ThreadingUnixStreamServer(
+                self.socketPath, Handler
+            )
+        except OSError as e:
+            raise ValueError(
+                f"ERROR -- cannot listen on '{self.socketPath}' : {e}"
+            ) from e
+        finally:
+            os.umask(previousUmask)
+        self._server.daemon_threads = True
+        self.ready.set()
+        try:
+            self._server.serve_forever()
+        finally:
+            self._server.server_close()
+            os.unlink(self.socketPath)
+
+    def shutdown(self):
+        """Stop serving, from another thread."""
+        if self._server is not None:
+            self._server.shutdown()
+
+
+def _remove_stale_socket(socketPath: str):
+    try:
+        mode = os.lstat(socketPath).st_mode
+    except FileNotFoundError:
+        return
+    if not stat.S_ISSOCK(mode):
+        # e.g. a source file given by mistake, that MUST NOT be removed
+        raise ValueError(f"ERROR -- '{socketPath}' exists and is not a socket")
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as s:
+        try:
+            s.connect(socketPath)
+        except (ConnectionRefusedError, FileNotFoundError):
+            os.unlink(socketPath)
+            return
+    raise ValueError(f"ERROR -- a daemon is already listening on '{socketPath}'")
+
+
+def request_daemon(socketPath: str, request: dict) -> dict:
+    """Send the given request to the daemon listening on the given socket, returns its response."""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as s:
+        s.connect(socketPath)
+        with s.makefile("rwb") as f:
+            f.write(json.dumps(request).encode("utf-8") + b"\n")
+            f.flush()
+            return json.loads(f.readline())
@@ -0,0 +1,103 @@
+"""
+---
+(c) 2024 David SPORN
+---
+This is part of SPASM -- Sporniket's toolbox for assembly language.
+
+SPASM is free software: you can redistribute it and/or
+modify it under the terms of the GNU General Public License as published by the
+Free Software Foundation, either version 3 of the License, or (at your option)
+any later version.
+
+SPASM is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY
+or FITNESS FOR A PARTICULAR PURPOSE.
+
+See the GNU General Public License for more details.
+You should have received a copy of the GNU General Public License along with SPASM.
+If not, see <https://www.gnu.org/licenses/>. 
+---
+"""
+
+from typing import List, Optional, Tuple
+
+# count of processed lines after which the collected events are sent to the observers
+SIZE_OF_BATCH_OF_EVENTS = 512
+
+
+class ProcessingObserver:
+    """Observer of a `SourceProcessor`, see `SourceProcessor.add_observer`
+    ---
+    The events of the lines are collected, then sent by batches : each batch of parsed lines comes
+    before the batch of the rendered lines of the same lines. A batch is sent every
+    `SIZE_OF_BATCH_OF_EVENTS` lines, before the end of a file, and on
+    `SourceProcessor.flush_observers()`.
+
+    Each event has the index of its line (starting from 0) among the lines processed since the
+    start of the file (see `SourceProcessor.start_file`). The methods of this class do nothing,
+    thus a subclass only overrides the methods of the events it needs."""
+
+    def on_file_start(self, path: Optional[str]):
+        """A file is about to be processed."""
+        pass
+
+    def on_lines_parsed(self, statementLines: List[Tuple[int, object]]):
+        """A batch of (index, model) of the parsed statement lines, either a `StatementLine` or a
+        `CompactStatementLine`."""
+        pass
+
+    def on_lines_rendered(self, lines: List[Tuple[int, str]]):
+        """A batch of (index, line) of the processed lines, of any kind."""
+        pass
+
+    def on_file_end(self, path: Optional[str]):
+        """A file has been processed ; the events of its lines have all been sent."""
+        pass
+
+
+class _CollectedEvents:
+    """The events collected by an observed processor, waiting to be sent to its observers."""
+
+    __slots__ = (
+        "observers",
+        "sizeOfBatch",
+        "parsed",
+        "rendered",
+        "countOfLines",
+        "lastParsed",
+    )
+
+    def __init__(self, sizeOfBatch: int):
+        self.observers: List[ProcessingObserver] = []
+        self.sizeOfBatch = sizeOfBatch
+        self.parsed = []
+        self.rendered = []
+        self.countOfLines = 0
+        # the statement line parsed by the latest processed line, if any
+        self.lastParsed = None
+
+    def flush(self):
+        parsed, rendered = self.parsed, self.rendered
+        if len(parsed) > 0:
+            self.parsed = []
+            for observer in self.observers:
+                observer.on_lines_parsed(parsed)
+        if len(rendered) > 0:
+            self.rendered = []
+            for observer in self.observers:
+                observer.on_lines_rendered(rendered)
+
+
+class _NotifyingParser:
+    """Wraps the parser of an observed processor, to keep the latest parsed statement line."""
+
+    def __init__(self, parser, events: _CollectedEvents):
+        self.parser = parser
+        self._events = events
+
+    def parse(self, line: str):
+        self._events.lastParsed = result = self.parser.parse(line)
+        return result
+
+    def __getattr__(self, name: str):
+        return getattr(self.parser, name)
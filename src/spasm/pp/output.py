@@ -0,0 +1,99 @@
+"""
+---
+(c) 2024 David SPORN
+---
+This is part of SPASM -- Sporniket's toolbox for assembly language.
+
+SPASM is free software: you can redistribute it and/or
+modify it under the terms of the GNU General Public License as published by the
+Free Software Foundation, either version 3 of the License, or (at your option)
+any later version.
+
+SPASM is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY
+or FITNESS FOR A PARTICULAR PURPOSE.
+
+See the GNU General Public License for more details.
+You should have received a copy of the GNU General Public License along with SPASM.
+If not, see <https://www.gnu.org/licenses/>. 
+---
+"""
+
+import os
+from typing import Iterable
+
+# default size of the buffer of the output, in characters
+DEFAULT_SIZE_OF_OUTPUT_BUFFER = 64 * 1024
+
+
+class BufferedOutputWriter:
+    """Collects the written texts and writes them by large chunks into the given text stream
+    ---
+    When the stream has a binary buffer (e.g. `sys.stdout`), the chunks are encoded like the stream
+    would do and written into the buffer, bypassing the text layer ; otherwise (e.g. `io.StringIO`)
+    they are written into the stream itself.
+
+    A `bufferSize` of 0 writes each text immediately ; `lineBuffered` writes each text immediately
+    too, e.g. for an interactive terminal. A `BrokenPipeError` is NOT handled here, see
+    `silence_broken_output`.
+    """
+
+    def __init__(
+        self,
+        stream,
+        bufferSize: int = DEFAULT_SIZE_OF_OUTPUT_BUFFER,
+        *,
+        lineBuffered: bool = False,
+    ):
+        self._stream = stream
+        self._bufferSize = 0 if lineBuffered else bufferSize
+        self._pending = []
+        self._sizeOfPending = 0
+        self._binary = getattr(stream, "buffer", None)
+        if self._binary is not None:
+            # the text layer may have pending data
+            stream.flush()
+            self._encoding = stream.encoding
+            self._errors = stream.errors or "strict"
+            self._translatedNewline = None if os.linesep == "\n" else os.linesep
+
+    def write(self, text: str):
+        self._pending.append(text)
+        self._sizeOfPending += len(text)
+        if self._sizeOfPending >= self._bufferSize:
+            self._writePending()
+
+    def writelines(self, texts: Iterable[str]):
+        for text in texts:
+            self.write(text)
+
+    def flush(self):
+        self._writePending()
+        (self._binary if self._binary is not None else self._stream).flush()
+
+    def _writePending(self):
+        if self._sizeOfPending == 0:
+            return
+        chunk = "".join(self._pending)
+        self._pending = []
+        self._sizeOfPending = 0
+        if self._binary is None:
+            self._stream.write(chunk)
+            return
+        if self._translatedNewline is not None:
+            chunk = chunk.replace("\n", self._translatedNewline)
+        self._binary.write(chunk.encode(self._encoding, self._errors))
+        if self._bufferSize == 0:
+            self._binary.flush()
+
+
+def silence_broken_output(stream):
+    """After a `BrokenPipeError`, redirect the given stream to the null device, so that the
+    interpreter does not fail again while flushing it at exit."""
+    try:
+        fd = stream.fileno()
+    except (AttributeError, OSError, ValueError):
+        return
+    devnull = os.open(os.devnull, os.O_WRONLY)
+    os.dup2(devnull, fd)
+    os.close(devnull)
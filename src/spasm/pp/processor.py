@@ -19,16 +19,154 @@ If not, see <https://www.gnu.org/licenses/>. 
 ---
 """
 
+from typing import Iterable, Iterator, Optional, Sequence
+
 from .consts import MARKERS__COMMENT, WHITESPACES
+from .observers import (
+    SIZE_OF_BATCH_OF_EVENTS,
+    ProcessingObserver,
+    _CollectedEvents,
+    _NotifyingParser,
+)
 from ._utils import _is_empty_string
-from .statement_line import StatementLineParser, StatementLineRenderer
+from .statement_line import (
+    StatementLineColumnRenderer,
+    StatementLineParser,
+    StatementLinePatternParser,
+    StatementLineRenderer,
+)
+from .statement_line.table import (
+    LINE_KIND__BLANK,
+    LINE_KIND__COMMENT_LINE,
+    LINE_KIND__STATEMENT,
+    StatementTable,
+)
+from .stylesheet.compiled import compile_stylesheet
+
+# engines that can be selected by name
+PARSER_ENGINES = {
+    "state-machine": StatementLineParser,
+    "pattern": lambda: StatementLinePatternParser(compact=True),
+}
+
+RENDERER_ENGINES = {
+    "slicing": StatementLineRenderer,
+    "column": StatementLineColumnRenderer,
+}
 
 
 class SourceProcessor:
 
-    def __init__(self):
-        self._parser = StatementLineParser()
-        self._renderer = StatementLineRenderer()
+    def __init__(
+        self,
+        *,
+        parser=None,
+        renderer=None,
+        sizeOfBatchOfEvents: int = SIZE_OF_BATCH_OF_EVENTS,
+    ):
+        """Constructor
+
+        Args:
+            parser (optional): the engine parsing statement lines, e.g. `StatementLinePatternParser()` ;
+                defaults to the state machine engine `StatementLineParser()`.
+            renderer (optional): the engine rendering statement lines, e.g. `StatementLineColumnRenderer()` ;
+                defaults to `StatementLineRenderer()`.
+            sizeOfBatchOfEvents (optional): the count of processed lines after which the events are
+                sent to the observers, if any (see `add_observer`).
+        """
+        self._parser = parser if parser is not None else StatementLineParser()
+        self._renderer = renderer if renderer is not None else StatementLineRenderer()
+        self._sizeOfBatchOfEvents = sizeOfBatchOfEvents
+        self._events = None
+
+    def reset(self):
+        """Forget the state left by the previous lines, e.g. before processing another source."""
+        self._renderer.allowCommentBlock()
+
+    ##############################################
+    # Observers
+    ##############################################
+
+    def add_observer(self, observer: ProcessingObserver):
+        """Register an observer of the processed lines and files, see `ProcessingObserver`.
+
+        While there is no observer, the processing is NOT instrumented at all : the first observer
+        installs the notifying versions of `process_line` and `process_table` on this instance,
+        and removing the last one restores the plain versions.
+        """
+        if self._events is None:
+            self._events = _CollectedEvents(self._sizeOfBatchOfEvents)
+            self._parser = _NotifyingParser(self._parser, self._events)
+            self.process_line = self._process_line_and_notify
+            self.process_table = self._process_table_and_notify
+        self._events.observers.append(observer)
+
+    def remove_observer(self, observer: ProcessingObserver):
+        """Unregister the given observer, after sending it the pending events."""
+        self.flush_observers()
+        self._events.observers.remove(observer)
+        if len(self._events.observers) == 0:
+            self._parser = self._parser.parser
+            del self.process_line
+            del self.process_table
+            self._events = None
+
+    def has_observers(self) -> bool:
+        return self._events is not None
+
+    def flush_observers(self):
+        """Send the pending events to the observers, if any."""
+        if self._events is not None:
+            self._events.flush()
+
+    def start_file(self, path: Optional[str] = None):
+        """Tell the observers, if any, that the following lines belong to the given file ; the
+        indexes of the lines start again from 0."""
+        if self._events is None:
+            return
+        self._events.flush()
+        self._events.countOfLines = 0
+        for observer in self._events.observers:
+            observer.on_file_start(path)
+
+    def end_file(self, path: Optional[str] = None):
+        """Send the pending events, then tell the observers, if any, that the given file has been
+        processed."""
+        if self._events is None:
+            return
+        self._events.flush()
+        for observer in self._events.observers:
+            observer.on_file_end(path)
+
+    def _collect(self, statementLine, line: str):
+        events = self._events
+        index = events.countOfLines
+        events.countOfLines = index + 1
+        if statementLine is not None:
+            events.parsed.append((index, statementLine))
+        events.rendered.append((index, line))
+        if len(events.rendered) >= events.sizeOfBatch:
+            events.flush()
+
+    def _process_line_and_notify(self, line: str, stylesheet) -> str:
+        # the version of the class, that may be a subclass
+        self._events.lastParsed = None
+        result = type(self).process_line(self, line, stylesheet)
+        self._collect(self._events.lastParsed, result)
+        return result
+
+    def _process_table_and_notify(self, table: StatementTable, stylesheet):
+        kinds = table.kinds
+        for i, result in enumerate(type(self).process_table(self, table, stylesheet)):
+            self._collect(
+                (
+                    table.compactStatementLine(i)
+                    if kinds[i] == LINE_KIND__STATEMENT
+                    else None
+                ),
+                result,
+            )
+            yield result
 
     ##############################################
     # Processing comment lines
@@ -41,8 +179,9 @@ class SourceProcessor:
         return (pos + tabWidth) // tabWidth * tabWidth
 
     def process_comment_line(self, line: str, stylesheet) -> str:
-        tabWidth = stylesheet["tabulation"]["width"]
-        tabAsSpaces = " " * tabWidth
+        plan = compile_stylesheet(stylesheet)
+        tabWidth = plan.tabWidth
+        tabAsSpaces = plan.tabAsSpaces
 
         isSpecialCommentLine = len(line) >= 2 and line[1] == line[0]
 
@@ -51,11 +190,10 @@ class SourceProcessor:
             # sanity check
             return ""
 
-        prefixStylesheet = stylesheet["comment_lines"]["prefix"]
         prefix = (
-            f"{prefixStylesheet}{prefixStylesheet} "
+            plan.prefixOfSpecialCommentLines
             if isSpecialCommentLine
-            else f"{prefixStylesheet} "
+            else plan.prefixOfCommentLines
         )
         current_pos = len(prefix)
         next_tab = self.compute_next_tab(current_pos, tabWidth)
@@ -76,6 +214,7 @@ class SourceProcessor:
     ##############################################
 
     def process_line(self, line: str, stylesheet) -> str:
+        stylesheet = compile_stylesheet(stylesheet)
         cleaned_line = line.rstrip()
         if len(cleaned_line) == 0:
             # Sanity check, no need to do anything
@@ -93,3 +232,80 @@ class SourceProcessor:
         elif statementLine.isEmpty() or statementLine.isOperationWithoutComment():
             self._renderer.allowCommentBlock()
         return self._renderer.render(statementLine, stylesheet)
+
+    def is_state_reset_line(self, line: str) -> bool:
+        """True when processing the given line resets the state to the initial one, i.e. the
+        processing of the next lines does not depend on the previous lines."""
+        return self.is_comment_block_allowed_after(line) is True
+
+    def is_comment_block_allowed_after(self, line: str) -> Optional[bool]:
+        """Whether a comment block is allowed after processing the given line, or None when the
+        line does not change it, WITHOUT changing the state."""
+        cleaned_line = line.rstrip()
+        if len(cleaned_line) == 0 or self.is_comment_line(cleaned_line):
+            return True
+        statementLine = self._parser.parse(cleaned_line)
+        if statementLine.isCommentedOperation():
+            return False
+        elif statementLine.isEmpty() or statementLine.isOperationWithoutComment():
+            return True
+        return None
+
+    def resume(self, previousLines: Sequence[str]):
+        """Set the state reached after processing the given lines, by scanning them backwards up to
+        the nearest line that sets the state, instead of processing all of them."""
+        for line in reversed(previousLines):
+            isAllowed = self.is_comment_block_allowed_after(line)
+            if isAllowed is not None:
+                break
+        else:
+            isAllowed = True
+        if isAllowed:
+            self._renderer.allowCommentBlock()
+        else:
+            self._renderer.denyCommentBlock()
+
+    def process_line_range(
+        self, lines: Iterable[str], lineRange: range, stylesheet
+    ) -> Iterator[str]:
+        """Yields each given line, processed when its index (starting from 0) is inside the given
+        range, otherwise untouched but for its trailing line feed.
+
+        The state at the start of the range is resumed (see `resume`) from the previous lines since
+        the latest empty or comment line, that are kept for this purpose.
+        """
+        previousLines = []
+        for index, line in enumerate(lines):
+            if index in lineRange:
+                if index == lineRange.start:
+                    self.resume(previousLines)
+                    previousLines.clear()
+                yield self.process_line(line, stylesheet)
+                continue
+            if index < lineRange.start:
+                cleaned_line = line.rstrip()
+                if len(cleaned_line) == 0 or self.is_comment_line(cleaned_line):
+                    previousLines.clear()
+                previousLines.append(line)
+            yield line[:-1] if line.endswith("\n") else line
+
+    def process_table(self, table: StatementTable, stylesheet):
+        """Same as calling `process_line` on each line of the given table, yields the processed lines."""
+        stylesheet = compile_stylesheet(stylesheet)
+        renderer = self._renderer
+        for i, kind in enumerate(table.kinds):
+            if kind == LINE_KIND__BLANK:
+                renderer.allowCommentBlock()
+                yield ""
+            elif kind == LINE_KIND__COMMENT_LINE:
+                renderer.allowCommentBlock()
+                yield self.process_comment_line(table.line(i), stylesheet)
+            else:
+                statementLine = table.compactStatementLine(i)
+                if statementLine.isCommentedOperation():
+                    renderer.denyCommentBlock()
+                elif (
+                    statementLine.isEmpty() or statementLine.isOperationWithoutComment()
+                ):
+                    renderer.allowCommentBlock()
+                yield renderer.render(statementLine, stylesheet)
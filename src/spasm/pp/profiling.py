@@ -0,0 +1,116 @@
+"""
+---
+(c) 2024 David SPORN
+---
+This is part of SPASM -- Sporniket's toolbox for assembly language.
+
+SPASM is free software: you can redistribute it and/or
+modify it under the terms of the GNU General Public License as published by the
+Free Software Foundation, either version 3 of the License, or (at your option)
+any later version.
+
+SPASM is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY
+or FITNESS FOR A PARTICULAR PURPOSE.
+
+See the GNU General Public License for more details.
+You should have received a copy of the GNU General Public License along with SPASM.
+If not, see <https://www.gnu.org/licenses/>. 
+---
+"""
+
+import tracemalloc
+from typing import Callable, List, Optional, Tuple
+
+# count of the allocation sites that are reported
+COUNT_OF_ALLOCATION_SITES = 10
+
+# frames of the tracing machinery itself, that are not reported
+_IGNORED_FRAMES = [
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+]
+
+
+class MemoryReport:
+    """The peak of the traced allocations of a run, and the sites allocating the most memory that
+    is still allocated at the end of the run."""
+
+    def __init__(self, peak: int, current: int, sites: List[Tuple[str, int, int]]):
+        self.peak = peak
+        self.current = current
+        # (file:line, size, count of blocks)
+        self.sites = sites
+
+    def summary(self) -> str:
+        """The human readable summary of the report."""
+        result = [
+            f"MEMORY -- peak of traced allocations : {_kib(self.peak)} ({_kib(self.current)} at the end)"
+        ]
+        if len(self.sites) > 0:
+            result.append("* top allocation sites, still allocated at the end :")
+            for site, size, count in self.sites:
+                result.append(f"  {_kib(size):>12} {count:8} blocks  {site}")
+        return "\n".join(result)
+
+
+def _kib(size: int) -> str:
+    return f"{size / 1024:.1f} KiB"
+
+
+class ProfiledRun:
+    """Calls a function under cProfile when a path of profile is given, and tracing the memory
+    allocations (see `tracemalloc`) when asked to.
+
+    The stats of the profile are dumped by `dumpProfile()`, e.g. to be loaded by `pstats` or
+    `snakeviz`."""
+
+    def __init__(
+        self,
+        *,
+        pathOfProfile: Optional[str] = None,
+        traceMemory: bool = False,
+        countOfSites: int = COUNT_OF_ALLOCATION_SITES,
+    ):
+        self.pathOfProfile = pathOfProfile
+        self.traceMemory = traceMemory
+        self.countOfSites = countOfSites
+        self.memoryReport: Optional[MemoryReport] = None
+        self._profiler = None
+
+    def call(self, function: Callable[[], int]) -> int:
+        """The result of the given function ; the memory report, if any, is then available."""
+        if self.pathOfProfile is not None:
+            import cProfile
+
+            self._profiler = cProfile.Profile()
+        # e.g. started by `python -X tracemalloc`, then left as is
+        isAlreadyTracing = tracemalloc.is_tracing()
+        if self.traceMemory and not isAlreadyTracing:
+            tracemalloc.start()
+        try:
+            if self._profiler is None:
+                return function()
+            return self._profiler.runcall(function)
+        finally:
+            if self.traceMemory:
+                self.memoryReport = _memory_report(self.countOfSites)
+                if not isAlreadyTracing:
+                    tracemalloc.stop()
+
+    def dumpProfile(self):
+        """Write the stats of the profile into its path, if any ; `OSError` is raised."""
+        if self._profiler is not None:
+            self._profiler.dump_stats(self.pathOfProfile)
+
+
+def _memory_report(countOfSites: int) -> MemoryReport:
+    current, peak = tracemalloc.get_traced_memory()
+    snapshot = tracemalloc.take_snapshot().filter_traces(_IGNORED_FRAMES)
+    sites = [
+        (f"{s.traceback[0].filename}:{s.traceback[0].lineno}", s.size, s.count)
+        for s in snapshot.statistics("lineno")[:countOfSites]
+    ]
+    return MemoryReport(peak, current, sites)
@@ -19,8 +19,18 @@ If not, see <https://www.gnu.org/licenses/>. 
 ---
 """
 
-from .model import StatementLine
-from .parser import StatementLineParser
-from .renderer import StatementLineRenderer
+from .model import CompactStatementLine, StatementLine
+from .parser import StatementLineParser, StatementLinePatternParser
+from .renderer import StatementLineColumnRenderer, StatementLineRenderer
+from .table import StatementTable, parse_many
 
-__all__ = ["StatementLine", "StatementLineParser", "StatementLineRenderer"]
+__all__ = [
+    "CompactStatementLine",
+    "StatementLine",
+    "StatementLineParser",
+    "StatementLinePatternParser",
+    "StatementLineColumnRenderer",
+    "StatementLineRenderer",
+    "StatementTable",
+    "parse_many",
+]
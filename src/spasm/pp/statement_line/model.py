@@ -19,8 +19,16 @@ If not, see <https://www.gnu.org/licenses/>. 
 ---
 """
 
+import sys
+
 from .._utils import _is_empty_string
 
+# flags of the parts that are present in a statement line
+PART__LABEL = 1
+PART__MNEMONIC = 2
+PART__OPERANDS = 4
+PART__COMMENT = 8
+
 
 class StatementLine:
     """Model of a statement line
@@ -117,3 +125,129 @@ class StatementLine:
 
     def isOperationWithoutComment(self) -> bool:
         return not _is_empty_string(self.mnemonic) and _is_empty_string(self.comment)
+
+    def hasLabel(self) -> bool:
+        return not _is_empty_string(self.label)
+
+    def hasOperands(self) -> bool:
+        return not _is_empty_string(self.operands)
+
+    def hasComment(self) -> bool:
+        return not _is_empty_string(self.comment)
+
+    @property
+    def parts(self) -> int:
+        """The flags (`PART__xxx`) of the parts that are present"""
+        return (
+            (PART__LABEL if self.hasLabel() else 0)
+            | (PART__MNEMONIC if not _is_empty_string(self.mnemonic) else 0)
+            | (PART__OPERANDS if self.hasOperands() else 0)
+            | (PART__COMMENT if self.hasComment() else 0)
+        )
+
+
+class CompactStatementLine:
+    """Read only and compact model of a statement line
+    ---
+    Same queries as `StatementLine`, but the label, operands and comment parts are spans of the
+    source line (that may be a whole source buffer), the mnemonic is interned, and the flags of
+    the present parts are computed once at creation.
+
+    A span with a start greater or equal than its end means that the part is missing."""
+
+    __slots__ = (
+        "_source",
+        "_labelStart",
+        "_labelEnd",
+        "_mnemonic",
+        "_operandsStart",
+        "_operandsEnd",
+        "_commentStart",
+        "_commentEnd",
+        "parts",
+    )
+
+    def __init__(
+        self,
+        source: str,
+        labelStart: int,
+        labelEnd: int,
+        mnemonicStart: int,
+        mnemonicEnd: int,
+        operandsStart: int,
+        operandsEnd: int,
+        commentStart: int,
+        commentEnd: int,
+    ):
+        self._source = source
+        self._labelStart = labelStart
+        self._labelEnd = labelEnd
+        self._mnemonic = (
+            sys.intern(source[mnemonicStart:mnemonicEnd])
+            if mnemonicEnd > mnemonicStart
+            else ""
+        )
+        self._operandsStart = operandsStart
+        self._operandsEnd = operandsEnd
+        self._commentStart = commentStart
+        self._commentEnd = commentEnd
+        self.parts = (
+            (PART__LABEL if labelEnd > labelStart else 0)
+            | (PART__MNEMONIC if mnemonicEnd > mnemonicStart else 0)
+            | (PART__OPERANDS if operandsEnd > operandsStart else 0)
+            | (PART__COMMENT if commentEnd > commentStart else 0)
+        )
+
+    ##############################################
+    # Parts
+    ##############################################
+
+    @property
+    def label(self) -> str:
+        """The label part of the line, without any marker"""
+        return self._source[self._labelStart : self._labelEnd]
+
+    @property
+    def mnemonic(self) -> str:
+        """The mnemonic part of the line."""
+        return self._mnemonic
+
+    @property
+    def operands(self) -> str:
+        """The operands list."""
+        return self._source[self._operandsStart : self._operandsEnd]
+
+    @property
+    def comment(self) -> str:
+        """The comment line, without any marker and whitespace striped on both ends"""
+        return self._source[self._commentStart : self._commentEnd]
+
+    ##############################################
+    # Queries
+    ##############################################
+
+    def isEmpty(self) -> bool:
+        return self.parts == 0
+
+    def isCommentOnly(self) -> bool:
+        return self.parts == PART__COMMENT
+
+    def isCommentedOperation(self) -> bool:
+        return self.parts & (PART__MNEMONIC | PART__COMMENT) == (
+            PART__MNEMONIC | PART__COMMENT
+        )
+
+    def isNoOperation(self) -> bool:
+        return self.parts & (PART__MNEMONIC | PART__OPERANDS) == 0
+
+    def isOperationWithoutComment(self) -> bool:
+        return self.parts & (PART__MNEMONIC | PART__COMMENT) == PART__MNEMONIC
+
+    def hasLabel(self) -> bool:
+        return self.parts & PART__LABEL != 0
+
+    def hasOperands(self) -> bool:
+        return self.parts & PART__OPERANDS != 0
+
+    def hasComment(self) -> bool:
+        return self.parts & PART__COMMENT != 0
@@ -19,13 +19,15 @@ If not, see <https://www.gnu.org/licenses/>. 
 ---
 """
 
+import re
+
 from ..consts import (
     MARKERS__COMMENT,
     MARKERS__STRING,
     MARKERS__LABEL,
     WHITESPACES,
 )
-from .model import StatementLine
+from .model import CompactStatementLine, StatementLine
 
 # state machine states for parsing a statement line
 ACCUMULATE_LABEL = 0  # when first character is not whitespace --> DONE_LABEL
@@ -195,3 +197,90 @@ class StatementLineParser:
                     )
 
         return result
+
+
+##############################################
+# Pattern based engine
+##############################################
+
+
+def _as_charset(markers) -> str:
+    return "".join(re.escape(m) for m in markers)
+
+
+_W = _as_charset(WHITESPACES)
+_C = _as_charset(MARKERS__COMMENT)
+_S = _as_charset(MARKERS__STRING)
+_L = _as_charset(MARKERS__LABEL)
+# the state machine only ends a string litteral with this one
+_Q = re.escape(MARKERS__STRING[0])
+
+# One match per line, reproducing the state machine above, quirks included :
+# * a label is either at the start of the line, or followed by a label marker ;
+# * operands starting with a string marker capture everything until the closing
+#   marker, including whitespaces and comment markers ;
+# * trailing string markers of operands are not part of the operands ;
+# * a comment without comment marker is captured only when longer than one character.
+PATTERN_OF_STATEMENT_LINE = re.compile(
+    rf"""
+    (?:
+        (?:(?=[^{_W}])|[{_W}]+(?=[^{_W}{_C}][^{_W}{_C}{_L}]*[{_L}]))
+        (?P<label>[^{_W}][^{_W}{_C}{_L}]*)[{_W}{_L}]?
+    )?
+    [{_W}]*(?P<mnemonic>[^{_W}{_C}]+)?
+    (?:
+        [{_W}]+
+        (?P<operands>
+            [{_S}][^{_Q}]*{_Q}?(?:[^{_W}{_C}]*[^{_W}{_C}{_S}])?
+            |[^{_W}{_C}{_S}](?:[^{_W}{_C}]*[^{_W}{_C}{_S}])?
+        )
+        [{_S}]*
+    )?
+    [{_W}]*
+    (?:[{_C}][{_W}]*(?P<comment>.+)?|(?P<looseComment>[^{_W}{_C}].*))?
+    """,
+    re.VERBOSE | re.DOTALL,
+)
+
+
+class StatementLinePatternParser:
+    """Alternative engine to `StatementLineParser`, relying on a precompiled pattern.
+
+    The fields are sliced out of the line from a single match, and the resulting
+    `StatementLine` is identical to the one built by the state machine."""
+
+    def __init__(self, pattern=PATTERN_OF_STATEMENT_LINE, *, compact: bool = False):
+        """Constructor
+
+        Args:
+            pattern (optional): the precompiled pattern to use.
+            compact (bool, optional): when True, `parse` returns a `CompactStatementLine` referencing the parsed line.
+        """
+        self._match = pattern.fullmatch
+        self._compact = compact
+
+    def parse(self, line: str):
+        m = self._match(line)
+        if self._compact:
+            looseStart, looseEnd = m.span("looseComment")
+            return CompactStatementLine(
+                line,
+                *m.span("label"),
+                *m.span("mnemonic"),
+                *m.span("operands"),
+                *(
+                    (looseStart, looseEnd)
+                    if looseEnd - looseStart > 1
+                    else m.span("comment")
+                ),
+            )
+        result = StatementLine()
+        result.label, result.mnemonic, result.operands, comment, looseComment = (
+            m.groups()
+        )
+        result.comment = (
+            looseComment
+            if looseComment is not None and len(looseComment) > 1
+            else comment
+        )
+        return result
@@ -19,8 +19,14 @@ If not, see <https://www.gnu.org/licenses/>. 
 ---
 """
 
-from .._utils import _is_empty_string
-from .model import StatementLine
+from ..stylesheet.compiled import compile_stylesheet
+from .model import (
+    PART__COMMENT,
+    PART__LABEL,
+    PART__MNEMONIC,
+    PART__OPERANDS,
+    StatementLine,
+)
 
 
 class StatementLineRenderer:
@@ -49,50 +55,26 @@ class StatementLineRenderer:
 
     def renderLabel(self, line: StatementLine, stylesheet) -> str:
         """Render the label, INCLUDING A SEPARATING SPACE"""
-        tabStop = stylesheet["tab_stops"]["labels"]["position"]
-        marginWidth = stylesheet["labels"]["margin_space"]
-        # REMOVE minimalLength = tabStop - marginWidth
-        isLeftAlign = stylesheet["labels"]["align"] == "left"
-        isRightAlign = ~isLeftAlign
-        supplementalMarginOfShortLabels = (
-            len(stylesheet["labels"]["postfix"])
-            if stylesheet["labels"]["force_postfix"] or isRightAlign
-            else 0
-        )
-        lenOfShortLabel = tabStop - supplementalMarginOfShortLabels - marginWidth
+        plan = compile_stylesheet(stylesheet)
+        tabStop = plan.tabStopOfLabels
 
-        if _is_empty_string(line.label):
+        if not line.hasLabel():
             # no label
-            return " " * (tabStop)
-        elif len(line.label) > lenOfShortLabel:
+            return plan.paddingOfLabels
+        label = line.label
+        if len(label) > plan.lenOfShortLabel:
             # long label
-            postpadding = " " * marginWidth
-            postfix = (
-                stylesheet["labels"]["postfix"]
-                if stylesheet["labels"]["force_postfix"]
-                else ""
-            )
-            return f"{line.label}{postfix}{postpadding}"
+            return f"{label}{plan.postfixOfLeftAlignedLabels}{plan.postPaddingOfLabels}"
+        elif plan.isLeftAlign or line.mnemonic.lower() in plan.ignoreAlignMnemonics:
+            # short label, left aligned
+            return f"{label}{plan.postfixOfLeftAlignedLabels}{plan.paddingOfLabels}"[
+                :tabStop
+            ]
         else:
-            # short label
-            align = stylesheet["labels"]["align"]
-            if (
-                isLeftAlign
-                or line.mnemonic.lower()
-                in stylesheet["labels"]["ignore_align_mnemonics"]
-            ):
-                padding = " " * (tabStop)
-                postfix = (
-                    stylesheet["labels"]["postfix"]
-                    if stylesheet["labels"]["force_postfix"]
-                    else ""
-                )
-                return f"{line.label}{postfix}{padding}"[:tabStop]
-            else:
-                padding = " " * (tabStop)
-                postfix = stylesheet["labels"]["postfix"]
-                postpadding = " " * marginWidth
-                return f"{padding}{line.label}{postfix}{postpadding}"[-tabStop:]
+            # short label, right aligned
+            return f"{plan.paddingOfLabels}{label}{plan.postfix}{plan.postPaddingOfLabels}"[
+                -tabStop:
+            ]
 
     def renderLineBody(
         self,
@@ -101,11 +83,12 @@ class StatementLineRenderer:
         endOfLabel: int,
         previousSpacing: int = 0,
     ) -> str:
-        requiredSpacing = stylesheet["labels"]["margin_space"] - previousSpacing
+        plan = compile_stylesheet(stylesheet)
+        requiredSpacing = plan.marginOfLabels - previousSpacing
         padding = " " * requiredSpacing if requiredSpacing > 0 else ""
-        startPosition = stylesheet["tab_stops"]["labels"]["position"]
-        tabStopMnemonic = stylesheet["tab_stops"]["mnemonic"]["position"]
-        tabStopsOperands = stylesheet["tab_stops"]["operands"]["position"]
+        startPosition = plan.tabStopOfLabels
+        tabStopMnemonic = plan.tabStopOfMnemonic
+        tabStopsOperands = plan.tabStopOfOperands
 
         # Verify and adjust each position
         if startPosition < endOfLabel:
@@ -120,7 +103,7 @@ class StatementLineRenderer:
 
         if line.isNoOperation():
             return " " * widthOfOperation
-        elif _is_empty_string(line.operands):
+        elif not line.hasOperands():
             rendered = f"{padding}{line.mnemonic}"
             postMnemonicPadding = " " * widthOfOperation
             return (
@@ -151,34 +134,206 @@ class StatementLineRenderer:
     def renderComment(
         self, line: StatementLine, stylesheet, previousSpacing: int = 0
     ) -> str:
-        if _is_empty_string(line.comment):
+        if not line.hasComment():
             return ""
         else:
-            requiredSpacing = stylesheet["comments"]["margin_space"] - previousSpacing
+            plan = compile_stylesheet(stylesheet)
+            requiredSpacing = plan.marginOfComments - previousSpacing
             padding = " " * requiredSpacing if requiredSpacing > 0 else ""
-            prefix = stylesheet["comments"]["prefix"]
-            toRender = line.comment
-            return f"{padding}{prefix} {toRender}"
+            return f"{padding}{plan.prefixOfComments} {line.comment}"
 
     def render(self, line: StatementLine, stylesheet) -> str:
         """Apply formatting rules"""
         if line.isEmpty():
             return ""
+        plan = compile_stylesheet(stylesheet)
         if line.isCommentOnly() and self.commentBlockEnabled:
-            prefix = " " * stylesheet["tab_stops"]["labels"]["position"]
-            renderedComment = self.renderComment(line, stylesheet, len(prefix))
+            prefix = plan.paddingOfLabels
+            renderedComment = self.renderComment(line, plan, len(prefix))
             return f"{prefix}{renderedComment}".rstrip()
         else:
-            renderedLabel = self.renderLabel(line, stylesheet)
+            renderedLabel = self.renderLabel(line, plan)
             startOfLineBody = len(renderedLabel)
             spacingBeforeLineBody = startOfLineBody - len(renderedLabel.rstrip())
             renderedLineBody = self.renderLineBody(
-                line, stylesheet, startOfLineBody, spacingBeforeLineBody
+                line, plan, startOfLineBody, spacingBeforeLineBody
             )
             spacingBeforeComment = (
                 spacingBeforeLineBody
                 if line.isNoOperation()
                 else len(renderedLineBody) - len(renderedLineBody.rstrip())
             )
-            renderedComment = self.renderComment(line, stylesheet, spacingBeforeComment)
+            renderedComment = self.renderComment(line, plan, spacingBeforeComment)
             return f"{renderedLabel}{renderedLineBody}{renderedComment}".rstrip()
+
+
+_SPACES = [" " * n for n in range(128)]
+
+
+def _spaces(count: int) -> str:
+    return _SPACES[count] if count < 128 else " " * count
+
+
+def _trailing_whitespaces(*texts) -> int:
+    """Same as `len(t) - len(t.rstrip())`, `t` being the concatenation of the given texts, without
+    doing the concatenation, nor copying anything in the usual case."""
+    result = 0
+    for text in reversed(texts):
+        if len(text) == 0:
+            continue
+        if not text[-1].isspace():
+            return result
+        lenOfStripped = len(text.rstrip())
+        result += len(text) - lenOfStripped
+        if lenOfStripped > 0:
+            return result
+    return result
+
+
+class StatementLineColumnRenderer(StatementLineRenderer):
+    """Alternative engine to `StatementLineRenderer`, giving the same results.
+
+    Instead of building padded strings and measuring them back, the current column and the count
+    of trailing spaces are tracked as integers ; then each part is emitted once into the rendered
+    line, and the spaces that would be stripped at the end of the line are never emitted.
+    """
+
+    def render(self, line: StatementLine, stylesheet) -> str:
+        """Apply formatting rules"""
+        parts = line.parts
+        if parts == 0:
+            return ""
+        plan = compile_stylesheet(stylesheet)
+        tabStop = plan.tabStopOfLabels
+        if parts == PART__COMMENT and self.commentBlockEnabled:
+            requiredSpacing = plan.marginOfComments - tabStop
+            if requiredSpacing > 0:
+                tabStop += requiredSpacing
+            return self._withComment("", tabStop, plan.prefixOfComments, line.comment)
+
+        # -- label ; `pending` is the count of spaces after the last emitted part
+        margin = len(plan.postPaddingOfLabels)
+        lead = 0
+        label = postfix = ""
+        if parts & PART__LABEL == 0:
+            column = trailing = pending = tabStop
+        else:
+            label = line.label
+            lenOfLabel = len(label)
+            if lenOfLabel > plan.lenOfShortLabel:
+                postfix = plan.postfixOfLeftAlignedLabels
+                column = lenOfLabel + len(postfix) + margin
+                pending = margin
+                trailing = (
+                    margin + _trailing_whitespaces(label, postfix)
+                    if (postfix or label)[-1].isspace()
+                    else margin
+                )
+            elif plan.isLeftAlign or line.mnemonic.lower() in plan.ignoreAlignMnemonics:
+                postfix = plan.postfixOfLeftAlignedLabels
+                lenOfContent = lenOfLabel + len(postfix)
+                if lenOfContent > tabStop:
+                    return super().render(line, plan)
+                column = tabStop
+                pending = tabStop - lenOfContent
+                trailing = (
+                    pending + _trailing_whitespaces(label, postfix)
+                    if (postfix or label)[-1].isspace()
+                    else pending
+                )
+            else:
+                postfix = plan.postfix
+                lenOfContent = lenOfLabel + len(postfix)
+                lead = tabStop - lenOfContent - margin
+                if lead < 0:
+                    return super().render(line, plan)
+                column = tabStop
+                pending = margin
+                trailing = margin
+                if (postfix or label)[-1].isspace():
+                    trailingOfContent = _trailing_whitespaces(label, postfix)
+                    if trailingOfContent == lenOfContent:
+                        trailingOfContent += lead
+                    trailing += trailingOfContent
+
+        # -- line body
+        requiredSpacing = plan.marginOfLabels - trailing
+        padding = requiredSpacing if requiredSpacing > 0 else 0
+        startPosition = column if column > tabStop else tabStop
+        tabStopMnemonic = plan.tabStopOfMnemonic
+        if tabStopMnemonic < startPosition:
+            tabStopMnemonic = startPosition
+        tabStopOperands = plan.tabStopOfOperands
+        if tabStopOperands < tabStopMnemonic:
+            tabStopOperands = tabStopMnemonic
+        widthOfOperation = tabStopOperands - startPosition
+
+        if parts & (PART__MNEMONIC | PART__OPERANDS) == 0:
+            # no operation
+            rendered = f"{_spaces(lead)}{label}{postfix}"
+            pending += widthOfOperation
+            spacingBeforeComment = trailing
+        else:
+            mnemonic = line.mnemonic
+            lenOfRendered = padding + len(mnemonic)
+            trailingOfMnemonic = (
+                _trailing_whitespaces(mnemonic)
+                if len(mnemonic) == 0 or mnemonic[-1].isspace()
+                else 0
+            )
+            if trailingOfMnemonic == len(mnemonic):
+                trailingOfMnemonic += padding
+
+            if parts & PART__OPERANDS == 0:
+                # mnemonic without operands
+                rendered = f"{_spaces(lead)}{label}{postfix}{_spaces(pending + padding)}{mnemonic}"
+                pending = (
+                    widthOfOperation - lenOfRendered
+                    if lenOfRendered < widthOfOperation
+                    else 0
+                )
+                spacingBeforeComment = pending + trailingOfMnemonic
+            else:
+                # mnemonic and operands
+                widthOfMnemonic = tabStopMnemonic - startPosition
+                fill = (
+                    widthOfMnemonic - lenOfRendered
+                    if lenOfRendered < widthOfMnemonic
+                    else 0
+                )
+                trailingOfMnemonic += fill
+                paddingOperands = 1 if trailingOfMnemonic == 0 else 0
+                operands = line.operands
+                lenOfRendered += fill + paddingOperands + len(operands)
+                rendered = f"{_spaces(lead)}{label}{postfix}{_spaces(pending + padding)}{mnemonic}{_spaces(fill + paddingOperands)}{operands}"
+                pending = (
+                    widthOfOperation - lenOfRendered
+                    if lenOfRendered < widthOfOperation
+                    else 0
+                )
+                spacingBeforeComment = pending
+                if operands[-1].isspace():
+                    trailingOfOperands = _trailing_whitespaces(operands)
+                    if trailingOfOperands == len(operands):
+                        trailingOfOperands += trailingOfMnemonic + paddingOperands
+                    spacingBeforeComment += trailingOfOperands
+
+        # -- comment
+        if parts & PART__COMMENT:
+            requiredSpacing = plan.marginOfComments - spacingBeforeComment
+            if requiredSpacing > 0:
+                pending += requiredSpacing
+            return self._withComment(
+                rendered, pending, plan.prefixOfComments, line.comment
+            )
+        return (
+            rendered.rstrip()
+            if len(rendered) > 0 and rendered[-1].isspace()
+            else rendered
+        )
+
+    def _withComment(
+        self, rendered: str, spacing: int, prefix: str, comment: str
+    ) -> str:
+        result = f"{rendered}{_spaces(spacing)}{prefix} {comment}"
+        return result.rstrip() if comment[-1].isspace() else result
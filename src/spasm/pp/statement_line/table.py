@@ -0,0 +1,186 @@
+"""
+---
+(c) 2024 David SPORN
+---
+This is part of SPASM -- Sporniket's toolbox for assembly language.
+
+SPASM is free software: you can redistribute it and/or
+modify it under the terms of the GNU General Public License as published by the
+Free Software Foundation, either version 3 of the License, or (at your option)
+any later version.
+
+SPASM is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY
+or FITNESS FOR A PARTICULAR PURPOSE.
+
+See the GNU General Public License for more details.
+You should have received a copy of the GNU General Public License along with SPASM.
+If not, see <https://www.gnu.org/licenses/>. 
+---
+"""
+
+from array import array
+from typing import Iterable
+
+from ..consts import MARKERS__COMMENT
+from .model import CompactStatementLine, StatementLine
+from .parser import PATTERN_OF_STATEMENT_LINE
+
+# kinds of lines
+LINE_KIND__BLANK = 0
+LINE_KIND__COMMENT_LINE = 1
+LINE_KIND__STATEMENT = 2
+
+# fields of a statement line, in the order of the columns
+FIELDS = ["label", "mnemonic", "operands", "comment"]
+
+
+class StatementTable:
+    """Columnar model of a whole source
+    ---
+    All the lines are kept inside a single source buffer, and each line is described by parallel
+    columns (one item per line) :
+
+    * `kinds` : one of `LINE_KIND__BLANK`, `LINE_KIND__COMMENT_LINE` or `LINE_KIND__STATEMENT`
+    * `lineStarts`, `lineLengths` : the span of the line, WITHOUT trailing whitespaces
+    * `<field>Starts`, `<field>Lengths` for each field of a statement line (label, mnemonic,
+      operands, comment) : the span of the field, a length of 0 meaning that there is no such field.
+      Those columns are filled only for statement lines.
+
+    Use `parse_many(lines)` to build a table."""
+
+    def __init__(self, source: str):
+        self.source = source
+        self.kinds = array("B")
+        self.lineStarts = array("L")
+        self.lineLengths = array("L")
+        self.labelStarts = array("L")
+        self.labelLengths = array("L")
+        self.mnemonicStarts = array("L")
+        self.mnemonicLengths = array("L")
+        self.operandsStarts = array("L")
+        self.operandsLengths = array("L")
+        self.commentStarts = array("L")
+        self.commentLengths = array("L")
+
+    def __len__(self) -> int:
+        return len(self.kinds)
+
+    ##############################################
+    # Access to the content
+    ##############################################
+
+    def line(self, index: int) -> str:
+        """The line, without trailing whitespaces"""
+        start = self.lineStarts[index]
+        return self.source[start : start + self.lineLengths[index]]
+
+    def field(self, index: int, name: str) -> str:
+        """The given field (one of `FIELDS`) of the line, or an empty string"""
+        start = getattr(self, f"{name}Starts")[index]
+        return self.source[start : start + getattr(self, f"{name}Lengths")[index]]
+
+    def statementLine(self, index: int) -> StatementLine:
+        """Builds the model of the given statement line"""
+        result = StatementLine()
+        result.label = self.field(index, "label")
+        result.mnemonic = self.field(index, "mnemonic")
+        result.operands = self.field(index, "operands")
+        result.comment = self.field(index, "comment")
+        return result
+
+    def compactStatementLine(self, index: int) -> CompactStatementLine:
+        """Builds the compact model of the given statement line, referencing the source buffer"""
+        labelStart = self.labelStarts[index]
+        mnemonicStart = self.mnemonicStarts[index]
+        operandsStart = self.operandsStarts[index]
+        commentStart = self.commentStarts[index]
+        return CompactStatementLine(
+            self.source,
+            labelStart,
+            labelStart + self.labelLengths[index],
+            mnemonicStart,
+            mnemonicStart + self.mnemonicLengths[index],
+            operandsStart,
+            operandsStart + self.operandsLengths[index],
+            commentStart,
+            commentStart + self.commentLengths[index],
+        )
+
+
+def _append_span(starts: array, lengths: array, span):
+    # span of an unmatched group is (-1, -1)
+    start, end = span
+    if start < 0:
+        starts.append(0)
+        lengths.append(0)
+    else:
+        starts.append(start)
+        lengths.append(end - start)
+
+
+def parse_many(
+    lines: Iterable[str], *, pattern=PATTERN_OF_STATEMENT_LINE
+) -> StatementTable:
+    """Parses a whole source in one pass
+    ---
+    `lines` MAY have a trailing line feed, e.g. the lines of an opened file. Parsing gives the same
+    results as `StatementLinePatternParser`, the fields being described by their span inside the
+    source buffer of the table instead of being copied."""
+    pieces = []
+    for line in lines:
+        pieces.append(line)
+        if not line.endswith("\n"):
+            pieces.append("\n")
+    source = "".join(pieces)
+    del pieces
+
+    table = StatementTable(source)
+    match = pattern.fullmatch
+    kinds = table.kinds
+    lineStarts = table.lineStarts
+    lineLengths = table.lineLengths
+    columns = [
+        (getattr(table, f"{name}Starts"), getattr(table, f"{name}Lengths"))
+        for name in FIELDS
+    ]
+    labelColumns, mnemonicColumns, operandsColumns, commentColumns = columns
+
+    start = 0
+    sizeOfSource = len(source)
+    while start < sizeOfSource:
+        nextStart = source.index("\n", start) + 1
+        end = nextStart - 1
+        while end > start and source[end - 1].isspace():
+            end -= 1
+        lineStarts.append(start)
+        lineLengths.append(end - start)
+
+        if end == start:
+            kinds.append(LINE_KIND__BLANK)
+            for starts, lengths in columns:
+                starts.append(0)
+                lengths.append(0)
+        elif source[start] in MARKERS__COMMENT:
+            kinds.append(LINE_KIND__COMMENT_LINE)
+            for starts, lengths in columns:
+                starts.append(0)
+                lengths.append(0)
+        else:
+            kinds.append(LINE_KIND__STATEMENT)
+            m = match(source, start, end)
+            _append_span(*labelColumns, m.span("label"))
+            _append_span(*mnemonicColumns, m.span("mnemonic"))
+            _append_span(*operandsColumns, m.span("operands"))
+            looseStart, looseEnd = m.span("looseComment")
+            _append_span(
+                *commentColumns,
+                (
+                    (looseStart, looseEnd)
+                    if looseEnd - looseStart > 1
+                    else m.span("comment")
+                ),
+            )
+        start = nextStart
+
+    return table
@@ -0,0 +1,371 @@
+"""
+---
+(c) 2024 David SPORN
+---
+This is part of SPASM -- Sporniket's toolbox for assembly language.
+
+SPASM is free software: you can redistribute it and/or
+modify it under the terms of the GNU General Public License as published by the
+Free Software Foundation, either version 3 of the License, or (at your option)
+any later version.
+
+SPASM is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY
+or FITNESS FOR A PARTICULAR PURPOSE.
+
+See the GNU General Public License for more details.
+You should have received a copy of the GNU General Public License along with SPASM.
+If not, see <https://www.gnu.org/licenses/>. 
+---
+"""
+
+import os
+from heapq import heappush, heappushpop
+from time import perf_counter
+from typing import Iterable, Iterator, List, Tuple
+
+from .consts import MARKERS__COMMENT
+from .processor import SourceProcessor
+
+# phases whose duration is measured
+# * retrieving, discovering and compiling the stylesheets
+PHASE__STYLESHEETS = "stylesheets"
+# * parsing statement lines
+PHASE__PARSE = "parse"
+# * rendering statement lines
+PHASE__RENDER = "render"
+# * processing comment lines, i.e. expanding their tabs
+PHASE__COMMENT_LINES = "comment lines"
+# * processing each file, everything included (reading, processing, comparing and writing)
+PHASE__FILES = "files"
+# * writing to the standard output
+PHASE__OUTPUT = "output"
+PHASES = [
+    PHASE__STYLESHEETS,
+    PHASE__PARSE,
+    PHASE__RENDER,
+    PHASE__COMMENT_LINES,
+    PHASE__FILES,
+    PHASE__OUTPUT,
+]
+
+# kinds of processed lines
+KIND__BLANK = "blank"
+KIND__COMMENT_LINE = "comment"
+KIND__STATEMENT = "statement"
+
+# outcomes of the processed files
+FILES__READ = "read"
+FILES__SKIPPED = "skipped"
+FILES__REWRITTEN = "rewritten"
+FILES__FAILED = "failed"
+
+# count of the slowest files that are reported
+COUNT_OF_SLOWEST_FILES = 5
+
+
+class ProcessingStats:
+    """Timers and counters of a run
+    ---
+    The durations of each phase (see `PHASE__...`) are cumulated, thus when several processes are
+    used, the durations measured by the workers (see `pop` and `merge`) may sum up to more than the
+    total duration of the run.
+
+    Nothing is measured unless the stats are given to the processing, e.g. through
+    `InstrumentedSourceProcessor` or `performOn`, thus a run without stats does not pay for it.
+    """
+
+    def __init__(self):
+        self.durations = dict.fromkeys(PHASES, 0.0)
+        self.lines = dict.fromkeys(
+            [KIND__STATEMENT, KIND__COMMENT_LINE, KIND__BLANK], 0
+        )
+        self.files = dict.fromkeys(
+            [FILES__READ, FILES__SKIPPED, FILES__REWRITTEN, FILES__FAILED], 0
+        )
+        self.bytesIn = 0
+        self.bytesOut = 0
+        # min-heap of (duration, path)
+        self.slowestFiles: List[Tuple[float, str]] = []
+        self._start = perf_counter()
+        self._end = None
+
+    @property
+    def countOfLines(self) -> int:
+        return sum(self.lines.values())
+
+    @property
+    def totalDuration(self) -> float:
+        """The duration of the run, until `stop()` or until now."""
+        return (self._end if self._end is not None else perf_counter()) - self._start
+
+    def stop(self):
+        self._end = perf_counter()
+
+    ##############################################
+    # Recording
+    ##############################################
+
+    def measure(self, phase: str):
+        """A context manager adding the duration of its block to the given phase."""
+        return _Timer(self.durations, phase)
+
+    def recordFile(self, path: str, duration: float):
+        self.durations[PHASE__FILES] += duration
+        self._rememberFile(path, duration)
+
+    def _rememberFile(self, path: str, duration: float):
+        entry = (duration, path)
+        if len(self.slowestFiles) < COUNT_OF_SLOWEST_FILES:
+            heappush(self.slowestFiles, entry)
+        else:
+            heappushpop(self.slowestFiles, entry)
+
+    def countResult(self, result: dict):
+        """Count the given result of a file, see `SourceFileFormatter.perform`."""
+        if result["skipped"]:
+            self.files[FILES__SKIPPED] += 1
+        elif result["error"] is not None:
+            self.files[FILES__FAILED] += 1
+        else:
+            self.files[FILES__READ] += 1
+            if result["rewritten"]:
+                self.files[FILES__REWRITTEN] += 1
+                self.bytesOut += result["fingerprint"]["size"]
+
+    def performOn(self, formatter, source: str, mode: str, lazy: bool = False) -> dict:
+        """Same as `formatter.perform(source, mode, lazy)`, measuring the duration of the file and
+        counting its size.
+
+        A lazy output is measured while being consumed, WITHOUT the time spent by the consumer.
+        """
+        try:
+            # before a rewrite
+            size = os.path.getsize(source)
+        except OSError:
+            size = 0
+        start = perf_counter()
+        result = formatter.perform(source, mode, lazy)
+        duration = perf_counter() - start
+        if result["error"] is None:
+            self.bytesIn += size
+        if lazy and result["output"] is not None:
+            result["output"] = self._measureOutput(result["output"], source, duration)
+        else:
+            self.recordFile(source, duration)
+        return result
+
+    def _measureOutput(
+        self, output: Iterator[str], source: str, duration: float
+    ) -> Iterator[str]:
+        try:
+            while True:
+                start = perf_counter()
+                try:
+                    text = next(output)
+                except StopIteration:
+                    return
+                finally:
+                    duration += perf_counter() - start
+                yield text
+        finally:
+            self.recordFile(source, duration)
+
+    def countInput(self, lines: Iterable[str]) -> Iterator[str]:
+        """Yields the given lines, counting their size in bytes, e.g. for the standard input."""
+        for line in lines:
+            self.bytesIn += len(line.encode("utf-8", "surrogateescape"))
+            yield line
+
+    ##############################################
+    # Combining the stats of several processes
+    ##############################################
+
+    def merge(self, other: "ProcessingStats"):
+        """Add the timers and counters of the given stats, e.g. measured by a worker."""
+        for phase, duration in other.durations.items():
+            self.durations[phase] += duration
+        for kind, count in other.lines.items():
+            self.lines[kind] += count
+        for outcome, count in other.files.items():
+            self.files[outcome] += count
+        self.bytesIn += other.bytesIn
+        self.bytesOut += other.bytesOut
+        for duration, path in other.slowestFiles:
+            self._rememberFile(path, duration)
+
+    def pop(self) -> "ProcessingStats":
+        """The stats collected since the previous call, that are cleared, e.g. to be sent by a
+        worker along with the result of each file."""
+        result = ProcessingStats()
+        result.merge(self)
+        # cleared in place, the timers of the instrumented engines referencing them
+        for counters, zero in [(self.durations, 0.0), (self.lines, 0), (self.files, 0)]:
+            for key in counters:
+                counters[key] = zero
+        self.bytesIn = 0
+        self.bytesOut = 0
+        self.slowestFiles = []
+        return result
+
+    ##############################################
+    # Reporting
+    ##############################################
+
+    def toDict(self) -> dict:
+        totalDuration = self.totalDuration
+        return {
+            "duration": totalDuration,
+            "durations": dict(self.durations),
+            "lines": dict(self.lines, total=self.countOfLines),
+            "linesPerSecond": _rate_of(self.countOfLines, totalDuration),
+            "files": dict(self.files),
+            "bytes": {"in": self.bytesIn, "out": self.bytesOut},
+            "slowestFiles": [
+                {"path": path, "duration": duration}
+                for duration, path in sorted(self.slowestFiles, reverse=True)
+            ],
+        }
+
+    def summary(self) -> str:
+        """The human readable summary of the stats."""
+        totalDuration = self.totalDuration
+        durations = dict(self.durations)
+        if durations[PHASE__FILES] > 0:
+            # only the time that is not already reported by the other phases
+            durations[PHASE__FILES] = max(
+                0.0,
+                durations[PHASE__FILES]
+                - durations[PHASE__PARSE]
+                - durations[PHASE__RENDER]
+                - durations[PHASE__COMMENT_LINES],
+            )
+        result = [
+            f"STATS -- {self.countOfLines} lines in {totalDuration:.3f} s ({_rate_of(self.countOfLines, totalDuration):.0f} lines/s)",
+            f"* lines : {self.lines[KIND__STATEMENT]} statements, {self.lines[KIND__COMMENT_LINE]} comment lines, {self.lines[KIND__BLANK]} blank lines",
+            f"* files : {self.files[FILES__READ]} read, {self.files[FILES__SKIPPED]} skipped, {self.files[FILES__REWRITTEN]} rewritten, {self.files[FILES__FAILED]} failed",
+            f"* bytes : {self.bytesIn} in, {self.bytesOut} out",
+            "* durations :",
+        ]
+        labels = {PHASE__FILES: "files (reading, comparing, writing)"}
+        for phase in PHASES:
+            share = 100 * durations[phase] / totalDuration if totalDuration > 0 else 0
+            result.append(
+                f"  {labels.get(phase, phase):<36} {durations[phase]:9.3f} s {share:6.1f}%"
+            )
+        if len(self.slowestFiles) > 0:
+            result.append("* slowest files :")
+            for duration, path in sorted(self.slowestFiles, reverse=True):
+                result.append(f"  {duration:9.3f} s  {path}")
+        return "\n".join(result)
+
+
+def _rate_of(count: int, duration: float) -> float:
+    return count / duration if duration > 0 else 0.0
+
+
+class _Timer:
+    def __init__(self, durations: dict, phase: str):
+        self._durations = durations
+        self._phase = phase
+
+    def __enter__(self):
+        self._start = perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self._durations[self._phase] += perf_counter() - self._start
+        return False
+
+
+class MeasuredOutput:
+    """Wraps an output writer (see `BufferedOutputWriter`), measuring the time spent writing and
+    counting the written bytes into the given stats."""
+
+    def __init__(self, output, stats: ProcessingStats):
+        self._output = output
+        self._stats = stats
+
+    def write(self, text: str):
+        start = perf_counter()
+        try:
+            self._output.write(text)
+        finally:
+            self._stats.durations[PHASE__OUTPUT] += perf_counter() - start
+        self._stats.bytesOut += len(text.encode("utf-8", "surrogateescape"))
+
+    def writelines(self, texts: Iterable[str]):
+        for text in texts:
+            self.write(text)
+
+    def flush(self):
+        with self._stats.measure(PHASE__OUTPUT):
+            self._output.flush()
+
+
+##############################################
+# Instrumented processing
+##############################################
+
+
+class _TimedParser:
+    def __init__(self, parser, durations: dict):
+        self._parser = parser
+        self._durations = durations
+
+    def parse(self, line: str):
+        start = perf_counter()
+        try:
+            return self._parser.parse(line)
+        finally:
+            self._durations[PHASE__PARSE] += perf_counter() - start
+
+    def __getattr__(self, name: str):
+        return getattr(self._parser, name)
+
+
+class _TimedRenderer:
+    def __init__(self, renderer, durations: dict):
+        self._renderer = renderer
+        self._durations = durations
+
+    def render(self, statementLine, stylesheet) -> str:
+        start = perf_counter()
+        try:
+            return self._renderer.render(statementLine, stylesheet)
+        finally:
+            self._durations[PHASE__RENDER] += perf_counter() - start
+
+    def __getattr__(self, name: str):
+        return getattr(self._renderer, name)
+
+
+class InstrumentedSourceProcessor(SourceProcessor):
+    """`SourceProcessor` counting the processed lines by kind and measuring the parsing, rendering
+    and processing of comment lines into the given stats.
+
+    It is used instead of a `SourceProcessor` only when stats are wanted, thus the plain processor
+    is left untouched."""
+
+    def __init__(self, stats: ProcessingStats, *, parser=None, renderer=None):
+        super().__init__(parser=parser, renderer=renderer)
+        self._stats = stats
+        self._parser = _TimedParser(self._parser, stats.durations)
+        self._renderer = _TimedRenderer(self._renderer, stats.durations)
+
+    def process_comment_line(self, line: str, stylesheet) -> str:
+        start = perf_counter()
+        try:
+            return super().process_comment_line(line, stylesheet)
+        finally:
+            self._stats.durations[PHASE__COMMENT_LINES] += perf_counter() - start
+
+    def process_line(self, line: str, stylesheet) -> str:
+        cleanedLine = line.rstrip()
+        if len(cleanedLine) == 0:
+            self._stats.lines[KIND__BLANK] += 1
+        elif cleanedLine[0] in MARKERS__COMMENT:
+            self._stats.lines[KIND__COMMENT_LINE] += 1
+        else:
+            self._stats.lines[KIND__STATEMENT] += 1
+        return super().process_line(line, stylesheet)
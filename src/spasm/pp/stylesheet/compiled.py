@@ -0,0 +1,99 @@
+"""
+---
+(c) 2024 David SPORN
+---
+This is part of SPASM -- Sporniket's toolbox for assembly language.
+
+SPASM is free software: you can redistribute it and/or
+modify it under the terms of the GNU General Public License as published by the
+Free Software Foundation, either version 3 of the License, or (at your option)
+any later version.
+
+SPASM is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY
+or FITNESS FOR A PARTICULAR PURPOSE.
+
+See the GNU General Public License for more details.
+You should have received a copy of the GNU General Public License along with SPASM.
+If not, see <https://www.gnu.org/licenses/>. 
+---
+"""
+
+import functools
+
+from .frozen import FrozenStylesheet
+
+
+class CompiledStylesheet:
+    """Render plan built once from a validated stylesheet
+    ---
+    The nested values of the stylesheet are resolved, and the values derived from them (widths,
+    padding strings, prefixes...) are computed once, instead of at each rendered line.
+    """
+
+    def __init__(self, stylesheet):
+        self.source = stylesheet
+
+        # tab stops
+        self.tabStopOfLabels = stylesheet["tab_stops"]["labels"]["position"]
+        self.tabStopOfMnemonic = stylesheet["tab_stops"]["mnemonic"]["position"]
+        self.tabStopOfOperands = stylesheet["tab_stops"]["operands"]["position"]
+
+        # labels
+        labels = stylesheet["labels"]
+        self.isLeftAlign = labels["align"] == "left"
+        self.postfix = labels["postfix"]
+        self.postfixOfLeftAlignedLabels = (
+            labels["postfix"] if labels["force_postfix"] else ""
+        )
+        self.marginOfLabels = labels["margin_space"]
+        self.paddingOfLabels = " " * self.tabStopOfLabels
+        self.postPaddingOfLabels = " " * self.marginOfLabels
+        # room for the postfix is always reserved, even for left-aligned labels
+        self.lenOfShortLabel = (
+            self.tabStopOfLabels - len(self.postfix) - self.marginOfLabels
+        )
+        self.ignoreAlignMnemonics = frozenset(labels["ignore_align_mnemonics"] or [])
+
+        # comment lines
+        self.tabWidth = stylesheet["tabulation"]["width"]
+        self.tabAsSpaces = " " * self.tabWidth
+        prefixOfCommentLines = stylesheet["comment_lines"]["prefix"]
+        self.prefixOfCommentLines = f"{prefixOfCommentLines} "
+        self.prefixOfSpecialCommentLines = (
+            f"{prefixOfCommentLines}{prefixOfCommentLines} "
+        )
+
+        # comments
+        self.prefixOfComments = stylesheet["comments"]["prefix"]
+        self.marginOfComments = stylesheet["comments"]["margin_space"]
+
+
+_lastCompiled = (None, None)
+
+# count of plans of frozen stylesheets that are remembered
+SIZE_OF_CACHE_OF_PLANS = 64
+
+
+@functools.lru_cache(maxsize=SIZE_OF_CACHE_OF_PLANS)
+def _compile_frozen_stylesheet(stylesheet: FrozenStylesheet) -> CompiledStylesheet:
+    return CompiledStylesheet(stylesheet)
+
+
+def compile_stylesheet(stylesheet) -> CompiledStylesheet:
+    """Gives the render plan of the given stylesheet, that is either a validated stylesheet (frozen
+    or not) or an already compiled one.
+
+    The plans of frozen stylesheets are remembered by value, thus equal stylesheets share their
+    plan. Otherwise, the plan of the latest given stylesheet is remembered, thus a stylesheet is
+    expected to not change once it has been used."""
+    global _lastCompiled
+    if isinstance(stylesheet, CompiledStylesheet):
+        return stylesheet
+    if isinstance(stylesheet, FrozenStylesheet):
+        return _compile_frozen_stylesheet(stylesheet)
+    source, compiled = _lastCompiled
+    if source is not stylesheet:
+        compiled = CompiledStylesheet(stylesheet)
+        _lastCompiled = (stylesheet, compiled)
+    return compiled
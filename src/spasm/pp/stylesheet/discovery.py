@@ -0,0 +1,116 @@
+"""
+---
+(c) 2024 David SPORN
+---
+This is part of SPASM -- Sporniket's toolbox for assembly language.
+
+SPASM is free software: you can redistribute it and/or
+modify it under the terms of the GNU General Public License as published by the
+Free Software Foundation, either version 3 of the License, or (at your option)
+any later version.
+
+SPASM is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY
+or FITNESS FOR A PARTICULAR PURPOSE.
+
+See the GNU General Public License for more details.
+You should have received a copy of the GNU General Public License along with SPASM.
+If not, see <https://www.gnu.org/licenses/>. 
+---
+"""
+
+import os
+from typing import Callable, List, Tuple
+
+from .frozen import FrozenStylesheet
+
+# name of the stylesheet file applying to the source files of its folder and sub-folders
+NAME_OF_STYLESHEET_FILE = ".spasm_pp.json"
+
+# key of a stylesheet file taking its unspecified values from the stylesheet of the parent folder
+KEY__INHERIT = "inherit"
+
+
+def without_inherit(
+    stylesheet: FrozenStylesheet, base: FrozenStylesheet
+) -> FrozenStylesheet:
+    """The given stylesheet of a file, overriding the given base, without the `inherit` key that
+    only makes sense for a discovered stylesheet file ; thus it is equal to the same stylesheet
+    file without this key."""
+    overrides = stylesheet.overrides()
+    if KEY__INHERIT not in overrides:
+        return stylesheet
+    del overrides[KEY__INHERIT]
+    return FrozenStylesheet(overrides, base)
+
+
+class StylesheetDiscovery:
+    """Effective stylesheet of each source file, from the stylesheet files of its folders
+    ---
+    The stylesheet of a source file is given by the nearest `.spasm_pp.json` file, looking from its
+    folder up to the root folder, or is the default stylesheet when there is none. When the
+    stylesheet file sets `inherit` to true, its unspecified values are taken from the stylesheet
+    of the parent folder instead of the default stylesheet.
+
+    The stylesheet of each folder is remembered, thus the source files of a same folder cost one
+    lookup, and each stylesheet file is loaded once.
+    """
+
+    def __init__(
+        self,
+        loadStylesheet: Callable[[str], FrozenStylesheet],
+        default: FrozenStylesheet,
+    ):
+        """Constructor
+
+        Args:
+            loadStylesheet (Callable): gives the validated stylesheet of the given stylesheet file,
+                including its `inherit` key, or raises a `ValueError`, e.g.
+                `PrettyPrinterCli.loadStylesheetFile`.
+            default (FrozenStylesheet): the stylesheet of the files without stylesheet file.
+        """
+        self._loadStylesheet = loadStylesheet
+        self._default = default
+        self._byFolder = {}
+
+    def stylesheetOf(self, source: str) -> FrozenStylesheet:
+        return self._stylesheetOfFolder(os.path.dirname(os.path.abspath(source)))
+
+    def group(
+        self, sources: List[str], *, consecutive: bool = False
+    ) -> List[Tuple[FrozenStylesheet, List[str]]]:
+        """The given source files by effective stylesheet, in the order of first appearance ; equal
+        stylesheets make a single group. With `consecutive`, only consecutive source files are
+        grouped, thus the order of the source files is kept."""
+        if consecutive:
+            result = []
+            for source in sources:
+                stylesheet = self.stylesheetOf(source)
+                if len(result) > 0 and result[-1][0] == stylesheet:
+                    result[-1][1].append(source)
+                else:
+                    result.append((stylesheet, [source]))
+            return result
+        groups = {}
+        for source in sources:
+            groups.setdefault(self.stylesheetOf(source), []).append(source)
+        return list(groups.items())
+
+    def _stylesheetOfFolder(self, folder: str) -> FrozenStylesheet:
+        result = self._byFolder.get(folder)
+        if result is None:
+            parent = os.path.dirname(folder)
+            pathOfStylesheet = os.path.join(folder, NAME_OF_STYLESHEET_FILE)
+            if os.path.isfile(pathOfStylesheet):
+                overrides = self._loadStylesheet(pathOfStylesheet).overrides()
+                inherit = overrides.pop(KEY__INHERIT, False) and parent != folder
+                result = FrozenStylesheet(
+                    overrides,
+                    self._stylesheetOfFolder(parent) if inherit else self._default,
+                )
+            elif parent != folder:
+                result = self._stylesheetOfFolder(parent)
+            else:
+                result = self._default
+            self._byFolder[folder] = result
+        return result
@@ -0,0 +1,164 @@
+"""
+---
+(c) 2024 David SPORN
+---
+This is part of SPASM -- Sporniket's toolbox for assembly language.
+
+SPASM is free software: you can redistribute it and/or
+modify it under the terms of the GNU General Public License as published by the
+Free Software Foundation, either version 3 of the License, or (at your option)
+any later version.
+
+SPASM is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY
+or FITNESS FOR A PARTICULAR PURPOSE.
+
+See the GNU General Public License for more details.
+You should have received a copy of the GNU General Public License along with SPASM.
+If not, see <https://www.gnu.org/licenses/>. 
+---
+"""
+
+from collections.abc import Mapping
+
+
+class FrozenStylesheet(Mapping):
+    """Immutable stylesheet, as an overlay of another frozen stylesheet
+    ---
+    Only the overriding values are kept, the other values are read from the base stylesheet ;
+    nested structures are themselves overlays of the matching structures of the base. Thus a
+    stylesheet loaded from a file costs only the size of its values, the builtin stylesheets
+    being shared.
+
+    The values are accessible either as items (`stylesheet["labels"]["align"]`), like a
+    validated stylesheet, or as attributes (`stylesheet.labels.align`). Lists are frozen into
+    tuples, and a frozen stylesheet is hashable, e.g. to be the key of a cache of render plans.
+    """
+
+    __slots__ = ("_values", "_base", "_hash")
+
+    def __init__(self, values: dict, base: "FrozenStylesheet" = None):
+        frozenValues = {}
+        for key, value in values.items():
+            if isinstance(value, dict):
+                baseOfValue = None if base is None else base.get(key)
+                if not isinstance(baseOfValue, FrozenStylesheet):
+                    baseOfValue = None
+                if baseOfValue is not None and len(value) == 0:
+                    continue  # nothing to override
+                value = FrozenStylesheet(value, baseOfValue)
+            elif isinstance(value, list):
+                value = tuple(value)
+            frozenValues[key] = value
+        object.__setattr__(self, "_values", frozenValues)
+        object.__setattr__(self, "_base", base)
+        object.__setattr__(self, "_hash", None)
+
+    def __getitem__(self, key):
+        try:
+            return self._values[key]
+        except KeyError:
+            if self._base is None:
+                raise
+            return self._base[key]
+
+    def __contains__(self, key) -> bool:
+        return key in self._values or (self._base is not None and key in self._base)
+
+    def __iter__(self):
+        if self._base is not None:
+            yield from self._base
+            yield from (key for key in self._values if key not in self._base)
+        else:
+            yield from self._values
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __getattr__(self, name: str):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        try:
+            return self[name]
+        except KeyError:
+            raise AttributeError(name) from None
+
+    def __setattr__(self, name: str, value):
+        raise AttributeError(f"cannot set '{name}', a frozen stylesheet is immutable")
+
+    def __delattr__(self, name: str):
+        raise AttributeError(
+            f"cannot delete '{name}', a frozen stylesheet is immutable"
+        )
+
+    def __hash__(self) -> int:
+        if self._hash is None:
+            object.__setattr__(self, "_hash", hash(frozenset(self.items())))
+        return self._hash
+
+    def __eq__(self, other) -> bool:
+        if self is other:
+            return True
+        if isinstance(other, FrozenStylesheet):
+            return hash(self) == hash(other) and dict(self.items()) == dict(
+                other.items()
+            )
+        if isinstance(other, Mapping):
+            # e.g. a validated stylesheet, whose lists are not frozen
+            return self.toDict() == dict(other.items())
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"FrozenStylesheet({self.toDict()!r})"
+
+    def __reduce__(self):
+        return (FrozenStylesheet, (self._values, self._base))
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def toDict(self) -> dict:
+        """The equivalent validated stylesheet, as nested dictionaries and lists."""
+        return {key: _thawed(value) for key, value in self.items()}
+
+    def overrides(self) -> dict:
+        """The overriding values, as nested dictionaries and lists ; the stylesheet is equal to
+        `FrozenStylesheet(stylesheet.overrides(), base)`."""
+        return {
+            key: (
+                value.overrides()
+                if isinstance(value, FrozenStylesheet)
+                else _thawed(value)
+            )
+            for key, value in self._values.items()
+        }
+
+
+def _thawed(value):
+    if isinstance(value, FrozenStylesheet):
+        return value.toDict()
+    if isinstance(value, tuple):
+        return list(value)
+    return value
+
+
+_frozenStylesheets = {}
+
+
+def freeze(stylesheet) -> FrozenStylesheet:
+    """Gives the frozen version of the given validated stylesheet, or the given stylesheet when it
+    is already frozen.
+
+    The frozen version of a stylesheet is remembered (e.g. for the builtin stylesheets, that are
+    shared by the stylesheets loaded from files), thus a stylesheet is expected to not change once
+    it has been frozen."""
+    if isinstance(stylesheet, FrozenStylesheet):
+        return stylesheet
+    known = _frozenStylesheets.get(id(stylesheet))
+    if known is None or known[0] is not stylesheet:
+        known = (stylesheet, FrozenStylesheet(stylesheet))
+        _frozenStylesheets[id(stylesheet)] = known
+    return known[1]
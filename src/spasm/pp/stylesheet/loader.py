@@ -19,12 +19,12 @@ If not, see <https://www.gnu.org/licenses/>. 
 ---
 """
 
-import copy
 import json
 import os
 
 from .builtin import HERITAGE
-from .validation import SCHEMA_OF_STYLESHEET, ValidationAndCopyEngine
+from .frozen import FrozenStylesheet, freeze
+from .validation import VALIDATOR_OF_STYLESHEET
 
 
 class StylesheetLoader:
@@ -35,16 +35,17 @@ class StylesheetLoader:
         self._reference = reference
 
     def perform(self):
-        result = copy.deepcopy(self._reference)
-
         with open(self._sourceFile) as sourceJson:
-            source = json.load(sourceJson)
+            return self.performOn(sourceJson.read())
+
+    def performOn(self, content: str):
+        """Validates the given content of the stylesheet file, e.g. when it has already been read."""
+        overrides = {}
+        source = json.loads(content)
 
-        # copy existing supported values from source to result
+        # copy existing supported values from source to the overrides of the reference
         # TODO
-        events = ValidationAndCopyEngine().perform(
-            SCHEMA_OF_STYLESHEET, "<ROOT>", source, result, source
-        )
+        events = VALIDATOR_OF_STYLESHEET.perform(source, overrides, source)
         errors = list(
             map(
                 lambda e: f"* {e.path[len('<ROOT>.'):]} {e.message}",
@@ -58,4 +59,4 @@ class StylesheetLoader:
                 f"ERROR -- Wrong values in stylesheet '{self._sourceFile}' : \n{listOfErrors}"
             )
 
-        return result
+        return FrozenStylesheet(overrides, freeze(self._reference))
@@ -21,7 +21,7 @@ If not, see <https://www.gnu.org/licenses/>. 
 """
 
 import types
-from typing import List
+from typing import Iterator, List
 
 from .._utils import _is_empty_string
 
@@ -292,6 +292,11 @@ or when it is empty, supplemental spaces are added up to this position.""",
                 ),
             },
         ),
+        "inherit": Field(
+            doc="""for a discovered stylesheet file (`.spasm_pp.json`), when set to true, the
+unspecified values are inherited from the stylesheet of the parent folder.""",
+            typeOfValue=bool,
+        ),
     },
 )
 
@@ -315,100 +320,208 @@ class ValidationEvent:
 
 
 class ValidationAndCopyEngine:
+    """Validates and copies a source object against a schema, see `CompiledValidator`.
+
+    The latest given schema is compiled once and remembered."""
+
     def __init__(self):
         pass
 
     def perform(
         self, schema, currentPath, objectFrom, recipient, context=None
     ) -> List[ValidationEvent]:
-        result = []
-        typeOfSchema = type(schema).__name__
-        if typeOfSchema == "Structure":
-            for sub in schema.body:
-                if sub in objectFrom:
-                    # There is something to copy
-                    nextPath = f"{currentPath}.{sub}"
-                    subSchema = schema.body[sub]
-                    typeOfSubSchema = type(subSchema).__name__
-                    if typeOfSubSchema == "Structure":
-                        # dive one level
-                        if sub not in recipient:
-                            recipient[sub] = {}
-                        result += [
-                            ValidationEvent("ENTER", nextPath, f"Going inside {sub}")
-                        ]
-                        result += self.perform(
-                            subSchema,
-                            nextPath,
-                            objectFrom[sub],
-                            recipient[sub],
-                            context,
-                        )
-                    elif typeOfSubSchema == "Field":
-                        # copy value if valid
-                        # TODO validation
-                        # ---
-                        # type validation :
-                        gotType = type(objectFrom[sub]).__name__
-                        expectedType = subSchema.typeOfValue.__name__
-                        if gotType != expectedType:
-                            result += [
-                                ValidationEvent(
-                                    "ERROR",
-                                    nextPath,
-                                    f"MUST be a {expectedType}",
-                                )
-                            ]
-
-                        # ---
-                        # value validation
-                        if subSchema.validator is not None:
-                            if not subSchema.validator.validate(
-                                objectFrom[sub], context
-                            ):
-                                result += [
-                                    ValidationEvent(
-                                        "ERROR", nextPath, subSchema.validator.message
-                                    )
-                                ]
-                                continue
-                        recipient[sub] = objectFrom[sub]
-                    elif typeOfSubSchema == "Array":
-                        # copy array of value
-                        # ---
-                        # type validation
-                        gotType = type(objectFrom[sub]).__name__
-                        if gotType != "list":
-                            result += [
-                                ValidationEvent(
-                                    "ERROR", nextPath, "MUST be an array of strings"
-                                )
-                            ]
-                            continue
-
-                        # ---
-                        # item type validation
-                        expectedType = subSchema.typeOfItem.__name__
-                        for v in objectFrom[sub]:
-                            if type(v).__name__ != expectedType:
-                                result += [
-                                    ValidationEvent(
-                                        "ERROR",
-                                        nextPath,
-                                        f"MUST have {expectedType} items",
-                                    )
-                                ]
-                                break
-
-                        # ---
-                        # actual copy
-                        recipient[sub] = [v for v in objectFrom[sub]]
+        return list(
+            compile_schema(schema, currentPath).perform(objectFrom, recipient, context)
+        )
+
+
+# *****************************************************************************
+# COMPILED VALIDATION ENGINE
+# -----------------------------------------------------------------------------
+# The schema is walked once to build a tree of closures, one per structure and
+# member of structure ; the events are created at this time and shared between
+# validations, and the paths of queries are split once.
+# Structures are generators, so that the events are yielded lazily, whereas
+# fields and arrays directly give their (usually empty) sequence of events.
+# *****************************************************************************
+
+
+def _getter_of(path: str):
+    """Pre-resolved version of `_get_value_from(path, source)`"""
+    keys = tuple(path.split("."))
+
+    def get(source):
+        for key in keys:
+            source = source[key]
+        return source
+
+    return get
+
+
+def _predicate_of(validator: Validator):
+    """Gives a function `(value, context) -> bool` with the same result as `validator.validate`"""
+    typeOfValidator = type(validator)
+    if typeOfValidator is GreaterThan or typeOfValidator is GreaterThanOrEqual:
+        strict = typeOfValidator is GreaterThan
+        if validator._value is None:
+            getThreshold = _getter_of(validator._query)
+            if strict:
+                return lambda value, context: (
+                    context is not None and value > getThreshold(context)
+                )
+            return lambda value, context: (
+                context is not None and value >= getThreshold(context)
+            )
+        threshold = validator._value
+        if strict:
+            return lambda value, context: value > threshold
+        return lambda value, context: value >= threshold
+    if typeOfValidator is OneOf:
+        allowed = validator._allowed
+        return lambda value, context: value in allowed
+    return validator.validate
+
+
+def _compile_field(name: str, path: str, schema: Field):
+    typeOfValue = schema.typeOfValue
+    errorOfType = ValidationEvent("ERROR", path, f"MUST be a {typeOfValue.__name__}")
+    isValid = None if schema.validator is None else _predicate_of(schema.validator)
+    errorOfValue = (
+        None
+        if schema.validator is None
+        else ValidationEvent("ERROR", path, schema.validator.message)
+    )
+
+    def validate(objectFrom, recipient, context):
+        value = objectFrom[name]
+        events = ()
+        if type(value) is not typeOfValue:
+            events = [errorOfType]
+        if isValid is not None and not isValid(value, context):
+            return [*events, errorOfValue]
+        recipient[name] = value
+        return events
+
+    return validate
+
+
+def _compile_array(name: str, path: str, schema: Array):
+    typeOfItem = schema.typeOfItem
+    errorsOfList = [ValidationEvent("ERROR", path, "MUST be an array of strings")]
+    errorsOfItems = [
+        ValidationEvent("ERROR", path, f"MUST have {typeOfItem.__name__} items")
+    ]
+
+    def validate(objectFrom, recipient, context):
+        values = objectFrom[name]
+        if type(values) is not list:
+            return errorsOfList
+        events = ()
+        for v in values:
+            if type(v) is not typeOfItem:
+                events = errorsOfItems
+                break
+        recipient[name] = [v for v in values]
+        return events
+
+    return validate
+
+
+def _compile_member_structure(name: str, path: str, schema: Structure):
+    validateBody = _compile_body(path, schema)
+    enter = ValidationEvent("ENTER", path, f"Going inside {name}")
+
+    def validate(objectFrom, recipient, context):
+        if name not in recipient:
+            recipient[name] = {}
+        yield enter
+        yield from validateBody(objectFrom[name], recipient[name], context)
+
+    return validate
+
+
+_COMPILERS_OF_MEMBERS = {
+    Structure: _compile_member_structure,
+    Field: _compile_field,
+    Array: _compile_array,
+}
+
+
+def _compile_body(path: str, schema: Structure):
+    members = []
+    for name, subSchema in schema.body.items():
+        compiler = _COMPILERS_OF_MEMBERS.get(type(subSchema))
+        if compiler is not None:
+            # members with an unsupported schema are ignored
+            members.append((name, compiler(name, f"{path}.{name}", subSchema)))
+
+    def validate(objectFrom, recipient, context):
+        for name, validateMember in members:
+            if name in objectFrom:
+                yield from validateMember(objectFrom, recipient, context)
+
+    return validate
+
+
+class CompiledValidator:
+    """Validation and copy engine compiled from a schema
+    ---
+    `perform(objectFrom, recipient, context)` explores the given source object (restricted to
+    the fields listed in the schema) and yields the events lazily, copying the valid values into
+    the recipient meanwhile ; thus the events MUST be consumed for the copy to be done. The events
+    are shared between validations, and MUST NOT be modified. With `failFast`, the exploration
+    stops after the first error event."""
+
+    def __init__(self, schema, rootPath: str = "<ROOT>"):
+        self.schema = schema
+        self.rootPath = rootPath
+        if type(schema) is Structure:
+            self._validate = _compile_body(rootPath, schema)
         else:
-            result += [
+            errors = [
                 ValidationEvent(
                     "ERROR",
-                    currentPath,
-                    f"CANNOT work on given schema of type {typeOfSchema}",
+                    rootPath,
+                    f"CANNOT work on given schema of type {type(schema).__name__}",
                 )
             ]
-        return result
+
+            def validate(objectFrom, recipient, context):
+                return iter(errors)
+
+            self._validate = validate
+
+    def perform(
+        self, objectFrom, recipient, context=None, *, failFast: bool = False
+    ) -> Iterator[ValidationEvent]:
+        events = self._validate(objectFrom, recipient, context)
+        if not failFast:
+            return events
+        return self._untilFirstError(events)
+
+    def _untilFirstError(self, events):
+        for event in events:
+            yield event
+            if event.type == "ERROR":
+                return
+
+
+_lastCompiled = None
+
+
+def compile_schema(schema, rootPath: str = "<ROOT>") -> CompiledValidator:
+    """Gives the compiled validator of the given schema.
+
+    The validator of the latest given schema is remembered, thus a schema is expected to not
+    change once it has been used."""
+    global _lastCompiled
+    if (
+        _lastCompiled is None
+        or _lastCompiled.schema is not schema
+        or _lastCompiled.rootPath != rootPath
+    ):
+        _lastCompiled = CompiledValidator(schema, rootPath)
+    return _lastCompiled
+
+
+VALIDATOR_OF_STYLESHEET = CompiledValidator(SCHEMA_OF_STYLESHEET)
@@ -0,0 +1,172 @@
+"""
+---
+(c) 2024 David SPORN
+---
+This is part of SPASM -- Sporniket's toolbox for assembly language.
+
+SPASM is free software: you can redistribute it and/or
+modify it under the terms of the GNU General Public License as published by the
+Free Software Foundation, either version 3 of the License, or (at your option)
+any later version.
+
+SPASM is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY
+or FITNESS FOR A PARTICULAR PURPOSE.
+
+See the GNU General Public License for more details.
+You should have received a copy of the GNU General Public License along with SPASM.
+If not, see <https://www.gnu.org/licenses/>. 
+---
+"""
+
+import os
+import threading
+from typing import Callable, List
+
+from .batch import MODE__FORMAT, MODE__REWRITE, SourceFileFormatter, _result_of
+from .cache import digest_of_text
+from .stylesheet.discovery import StylesheetDiscovery
+
+# extension of the source files found inside a watched directory
+EXTENSION_OF_SOURCES = ".s"
+
+
+class _StateOfFile:
+    __slots__ = ["signature", "digest", "pending"]
+
+    def __init__(self):
+        self.signature = None  # (size, mtime) when last processed
+        self.digest = None  # digest of the formatted content
+        self.pending = None  # (size, mtime) of a change waiting to settle
+
+
+class DiscoveringFormatter:
+    """Formats each source file with its effective stylesheet (see `StylesheetDiscovery`), using
+    one formatter by stylesheet ; same `perform` as `SourceFileFormatter`.
+
+    The stylesheet files are discovered and loaded once, an invalid stylesheet file being reported
+    as an error of the source files that follow it."""
+
+    def __init__(
+        self,
+        discovery: StylesheetDiscovery,
+        createFormatter: Callable[[object], SourceFileFormatter],
+    ):
+        """Constructor
+
+        Args:
+            discovery (StylesheetDiscovery): gives the stylesheet of each source file
+            createFormatter (Callable): gives the formatter of the given stylesheet
+        """
+        self._discovery = discovery
+        self._createFormatter = createFormatter
+        self._formatters = {}
+
+    def perform(self, source: str, mode: str = MODE__FORMAT, lazy: bool = False):
+        try:
+            stylesheet = self._discovery.stylesheetOf(source)
+        except ValueError as e:
+            return _result_of(source, error=str(e))
+        formatter = self._formatters.get(stylesheet)
+        if formatter is None:
+            formatter = self._formatters[stylesheet] = self._createFormatter(stylesheet)
+        return formatter.perform(source, mode, lazy)
+
+
+class SourceWatcher:
+    """Rewrites the watched source files when they are modified
+    ---
+    The files are polled : the size and mtime of each file are compared to the ones of the latest
+    processing, and a changed file is processed only when it did not change again since the
+    previous poll, thus a burst of saves is processed once. The content is compared by digest
+    before being processed, thus a file that is touched, or rewritten by this watcher, is not
+    parsed again.
+
+    The watched paths are either source files, or directories whose source files (see
+    `EXTENSION_OF_SOURCES`) are found recursively, at each poll.
+    """
+
+    def __init__(
+        self, paths: List[str], formatter: SourceFileFormatter, report: Callable
+    ):
+        """Constructor
+
+        Args:
+            paths (List[str]): the watched files and directories
+            formatter (SourceFileFormatter): the formatter rewriting the files, e.g. a
+                `DiscoveringFormatter`
+            report (Callable): called with the result of each processed file (see
+                `SourceFileFormatter.perform`)
+        """
+        self._paths = paths
+        self._formatter = formatter
+        self._report = report
+        self._states = {}
+        self._isFirstPoll = True
+
+    def findSources(self) -> List[str]:
+        result = []
+        for path in self._paths:
+            if os.path.isdir(path):
+                for directory, subdirectories, files in os.walk(path):
+                    subdirectories.sort()
+                    result += [
+                        os.path.join(directory, f)
+                        for f in sorted(files)
+                        if f.endswith(EXTENSION_OF_SOURCES)
+                    ]
+            else:
+                result.append(path)
+        return result
+
+    def poll(self):
+        """Process the files that changed since the previous poll, all the files at the first poll."""
+        states = {}
+        for source in self.findSources():
+            state = self._states.get(source) or _StateOfFile()
+            states[source] = state
+            try:
+                stat = os.stat(source)
+            except OSError:
+                continue  # removed meanwhile
+            signature = (stat.st_size, stat.st_mtime_ns)
+            if signature == state.signature:
+                state.pending = None
+                continue
+            if signature != state.pending and not self._isFirstPoll:
+                # wait for the change to settle
+                state.pending = signature
+                continue
+            state.pending = None
+            self._process(source, state, signature)
+        self._states = states
+        self._isFirstPoll = False
+
+    def _process(self, source: str, state: _StateOfFile, signature: tuple):
+        if state.digest is not None:
+            try:
+                with open(source, "rt") as f:
+                    isSameContent = digest_of_text(f.read()) == state.digest
+            except (OSError, UnicodeError):
+                isSameContent = False  # reported by the formatter
+            if isSameContent:
+                state.signature = signature
+                return
+        result = self._formatter.perform(source, MODE__REWRITE)
+        fingerprint = result["fingerprint"]
+        if fingerprint is not None:
+            state.signature = (fingerprint["size"], fingerprint["mtime"])
+            state.digest = fingerprint["digest"]
+        else:
+            # do not retry until the next change
+            state.signature = signature
+            state.digest = None
+        self._report(result)
+
+    def watch(self, interval: float, stop: threading.Event = None):
+        """Poll every `interval` seconds, until the given event is set, or until interrupted."""
+        stop = stop or threading.Event()
+        while True:
+            self.poll()
+            if stop.wait(interval):
+                return
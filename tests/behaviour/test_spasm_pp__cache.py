@@ -0,0 +1,105 @@
+"""
+Test suite using the cache of formatted files in rewrite mode.
+---
+(c) 2024 David SPORN
+---
+This is part of SPASM -- Sporniket's toolbox for assembly language.
+
+SPASM is free software: you can redistribute it and/or
+modify it under the terms of the GNU General Public License as published by the
+Free Software Foundation, either version 3 of the License, or (at your option)
+any later version.
+
+SPASM is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY
+or FITNESS FOR A PARTICULAR PURPOSE.
+
+See the GNU General Public License for more details.
+You should have received a copy of the GNU General Public License along with SPASM.
+If not, see <https://www.gnu.org/licenses/>. 
+---
+"""
+
+import os
+
+from unittest.mock import patch
+
+from spasm.pp.batch import SourceFileFormatter
+from spasm.pp.cache import default_path_of_cache, default_path_of_stylesheets_cache
+from spasm.pp.stylesheet.loader import StylesheetLoader
+
+from .utils import (
+    run_cli,
+    initializeTmpWorkspace,
+    assert_that_source_is_converted_as_expected,
+)
+
+SOURCE_DATA_FILES = os.path.join(".", "tests", "data")
+ONE_HOUR_AGO = 3600_000_000_000
+
+
+def given_workspace():
+    tmp_dir = initializeTmpWorkspace(
+        [
+            os.path.join(SOURCE_DATA_FILES, f)
+            for f in ["source1.s", "source2-formatted.s", "source1-formatted.s"]
+        ]
+    )
+    targetFiles = [
+        os.path.join(tmp_dir, f) for f in ["source1.s", "source2-formatted.s"]
+    ]
+    # old enough to be trusted by the cache
+    for f in targetFiles:
+        mtime = os.stat(f).st_mtime_ns - ONE_HOUR_AGO
+        os.utime(f, ns=(mtime, mtime))
+    return tmp_dir, targetFiles
+
+
+def test_that_it_skips_the_files_known_to_be_formatted():
+    tmp_dir, targetFiles = given_workspace()
+    assert run_cli(["prog", "--rewrite", "--jobs", "1"] + targetFiles) == (0, "", "")
+    assert os.path.isfile(default_path_of_cache())
+    assert_that_source_is_converted_as_expected(
+        targetFiles[0], os.path.join(tmp_dir, "source1-formatted.s")
+    )
+
+    # the rewritten file is verified by digest, the other one is trusted
+    with patch.object(SourceFileFormatter, "_rewrite", side_effect=AssertionError):
+        assert run_cli(["prog", "--rewrite", "--jobs", "1"] + targetFiles) == (
+            0,
+            "",
+            "",
+        )
+
+
+def test_that_it_does_not_use_the_cache_when_asked_to():
+    tmp_dir, targetFiles = given_workspace()
+    assert run_cli(
+        ["prog", "--rewrite", "--no-cache", "--jobs", "1"] + targetFiles
+    ) == (0, "", "")
+    assert not os.path.exists(default_path_of_cache())
+    assert_that_source_is_converted_as_expected(
+        targetFiles[0], os.path.join(tmp_dir, "source1-formatted.s")
+    )
+
+
+def test_that_it_does_not_validate_a_known_stylesheet_file_again():
+    tmp_dir, targetFiles = given_workspace()
+    ARGS = ["prog", "--stylesheet", "file:tests/data/margin-label.json", "--jobs", "1"]
+    _, expected, _ = run_cli(ARGS + targetFiles)
+    assert len(os.listdir(default_path_of_stylesheets_cache())) == 1
+
+    with patch.object(StylesheetLoader, "performOn", side_effect=AssertionError):
+        assert run_cli(ARGS + targetFiles) == (0, expected, "")
+
+
+def test_that_it_does_not_use_the_cache_of_stylesheets_when_asked_to():
+    tmp_dir, targetFiles = given_workspace()
+    assert (
+        run_cli(
+            ["prog", "--stylesheet", "file:tests/data/margin-label.json", "--no-cache"]
+            + targetFiles
+        )[0]
+        == 0
+    )
+    assert not os.path.exists(default_path_of_stylesheets_cache())
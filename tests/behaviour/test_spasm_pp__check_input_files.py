@@ -0,0 +1,102 @@
+"""
+Test suite using check mode.
+---
+(c) 2024 David SPORN
+---
+This is part of SPASM -- Sporniket's toolbox for assembly language.
+
+SPASM is free software: you can redistribute it and/or
+modify it under the terms of the GNU General Public License as published by the
+Free Software Foundation, either version 3 of the License, or (at your option)
+any later version.
+
+SPASM is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY
+or FITNESS FOR A PARTICULAR PURPOSE.
+
+See the GNU General Public License for more details.
+You should have received a copy of the GNU General Public License along with SPASM.
+If not, see <https://www.gnu.org/licenses/>. 
+---
+"""
+
+import filecmp
+import json
+import os
+
+from .utils import run_cli, initializeTmpWorkspace
+
+SOURCE_DATA_FILES = os.path.join(".", "tests", "data")
+
+
+def given_workspace():
+    fileNames = ["source1.s", "source2-formatted.s", "source2.s"]
+    tmp_dir = initializeTmpWorkspace(
+        [os.path.join(SOURCE_DATA_FILES, f) for f in fileNames]
+    )
+    return tmp_dir, [os.path.join(tmp_dir, f) for f in fileNames]
+
+
+def test_that_it_reports_files_that_are_not_formatted_without_modifying_them():
+    tmp_dir, targetFiles = given_workspace()
+    report = os.path.join(tmp_dir, "report.json")
+
+    for jobs in ["1", "2"]:
+        returnCode, out, err = run_cli(
+            ["prog", "--check", "--jobs", jobs, "--report", report] + targetFiles
+        )
+        assert returnCode != 0
+        assert out == ""
+        assert err == f"""ERROR -- some files are not pretty-printed :
+* {targetFiles[0]} : line 1
+* {targetFiles[2]} : line 1
+"""
+        with open(report, "rt") as f:
+            assert json.load(f) == {
+                "checked": 3,
+                "unformatted": [
+                    {"path": targetFiles[0], "line": 1},
+                    {"path": targetFiles[2], "line": 1},
+                ],
+            }
+        for f in targetFiles:
+            assert filecmp.cmp(
+                f, os.path.join(SOURCE_DATA_FILES, os.path.basename(f)), shallow=False
+            )
+
+
+def test_that_it_reports_the_first_line_that_differs_and_succeeds_on_formatted_files():
+    tmp_dir, targetFiles = given_workspace()
+    source = targetFiles[1]
+    with open(source, "at") as f:
+        f.write("label move.l d0,d1\n")
+
+    returnCode, out, err = run_cli(["prog", "--check", "--jobs", "1", source])
+    assert returnCode != 0
+    with open(source, "rt") as f:
+        countOfLines = len(f.readlines())
+    assert err == (
+        f"ERROR -- some files are not pretty-printed :\n* {source} : line {countOfLines}\n"
+    )
+
+    formatted = os.path.join(SOURCE_DATA_FILES, "source1-formatted.s")
+    assert run_cli(["prog", "--check", formatted]) == (0, "", "")
+
+
+def test_that_it_cannot_check_without_given_input_files_list():
+    assert run_cli(["prog", "--check"]) == (
+        1,
+        "",
+        "ERROR -- check mode requires a list of files\n",
+    )
+
+
+def test_that_it_cannot_report_outside_of_check_mode():
+    assert run_cli(
+        [
+            "prog",
+            "--report",
+            "report.json",
+            os.path.join(SOURCE_DATA_FILES, "source1.s"),
+        ]
+    ) == (1, "", "ERROR -- parameter 'report' requires check mode\n")
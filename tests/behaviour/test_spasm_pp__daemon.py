@@ -0,0 +1,149 @@
+"""
+Test suite using the daemon and client modes.
+---
+(c) 2024 David SPORN
+---
+This is part of SPASM -- Sporniket's toolbox for assembly language.
+
+SPASM is free software: you can redistribute it and/or
+modify it under the terms of the GNU General Public License as published by the
+Free Software Foundation, either version 3 of the License, or (at your option)
+any later version.
+
+SPASM is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY
+or FITNESS FOR A PARTICULAR PURPOSE.
+
+See the GNU General Public License for more details.
+You should have received a copy of the GNU General Public License along with SPASM.
+If not, see <https://www.gnu.org/licenses/>. 
+---
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import threading
+
+from unittest.mock import patch
+
+from spasm.pp import PrettyPrinterCli
+from spasm.pp.daemon import FormatterDaemon
+
+from .utils import run_cli, mockStdInput
+
+SOURCE_DATA_FILES = os.path.join(".", "tests", "data")
+
+
+def with_daemon(test):
+    # a short path, as the path of a Unix domain socket is limited
+    tmp_dir = tempfile.mkdtemp(prefix="pp")
+    cli = PrettyPrinterCli()
+    daemon = FormatterDaemon(
+        os.path.join(tmp_dir, "pp.sock"), cli.retrieveStyleSheet, cli.retrieveLineRange
+    )
+    thread = threading.Thread(target=daemon.serve_forever)
+    thread.start()
+    try:
+        assert daemon.ready.wait(10)
+        test(daemon.socketPath)
+    finally:
+        daemon.shutdown()
+        thread.join()
+        shutil.rmtree(tmp_dir)
+
+
+def test_that_the_client_outputs_the_same_result_as_the_standard_input_mode():
+    with open(os.path.join(SOURCE_DATA_FILES, "source2.s"), "rt") as f:
+        lines = f.read().splitlines()
+    with patch.object(sys, "stdin", mockStdInput(lines)):
+        expected = run_cli(["prog", "--stylesheet", "builtin:sporniket"])
+
+    def test(socketPath):
+        for _ in range(3):
+            with patch.object(sys, "stdin", mockStdInput(lines)):
+                assert (
+                    run_cli(
+                        [
+                            "prog",
+                            "--connect",
+                            socketPath,
+                            "--stylesheet",
+                            "builtin:sporniket",
+                        ]
+                    )
+                    == expected
+                )
+
+    with_daemon(test)
+
+
+def test_that_the_client_reports_the_errors_of_the_daemon():
+    def test(socketPath):
+        with patch.object(sys, "stdin", mockStdInput([" rts"])):
+            assert run_cli(
+                ["prog", "--connect", socketPath, "--stylesheet", "file:missing.json"]
+            ) == (
+                1,
+                "",
+                f"File not found or not a regular file : {os.path.abspath('missing.json')}\n",
+            )
+
+    with_daemon(test)
+
+
+def test_that_the_client_reports_a_missing_daemon():
+    tmp_dir = tempfile.mkdtemp(prefix="pp")
+    socketPath = os.path.join(tmp_dir, "none.sock")
+    try:
+        with patch.object(sys, "stdin", mockStdInput([" rts"])):
+            returnCode, out, err = run_cli(["prog", "--connect", socketPath])
+        assert (returnCode, out) == (1, "")
+        assert err.startswith(
+            f"ERROR -- cannot get a response from the daemon on '{socketPath}' : "
+        )
+    finally:
+        shutil.rmtree(tmp_dir)
+
+
+def test_that_the_daemon_does_not_replace_a_file_that_is_not_a_socket():
+    tmp_dir = tempfile.mkdtemp(prefix="pp")
+    path = os.path.join(tmp_dir, "precious.s")
+    with open(path, "wt") as f:
+        f.write(" rts\n")
+    try:
+        assert run_cli(["prog", "--daemon", path]) == (
+            1,
+            "",
+            f"ERROR -- '{path}' exists and is not a socket\n",
+        )
+        with open(path, "rt") as f:
+            assert f.read() == " rts\n"
+    finally:
+        shutil.rmtree(tmp_dir)
+
+
+def test_that_the_daemon_reports_a_socket_that_cannot_be_created():
+    tmp_dir = tempfile.mkdtemp(prefix="pp")
+    socketPath = os.path.join(tmp_dir, "missing", "pp.sock")
+    try:
+        returnCode, out, err = run_cli(["prog", "--daemon", socketPath])
+        assert (returnCode, out) == (1, "")
+        assert err.startswith(f"ERROR -- cannot listen on '{socketPath}' : ")
+    finally:
+        shutil.rmtree(tmp_dir)
+
+
+def test_that_the_client_splits_lines_like_the_standard_input_mode():
+    # line separators for `str.splitlines`, but not for the standard input
+    lines = ["lab\x0c move.l d0,d1 ; c\x1c", " rts  ; x\x85"]
+    with patch.object(sys, "stdin", mockStdInput(lines)):
+        expected = run_cli(["prog"])
+    assert expected[1].count("\n") == 2
+
+    def test(socketPath):
+        with patch.object(sys, "stdin", mockStdInput(lines)):
+            assert run_cli(["prog", "--connect", socketPath]) == expected
+
+    with_daemon(test)
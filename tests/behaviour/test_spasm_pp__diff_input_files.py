@@ -0,0 +1,113 @@
+"""
+Test suite using diff mode.
+---
+(c) 2024 David SPORN
+---
+This is part of SPASM -- Sporniket's toolbox for assembly language.
+
+SPASM is free software: you can redistribute it and/or
+modify it under the terms of the GNU General Public License as published by the
+Free Software Foundation, either version 3 of the License, or (at your option)
+any later version.
+
+SPASM is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY
+or FITNESS FOR A PARTICULAR PURPOSE.
+
+See the GNU General Public License for more details.
+You should have received a copy of the GNU General Public License along with SPASM.
+If not, see <https://www.gnu.org/licenses/>. 
+---
+"""
+
+import difflib
+import subprocess
+import os
+
+from .utils import run_cli, initializeTmpWorkspace
+
+SOURCE_DATA_FILES = os.path.join(".", "tests", "data")
+
+
+def expected_diff(path: str, expected: str) -> str:
+    with open(path, "rt") as f:
+        sourceLines = f.readlines()
+    with open(expected, "rt") as f:
+        expectedLines = f.readlines()
+    return "".join(difflib.unified_diff(sourceLines, expectedLines, path, path))
+
+
+def test_that_it_outputs_the_diff_of_each_file_without_modifying_them():
+    fileNames = ["source1.s", "source2-formatted.s", "source2.s"]
+    tmp_dir = initializeTmpWorkspace(
+        [os.path.join(SOURCE_DATA_FILES, f) for f in fileNames]
+    )
+    targetFiles = [os.path.join(tmp_dir, f) for f in fileNames]
+    expected = expected_diff(
+        targetFiles[0], os.path.join(SOURCE_DATA_FILES, "source1-formatted.s")
+    ) + expected_diff(
+        targetFiles[2], os.path.join(SOURCE_DATA_FILES, "source2-formatted.s")
+    )
+    assert expected != ""
+
+    for jobs in ["1", "2"]:
+        assert run_cli(["prog", "--diff", "--jobs", jobs] + targetFiles) == (
+            0,
+            expected,
+            "",
+        )
+
+
+def test_that_it_outputs_separate_hunks_with_their_context():
+    tmp_dir = initializeTmpWorkspace([])
+    source = os.path.join(tmp_dir, "source.s")
+    formatted = os.path.join(tmp_dir, "formatted.s")
+    with open(formatted, "wt") as f:
+        for i in range(40):
+            f.write(f"label{i}".ljust(16) + "rts\n")
+    with open(source, "wt") as f:
+        for i in range(40):
+            # changes separated by more than twice the context, or not
+            f.write(
+                f"label{i}  rts\n"
+                if i % 9 == 0 or i == 10
+                else f"label{i}".ljust(16) + "rts\n"
+            )
+
+    assert run_cli(["prog", "--diff", "--jobs", "1", source]) == (
+        0,
+        expected_diff(source, formatted),
+        "",
+    )
+    assert expected_diff(source, formatted).count("@@ -") == 5
+
+
+def test_that_it_cannot_diff_without_given_input_files_list():
+    assert run_cli(["prog", "--diff"]) == (
+        1,
+        "",
+        "ERROR -- diff mode requires a list of files\n",
+    )
+
+
+def test_that_the_diff_of_a_file_without_final_line_feed_gives_the_rewritten_file():
+    tmp_dir = initializeTmpWorkspace([])
+    formatted = [f"label{i}".ljust(16) + "rts" for i in range(40)]
+    for changedLines in [[38], [0], [0, 38]]:
+        # the last line is either inside the hunk of a change, or far from any change
+        source = os.path.join(tmp_dir, "source.s")
+        rewritten = os.path.join(tmp_dir, "rewritten.s")
+        lines = [
+            f"label{i}  rts" if i in changedLines else line
+            for i, line in enumerate(formatted)
+        ]
+        for path in [source, rewritten]:
+            with open(path, "wt") as f:
+                f.write("\n".join(lines))
+        assert run_cli(["prog", "--rewrite", "--no-cache", rewritten])[0] == 0
+
+        returnCode, out, err = run_cli(["prog", "--diff", "--jobs", "1", source])
+        assert (returnCode, err) == (0, "")
+        subprocess.run(["patch", "--quiet", source], input=out, text=True, check=True)
+        with open(source, "rt") as f, open(rewritten, "rt") as g:
+            assert f.read() == g.read()
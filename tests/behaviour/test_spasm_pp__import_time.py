@@ -0,0 +1,92 @@
+"""
+Test suite about the start-up time of the command line interface.
+---
+(c) 2024 David SPORN
+---
+This is part of SPASM -- Sporniket's toolbox for assembly language.
+
+SPASM is free software: you can redistribute it and/or
+modify it under the terms of the GNU General Public License as published by the
+Free Software Foundation, either version 3 of the License, or (at your option)
+any later version.
+
+SPASM is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY
+or FITNESS FOR A PARTICULAR PURPOSE.
+
+See the GNU General Public License for more details.
+You should have received a copy of the GNU General Public License along with SPASM.
+If not, see <https://www.gnu.org/licenses/>. 
+---
+"""
+
+import os
+import subprocess
+import sys
+
+# modules that MUST NOT be imported to show the help, i.e. the modules that are only needed by some
+# modes
+LAZY_MODULES = [
+    "concurrent.futures",
+    "json",
+    "multiprocessing",
+    "socket",
+    "socketserver",
+    "spasm.pp.daemon",
+    "spasm.pp.stylesheet.loader",
+    "spasm.pp.stylesheet.validation",
+    "spasm.pp.watch",
+    "tempfile",
+]
+
+# modules that MUST NOT be imported to format the standard input with a builtin stylesheet, i.e.
+# the modules that are only needed by some modes or by `file:` stylesheets
+LAZY_MODULES_OF_STANDARD_INPUT = LAZY_MODULES + ["importlib.metadata"]
+
+# budget of the time spent importing the modules of spasm itself, in microseconds
+BUDGET_OF_IMPORT_TIME = 100_000
+
+
+def import_times_of_help() -> dict:
+    """The self import time of each imported module, in microseconds."""
+    return import_times_of(["--help"])
+
+
+def import_times_of(args, input: str = "") -> dict:
+    """The self import time of each module imported by a run with the given arguments and
+    standard input, in microseconds."""
+    command = [sys.executable, "-X", "importtime", "-m", "spasm.pp"] + args
+    env = dict(os.environ, PYTHONPATH="src")
+    # a first run to have the compiled modules up to date
+    subprocess.run(command, env=env, input=input, capture_output=True, text=True)
+    completed = subprocess.run(
+        command, env=env, input=input, capture_output=True, check=True, text=True
+    )
+    result = {}
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        selfTime, _, name = line[len("import time:") :].split("|")
+        result[name.strip()] = int(selfTime)
+    return result
+
+
+def test_that_showing_the_help_does_not_import_modules_of_specific_modes():
+    importTimes = import_times_of_help()
+    assert "spasm.pp.cli" in importTimes
+    assert [m for m in LAZY_MODULES if m in importTimes] == []
+
+
+def test_that_showing_the_help_imports_spasm_within_budget():
+    importTimes = import_times_of_help()
+    timeOfSpasm = sum(t for m, t in importTimes.items() if m.startswith("spasm"))
+    assert timeOfSpasm < BUDGET_OF_IMPORT_TIME
+
+
+def test_that_formatting_the_standard_input_does_not_import_modules_of_specific_modes():
+    for args in [[], ["--stylesheet", "builtin:sporniket"]]:
+        importTimes = import_times_of(args, " rts\n")
+        assert "spasm.pp.cli" in importTimes
+        assert [m for m in LAZY_MODULES_OF_STANDARD_INPUT if m in importTimes] == []
+        timeOfSpasm = sum(t for m, t in importTimes.items() if m.startswith("spasm"))
+        assert timeOfSpasm < BUDGET_OF_IMPORT_TIME
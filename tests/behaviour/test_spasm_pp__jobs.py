@@ -0,0 +1,99 @@
+"""
+Test suite using parallel processing of the given input files.
+---
+(c) 2024 David SPORN
+---
+This is part of SPASM -- Sporniket's toolbox for assembly language.
+
+SPASM is free software: you can redistribute it and/or
+modify it under the terms of the GNU General Public License as published by the
+Free Software Foundation, either version 3 of the License, or (at your option)
+any later version.
+
+SPASM is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY
+or FITNESS FOR A PARTICULAR PURPOSE.
+
+See the GNU General Public License for more details.
+You should have received a copy of the GNU General Public License along with SPASM.
+If not, see <https://www.gnu.org/licenses/>. 
+---
+"""
+
+import os
+
+from .utils import (
+    run_cli,
+    initializeTmpWorkspace,
+    assert_that_source_is_converted_as_expected,
+)
+
+SOURCE_DATA_FILES = os.path.join(".", "tests", "data")
+
+
+def test_that_it_outputs_files_in_the_given_order_whatever_the_count_of_jobs():
+    sources = [
+        os.path.join(SOURCE_DATA_FILES, f)
+        for f in ["source1.s", "source2.s", "source1-formatted.s", "source2.s"]
+    ]
+    expected = run_cli(["prog", "--jobs", "1"] + sources)
+    assert expected[0] == 0
+    assert run_cli(["prog", "--jobs", "3"] + sources) == expected
+
+
+def test_that_it_rewrites_files_using_several_jobs():
+    fileNames = ["source1.s", "source2.s"]
+    tmp_dir = initializeTmpWorkspace(
+        [
+            os.path.join(SOURCE_DATA_FILES, f)
+            for f in fileNames + ["source1-formatted.s", "source2-formatted.s"]
+        ]
+    )
+    targetFiles = [os.path.join(tmp_dir, f) for f in fileNames]
+
+    returnCode, out, err = run_cli(["prog", "--rewrite", "--jobs", "2"] + targetFiles)
+    assert returnCode == 0
+    assert out == ""
+    assert err == ""
+    for f in targetFiles:
+        assert_that_source_is_converted_as_expected(f, f[:-2] + "-formatted.s")
+
+
+def test_that_it_outputs_the_same_result_when_splitting_files_into_chunks():
+    tmp_dir = initializeTmpWorkspace([])
+    source = os.path.join(tmp_dir, "big.s")
+    with open(source, "wt") as f:
+        for i in range(200):
+            f.write(f"label{i} move.l d{i % 8},d1 ; commented operation\n")
+            f.write(" ; comment continuation\n")
+            f.write(" ; another comment continuation\n" if i % 3 else "\n")
+            f.write(" rts\n" if i % 5 else " ; last comment\n")
+
+    expected = run_cli(["prog", "--jobs", "1", source])
+    assert expected[0] == 0
+    assert run_cli(["prog", "--jobs", "3", "--chunk-lines", "7", source]) == expected
+
+
+def test_that_it_reports_errors_of_each_file():
+    tmp_dir = initializeTmpWorkspace([os.path.join(SOURCE_DATA_FILES, "source1.s")])
+    wrongFile = os.path.join(tmp_dir, "wrong.s")
+    with open(wrongFile, "wb") as f:
+        f.write(b"\xff\xfe\xfa not utf-8\n")
+
+    returnCode, out, err = run_cli(
+        ["prog", "--jobs", "2", os.path.join(tmp_dir, "source1.s"), wrongFile]
+    )
+    assert returnCode != 0
+    assert out == "                from    source1\n\n"
+    assert err.startswith(
+        f"ERROR -- while processing given list of files :\n* {wrongFile} : "
+    )
+
+
+def test_that_it_rejects_wrong_count_of_jobs():
+    returnCode, out, err = run_cli(
+        ["prog", "--jobs", "0", os.path.join(SOURCE_DATA_FILES, "source1.s")]
+    )
+    assert returnCode != 0
+    assert out == ""
+    assert err == "ERROR -- wrong value '0' for parameter 'jobs'\n"
@@ -0,0 +1,71 @@
+"""
+Test suite formatting a range of lines.
+---
+(c) 2024 David SPORN
+---
+This is part of SPASM -- Sporniket's toolbox for assembly language.
+
+SPASM is free software: you can redistribute it and/or
+modify it under the terms of the GNU General Public License as published by the
+Free Software Foundation, either version 3 of the License, or (at your option)
+any later version.
+
+SPASM is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY
+or FITNESS FOR A PARTICULAR PURPOSE.
+
+See the GNU General Public License for more details.
+You should have received a copy of the GNU General Public License along with SPASM.
+If not, see <https://www.gnu.org/licenses/>. 
+---
+"""
+
+import io
+import os
+import sys
+
+from unittest.mock import patch
+
+from .utils import run_cli, initializeTmpWorkspace, mockStdInput
+
+SOURCE = [
+    "label move.l d0,d1 ; commented operation",
+    " ; comment continuation",
+    "",
+    " rts  ",
+    "done rts ; finished",
+]
+
+
+def test_that_it_formats_only_the_given_lines_of_the_standard_input():
+    with patch.object(sys, "stdin", mockStdInput(SOURCE)):
+        returnCode, out, err = run_cli(["prog", "--lines", "2-2"])
+    assert (returnCode, err) == (0, "")
+    assert out == "\n".join(
+        [SOURCE[0], "                                ; comment continuation"]
+        + SOURCE[2:]
+        + [""]
+    )
+
+
+def test_that_it_rewrites_only_the_given_lines_of_the_files():
+    tmp_dir = initializeTmpWorkspace([])
+    source = os.path.join(tmp_dir, "source.s")
+    with open(source, "wt") as f:
+        f.write("\n".join(SOURCE) + "\n")
+
+    assert run_cli(["prog", "--rewrite", "--lines", "4-5", source]) == (0, "", "")
+    with open(source, "rt") as f:
+        assert f.read() == "\n".join(
+            SOURCE[:3]
+            + ["                rts", "done            rts             ; finished", ""]
+        )
+
+
+def test_that_it_rejects_wrong_range_of_lines():
+    for spec in ["3", "0-2", "5-4", "a-b", "1-"]:
+        assert run_cli(["prog", "--lines", spec]) == (
+            1,
+            "",
+            f"ERROR -- wrong value '{spec}' for parameter 'lines'\n",
+        )
@@ -0,0 +1,99 @@
+"""
+Test suite about the output of the formatted sources.
+---
+(c) 2024 David SPORN
+---
+This is part of SPASM -- Sporniket's toolbox for assembly language.
+
+SPASM is free software: you can redistribute it and/or
+modify it under the terms of the GNU General Public License as published by the
+Free Software Foundation, either version 3 of the License, or (at your option)
+any later version.
+
+SPASM is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY
+or FITNESS FOR A PARTICULAR PURPOSE.
+
+See the GNU General Public License for more details.
+You should have received a copy of the GNU General Public License along with SPASM.
+If not, see <https://www.gnu.org/licenses/>. 
+---
+"""
+
+import os
+import subprocess
+import sys
+
+from .utils import (
+    run_cli,
+    initializeTmpWorkspace,
+    verify_behaviour_using_standard_input,
+)
+
+SOURCE_DATA_FILES = os.path.join(".", "tests", "data")
+
+
+def test_that_it_outputs_the_same_result_whatever_the_size_of_the_buffer():
+    sources = [os.path.join(SOURCE_DATA_FILES, f) for f in ["source1.s", "source2.s"]]
+    expected = run_cli(["prog", "--jobs", "1"] + sources)
+    assert expected[0] == 0
+    for size in ["0", "1", "7", "100000"]:
+        assert run_cli(["prog", "--jobs", "1", "--output-buffer", size] + sources) == (
+            expected
+        )
+
+
+def test_that_it_outputs_standard_input_using_a_small_buffer():
+    verify_behaviour_using_standard_input(
+        ["label move.l d0,d1 ; comment", " rts"],
+        ["prog", "--output-buffer", "3"],
+        "label           move.l  d0,d1   ; comment\n                rts\n",
+    )
+
+
+def test_that_it_rejects_wrong_size_of_buffer():
+    returnCode, out, err = run_cli(
+        ["prog", "--output-buffer", "-1", os.path.join(SOURCE_DATA_FILES, "source1.s")]
+    )
+    assert returnCode != 0
+    assert out == ""
+    assert err == "ERROR -- wrong value '-1' for parameter 'output-buffer'\n"
+
+
+def test_that_it_stops_quietly_when_the_output_is_closed():
+    process = subprocess.Popen(
+        [sys.executable, "-m", "spasm.pp", "--output-buffer", "0"],
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        env=dict(os.environ, PYTHONPATH="src"),
+    )
+    process.stdin.write(b" rts\n")
+    process.stdin.flush()
+    assert process.stdout.readline() == b"                rts\n"
+    process.stdout.close()
+    process.stdin.write(b" rts\n" * 1000)
+    process.stdin.close()
+    assert process.wait(timeout=30) == 1
+    assert process.stderr.read() == b""
+
+
+def test_that_it_stops_quietly_when_the_output_of_files_is_closed():
+    tmp_dir = initializeTmpWorkspace([])
+    sources = []
+    for i in range(6):
+        source = os.path.join(tmp_dir, f"f{i}.s")
+        with open(source, "wt") as f:
+            f.write("label move.l d0,d1 ; comment\n" * 5000)
+        sources.append(source)
+    process = subprocess.Popen(
+        [sys.executable, "-m", "spasm.pp", "--jobs", "1", "--output-buffer", "0"]
+        + sources,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        env=dict(os.environ, PYTHONPATH="src"),
+    )
+    assert process.stdout.readline() != b""
+    process.stdout.close()
+    assert process.wait(timeout=60) == 1
+    assert process.stderr.read() == b""
@@ -0,0 +1,67 @@
+"""
+Behaviour of the profiling hooks (--profile-out, --trace-memory)
+---
+(c) 2024 David SPORN
+---
+This is part of SPASM -- Sporniket's toolbox for assembly language.
+
+SPASM is free software: you can redistribute it and/or
+modify it under the terms of the GNU General Public License as published by the
+Free Software Foundation, either version 3 of the License, or (at your option)
+any later version.
+
+SPASM is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY
+or FITNESS FOR A PARTICULAR PURPOSE.
+
+See the GNU General Public License for more details.
+You should have received a copy of the GNU General Public License along with SPASM.
+If not, see <https://www.gnu.org/licenses/>. 
+---
+"""
+
+import os
+import pstats
+import sys
+
+from unittest.mock import patch
+
+from .utils import run_cli, initializeTmpWorkspace, mockStdInput
+
+SOURCE_DATA_FILES = os.path.join(".", "tests", "data")
+
+
+def test_that_it_dumps_the_profile_of_the_processing_of_files():
+    tmp_dir = initializeTmpWorkspace([])
+    pathOfProfile = os.path.join(tmp_dir, "spasm_pp.prof")
+    sources = [os.path.join(SOURCE_DATA_FILES, f) for f in ["source1.s", "source2.s"]]
+    expected = run_cli(["prog", "--jobs", "1"] + sources)
+
+    assert (
+        run_cli(["prog", "--jobs", "1", "--profile-out", pathOfProfile] + sources)
+        == expected
+    )
+    profiledFunctions = [name for _, _, name in pstats.Stats(pathOfProfile).stats]
+    assert "process_line" in profiledFunctions
+    assert "parse" in profiledFunctions
+
+
+def test_that_it_reports_the_memory_allocations_of_the_processing_of_the_standard_input():
+    lines = ["label move.l d0,d1 ; comment", " rts"]
+    with patch.object(sys, "stdin", mockStdInput(lines)):
+        expected = run_cli(["prog"])
+    with patch.object(sys, "stdin", mockStdInput(lines)):
+        returnCode, out, err = run_cli(["prog", "--trace-memory"])
+    assert (returnCode, out) == expected[:2]
+    assert err.startswith("MEMORY -- peak of traced allocations : ")
+    assert "* top allocation sites, still allocated at the end :\n" in err
+
+
+def test_that_it_fails_when_the_profile_cannot_be_written():
+    tmp_dir = initializeTmpWorkspace([])
+    pathOfProfile = os.path.join(tmp_dir, "missing", "spasm_pp.prof")
+    with patch.object(sys, "stdin", mockStdInput([" rts"])):
+        returnCode, out, err = run_cli(["prog", "--profile-out", pathOfProfile])
+    assert returnCode != 0
+    assert out != ""
+    assert err.startswith("ERROR -- cannot write the profile : ")
@@ -84,3 +84,28 @@ def test_that_it_cannot_rewrite_without_given_input_files_list():
             == """ERROR -- rewrite mode requires a list of files
 """
         )
+
+
+def test_that_it_replaces_rewritten_files_keeping_their_mode_and_links():
+    # Prepare files
+    tmp_dir = initializeTmpWorkspace(
+        [os.path.join(SOURCE_DATA_FILES, f) for f in ["source1.s", "source2.s"]]
+    )
+    os.chmod(os.path.join(tmp_dir, "source1.s"), 0o640)
+    os.symlink("source2.s", os.path.join(tmp_dir, "link.s"))
+    targetFiles = [os.path.join(tmp_dir, f) for f in ["source1.s", "link.s"]]
+
+    # execute
+    with patch.object(sys, "argv", ARGS + ["--no-cache"] + targetFiles):
+        with redirect_stdout(io.StringIO()) as out:
+            returnCode = PrettyPrinterCli().run()
+        assert returnCode == 0
+        assert out.getvalue() == """"""
+        assert sorted(os.listdir(tmp_dir)) == ["link.s", "source1.s", "source2.s"]
+        assert os.stat(targetFiles[0]).st_mode & 0o777 == 0o640
+        assert os.path.islink(targetFiles[1])
+        for f in ["source1", "source2"]:
+            assert_that_source_is_converted_as_expected(
+                os.path.join(tmp_dir, f"{f}.s"),
+                os.path.join(SOURCE_DATA_FILES, f"{f}-formatted.s"),
+            )
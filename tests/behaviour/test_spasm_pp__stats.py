@@ -0,0 +1,81 @@
+"""
+Behaviour of the stats of a run (--stats, --stats-json)
+---
+(c) 2024 David SPORN
+---
+This is part of SPASM -- Sporniket's toolbox for assembly language.
+
+SPASM is free software: you can redistribute it and/or
+modify it under the terms of the GNU General Public License as published by the
+Free Software Foundation, either version 3 of the License, or (at your option)
+any later version.
+
+SPASM is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY
+or FITNESS FOR A PARTICULAR PURPOSE.
+
+See the GNU General Public License for more details.
+You should have received a copy of the GNU General Public License along with SPASM.
+If not, see <https://www.gnu.org/licenses/>. 
+---
+"""
+
+import io
+import json
+import os
+import sys
+
+from unittest.mock import patch
+
+from .utils import run_cli, initializeTmpWorkspace, mockStdInput
+
+SOURCE_DATA_FILES = os.path.join(".", "tests", "data")
+
+
+def test_that_it_prints_the_stats_of_the_standard_input_without_changing_the_output():
+    lines = ["label move.l d0,d1 ; comment", "", "* comment line", " rts"]
+    with patch.object(sys, "stdin", mockStdInput(lines)):
+        expected = run_cli(["prog"])
+    with patch.object(sys, "stdin", mockStdInput(lines)):
+        returnCode, out, err = run_cli(["prog", "--stats"])
+    assert returnCode == 0
+    assert out == expected[1]
+    assert err.startswith("STATS -- 4 lines in ")
+    assert "* lines : 2 statements, 1 comment lines, 1 blank lines\n" in err
+    assert f"* bytes : {len(chr(10).join(lines)) + 1} in, {len(out)} out\n" in err
+
+
+def test_that_it_writes_the_stats_of_the_files_using_several_jobs():
+    fileNames = ["source1.s", "source2.s", "source1-formatted.s"]
+    tmp_dir = initializeTmpWorkspace(
+        [os.path.join(SOURCE_DATA_FILES, f) for f in fileNames]
+    )
+    targetFiles = [os.path.join(tmp_dir, f) for f in fileNames]
+    pathOfStats = os.path.join(tmp_dir, "stats.json")
+
+    returnCode, out, err = run_cli(
+        ["prog", "--rewrite", "--jobs", "2", "--stats-json", pathOfStats] + targetFiles
+    )
+    assert (returnCode, out, err) == (0, "", "")
+    with open(pathOfStats, "rt") as f:
+        stats = json.load(f)
+    assert stats["files"] == {"read": 3, "skipped": 0, "rewritten": 2, "failed": 0}
+    assert stats["lines"]["total"] > 0
+    assert stats["bytes"]["in"] == sum(
+        os.path.getsize(os.path.join(SOURCE_DATA_FILES, f)) for f in fileNames
+    )
+    assert sorted(f["path"] for f in stats["slowestFiles"]) == sorted(targetFiles)
+
+    # the formatted files are known by the cache
+    returnCode, out, err = run_cli(["prog", "--rewrite", "--stats"] + targetFiles)
+    assert returnCode == 0
+    assert "* files : 0 read, 3 skipped, 0 rewritten, 0 failed\n" in err
+
+
+def test_that_it_rejects_stats_in_watch_mode():
+    returnCode, out, err = run_cli(
+        ["prog", "--watch", "--stats", os.path.join(SOURCE_DATA_FILES, "source1.s")]
+    )
+    assert returnCode != 0
+    assert out == ""
+    assert err == "ERROR -- stats are not available in watch, daemon and client modes\n"
@@ -0,0 +1,87 @@
+"""
+Test suite about the discovery of the stylesheet files of the folders of the source files.
+---
+(c) 2024 David SPORN
+---
+This is part of SPASM -- Sporniket's toolbox for assembly language.
+
+SPASM is free software: you can redistribute it and/or
+modify it under the terms of the GNU General Public License as published by the
+Free Software Foundation, either version 3 of the License, or (at your option)
+any later version.
+
+SPASM is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY
+or FITNESS FOR A PARTICULAR PURPOSE.
+
+See the GNU General Public License for more details.
+You should have received a copy of the GNU General Public License along with SPASM.
+If not, see <https://www.gnu.org/licenses/>. 
+---
+"""
+
+import filecmp
+import os
+import shutil
+
+from spasm.pp.stylesheet.discovery import NAME_OF_STYLESHEET_FILE
+
+from .utils import run_cli, initializeTmpWorkspace
+
+SOURCE_DATA_FILES = os.path.join(".", "tests", "data")
+CUSTOM_STYLESHEET = os.path.join(SOURCE_DATA_FILES, "margin-label.json")
+
+
+SOURCE = "label move.l d0,d1 ; comment\n\tmacro\n"
+
+
+def given_workspace():
+    """A folder without stylesheet file and a folder with one, each containing a source file."""
+    tmp_dir = initializeTmpWorkspace([])
+    targetFiles = []
+    for folder in ["default", "custom"]:
+        os.makedirs(os.path.join(tmp_dir, folder))
+        targetFiles += [os.path.join(tmp_dir, folder, "source.s")]
+        with open(targetFiles[-1], "wt") as f:
+            f.write(SOURCE)
+    shutil.copy(
+        CUSTOM_STYLESHEET, os.path.join(tmp_dir, "custom", NAME_OF_STYLESHEET_FILE)
+    )
+    return tmp_dir, targetFiles
+
+
+def test_that_it_formats_each_file_with_the_stylesheet_of_its_folder():
+    tmp_dir, targetFiles = given_workspace()
+    assert run_cli(["prog", "--rewrite", "--jobs", "1"] + targetFiles) == (0, "", "")
+    assert run_cli(
+        ["prog", "--check", "--stylesheet", "builtin:heritage", targetFiles[0]]
+    ) == (0, "", "")
+    assert run_cli(
+        ["prog", "--check", "--stylesheet", f"file:{CUSTOM_STYLESHEET}", targetFiles[1]]
+    ) == (0, "", "")
+    assert not filecmp.cmp(targetFiles[0], targetFiles[1], shallow=False)
+
+
+def test_that_it_does_not_discover_stylesheets_when_a_stylesheet_is_given():
+    tmp_dir, targetFiles = given_workspace()
+    assert run_cli(
+        ["prog", "--rewrite", "--stylesheet", "builtin:heritage"] + targetFiles
+    ) == (0, "", "")
+    assert filecmp.cmp(targetFiles[0], targetFiles[1], shallow=False)
+    assert run_cli(
+        ["prog", "--check", "--stylesheet", "builtin:heritage", targetFiles[1]]
+    ) == (0, "", "")
+
+
+def test_that_it_reports_invalid_discovered_stylesheet_files():
+    tmp_dir, targetFiles = given_workspace()
+    pathOfStylesheet = os.path.join(tmp_dir, "custom", NAME_OF_STYLESHEET_FILE)
+    with open(pathOfStylesheet, "wt") as f:
+        f.write('{"tabulation":{"width":0}}')
+    returnCode, out, err = run_cli(["prog", "--check"] + targetFiles)
+    assert returnCode == 1
+    assert out == ""
+    assert (
+        err
+        == f"ERROR -- Wrong values in stylesheet '{os.path.abspath(pathOfStylesheet)}' : \n* tabulation.width MUST be > 0\n"
+    )
@@ -0,0 +1,95 @@
+"""
+Test suite using watch mode.
+---
+(c) 2024 David SPORN
+---
+This is part of SPASM -- Sporniket's toolbox for assembly language.
+
+SPASM is free software: you can redistribute it and/or
+modify it under the terms of the GNU General Public License as published by the
+Free Software Foundation, either version 3 of the License, or (at your option)
+any later version.
+
+SPASM is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY
+or FITNESS FOR A PARTICULAR PURPOSE.
+
+See the GNU General Public License for more details.
+You should have received a copy of the GNU General Public License along with SPASM.
+If not, see <https://www.gnu.org/licenses/>. 
+---
+"""
+
+import os
+import shutil
+import threading
+
+from unittest.mock import patch
+
+from spasm.pp.stylesheet.discovery import NAME_OF_STYLESHEET_FILE
+
+from .utils import (
+    run_cli,
+    initializeTmpWorkspace,
+    assert_that_source_is_converted_as_expected,
+)
+
+SOURCE_DATA_FILES = os.path.join(".", "tests", "data")
+
+
+def test_that_it_rewrites_the_source_files_of_the_watched_directories():
+    tmp_dir = initializeTmpWorkspace(
+        [
+            os.path.join(SOURCE_DATA_FILES, f)
+            for f in ["source1.s", "source2-formatted.s", "source1-formatted.s"]
+        ]
+    )
+
+    # interrupted right after the first poll
+    with patch.object(threading.Event, "wait", side_effect=KeyboardInterrupt):
+        returnCode, out, err = run_cli(["prog", "--watch", tmp_dir])
+    assert (returnCode, err) == (0, "")
+    assert out == f"* REWRITTEN : {os.path.join(tmp_dir, 'source1.s')}\n"
+    assert_that_source_is_converted_as_expected(
+        os.path.join(tmp_dir, "source1.s"),
+        os.path.join(tmp_dir, "source1-formatted.s"),
+    )
+
+
+def test_that_it_cannot_watch_without_given_paths():
+    assert run_cli(["prog", "--watch"]) == (
+        1,
+        "",
+        "ERROR -- watch mode requires a list of files or directories\n",
+    )
+    assert run_cli(["prog", "--watch", "missing"]) == (
+        1,
+        "",
+        "ERROR -- in given list of files :\n* MISSING : missing\n",
+    )
+    assert run_cli(["prog", "--watch", "--watch-interval", "0", "."]) == (
+        1,
+        "",
+        "ERROR -- wrong value '0.0' for parameter 'watch-interval'\n",
+    )
+
+
+def test_that_it_rewrites_each_file_with_the_stylesheet_of_its_folder():
+    tmp_dir = initializeTmpWorkspace([])
+    targetFiles = []
+    for folder in ["default", "custom"]:
+        os.makedirs(os.path.join(tmp_dir, folder))
+        targetFiles.append(os.path.join(tmp_dir, folder, "source.s"))
+        with open(targetFiles[-1], "wt") as f:
+            f.write("label move.l d0,d1 ; comment\n")
+    shutil.copy(
+        os.path.join(SOURCE_DATA_FILES, "margin-label.json"),
+        os.path.join(tmp_dir, "custom", NAME_OF_STYLESHEET_FILE),
+    )
+
+    with patch.object(threading.Event, "wait", side_effect=KeyboardInterrupt):
+        returnCode, out, err = run_cli(["prog", "--watch", tmp_dir])
+    assert (returnCode, err) == (0, "")
+    assert run_cli(["prog", "--check"] + targetFiles) == (0, "", "")
+    with open(targetFiles[0], "rt") as f, open(targetFiles[1], "rt") as g:
+        assert f.read() != g.read()
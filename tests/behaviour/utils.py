@@ -26,13 +26,23 @@ import shutil
 import sys
 import time
 
-from contextlib import redirect_stdout
+from contextlib import redirect_stdout, redirect_stderr
 from typing import List
 from unittest.mock import patch
 
 from spasm.pp import PrettyPrinterCli
 
 
+def run_cli(argv):
+    """Runs the command line interface with the given arguments, returns its return code, its
+    output and its error output."""
+    with patch.object(sys, "argv", argv):
+        with redirect_stdout(io.StringIO()) as out:
+            with redirect_stderr(io.StringIO()) as err:
+                returnCode = PrettyPrinterCli().run()
+    return returnCode, out.getvalue(), err.getvalue()
+
+
 def mockStdInput(lines):
     return io.StringIO("\n".join(lines) + "\n")
 
@@ -0,0 +1,76 @@
+"""
+---
+(c) 2024 David SPORN
+---
+This is part of SPASM -- Sporniket's toolbox for assembly language.
+
+SPASM is free software: you can redistribute it and/or
+modify it under the terms of the GNU General Public License as published by the
+Free Software Foundation, either version 3 of the License, or (at your option)
+any later version.
+
+SPASM is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY
+or FITNESS FOR A PARTICULAR PURPOSE.
+
+See the GNU General Public License for more details.
+You should have received a copy of the GNU General Public License along with SPASM.
+If not, see <https://www.gnu.org/licenses/>. 
+---
+"""
+
+import json
+
+from spasm.pp.benchmark import BenchmarkSuite
+from spasm.pp.benchmark.__main__ import BenchmarkCli
+
+
+def test_that_BenchmarkSuite_run__measures_each_benchmark_under_each_stylesheet():
+    suite = BenchmarkSuite(countOfLines=200, seed=1, repeat=2, countOfFiles=3)
+    reported = []
+    results = suite.run(
+        ["parse", "render", "stdin", "rewrite"],
+        ["heritage", "sporniket"],
+        reported.append,
+    )
+    assert results["corpus"] == {"lines": 200, "seed": 1}
+    assert [(r["benchmark"], r["stylesheet"]) for r in results["results"]] == [
+        ("parse", None),
+        ("render", "heritage"),
+        ("render", "sporniket"),
+        ("stdin", "heritage"),
+        ("stdin", "sporniket"),
+        ("rewrite", "heritage"),
+        ("rewrite", "sporniket"),
+    ]
+    assert reported == results["results"]
+    for result in results["results"]:
+        assert len(result["timings"]) == 2
+        assert result["median"] > 0
+        assert result["linesPerSecond"] == result["lines"] / result["median"]
+    assert results["results"][-1]["lines"] == 200
+
+
+def test_that_BenchmarkCli_writes_the_results_as_json(tmp_path, capsys):
+    pathOfResults = str(tmp_path / "results.json")
+    assert (
+        BenchmarkCli().run(
+            ["--lines", "100", "--repeat", "1", "--benchmarks", "parse,render"]
+            + ["--stylesheets", "sporniket", "--output", pathOfResults]
+        )
+        == 0
+    )
+    with open(pathOfResults) as f:
+        results = json.load(f)
+    assert [r["benchmark"] for r in results["results"]] == ["parse", "render"]
+    out = capsys.readouterr().out.splitlines()
+    assert out[0].split() == ["benchmark", "stylesheet", "lines/s", "MB/s", "median"]
+    assert out[2].startswith("render    sporniket")
+
+
+def test_that_BenchmarkCli_rejects_unknown_benchmarks(capsys):
+    assert BenchmarkCli().run(["--benchmarks", "parse,whatever"]) == 1
+    assert (
+        capsys.readouterr().err
+        == "ERROR -- wrong value 'parse,whatever' for parameter 'benchmarks'\n"
+    )
@@ -0,0 +1,64 @@
+"""
+---
+(c) 2024 David SPORN
+---
+This is part of SPASM -- Sporniket's toolbox for assembly language.
+
+SPASM is free software: you can redistribute it and/or
+modify it under the terms of the GNU General Public License as published by the
+Free Software Foundation, either version 3 of the License, or (at your option)
+any later version.
+
+SPASM is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY
+or FITNESS FOR A PARTICULAR PURPOSE.
+
+See the GNU General Public License for more details.
+You should have received a copy of the GNU General Public License along with SPASM.
+If not, see <https://www.gnu.org/licenses/>. 
+---
+"""
+
+import io
+
+from spasm.pp.output import BufferedOutputWriter
+
+
+def given_binary_stream() -> io.TextIOWrapper:
+    return io.TextIOWrapper(io.BytesIO(), encoding="utf-8", newline="\n")
+
+
+def test_that__BufferedOutputWriter_write__collects_texts_until_the_buffer_is_full():
+    stream = given_binary_stream()
+    writer = BufferedOutputWriter(stream, 10)
+    writer.write("héllo\n")
+    assert stream.buffer.getvalue() == b""
+    writer.write("world\n")
+    assert stream.buffer.getvalue() == "héllo\nworld\n".encode("utf-8")
+    writer.write("end\n")
+    writer.flush()
+    assert stream.buffer.getvalue() == "héllo\nworld\nend\n".encode("utf-8")
+
+
+def test_that__BufferedOutputWriter_write__writes_immediately_when_line_buffered():
+    stream = given_binary_stream()
+    writer = BufferedOutputWriter(stream, 1000, lineBuffered=True)
+    writer.write("hello\n")
+    assert stream.buffer.getvalue() == b"hello\n"
+
+
+def test_that__BufferedOutputWriter__writes_after_the_pending_data_of_the_text_layer():
+    stream = given_binary_stream()
+    stream.write("first\n")
+    writer = BufferedOutputWriter(stream, 0)
+    writer.writelines(["second\n", "third\n"])
+    assert stream.buffer.getvalue() == b"first\nsecond\nthird\n"
+
+
+def test_that__BufferedOutputWriter__writes_into_a_stream_without_binary_buffer():
+    stream = io.StringIO()
+    writer = BufferedOutputWriter(stream, 1000)
+    writer.writelines(["hello\n", "world\n"])
+    assert stream.getvalue() == ""
+    writer.flush()
+    assert stream.getvalue() == "hello\nworld\n"
@@ -0,0 +1,93 @@
+"""
+---
+(c) 2024 David SPORN
+---
+This is part of SPASM -- Sporniket's toolbox for assembly language.
+
+SPASM is free software: you can redistribute it and/or
+modify it under the terms of the GNU General Public License as published by the
+Free Software Foundation, either version 3 of the License, or (at your option)
+any later version.
+
+SPASM is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY
+or FITNESS FOR A PARTICULAR PURPOSE.
+
+See the GNU General Public License for more details.
+You should have received a copy of the GNU General Public License along with SPASM.
+If not, see <https://www.gnu.org/licenses/>. 
+---
+"""
+
+import random
+
+from spasm.pp.statement_line import (
+    CompactStatementLine,
+    StatementLinePatternParser,
+    StatementLineRenderer,
+)
+from spasm.pp.stylesheet.builtin import SPORNIKET, HERITAGE
+
+QUERIES = [
+    "isEmpty",
+    "isCommentOnly",
+    "isCommentedOperation",
+    "isNoOperation",
+    "isOperationWithoutComment",
+    "hasLabel",
+    "hasOperands",
+    "hasComment",
+]
+
+
+def test_that__CompactStatementLine__references_spans_of_the_source():
+    source = "that's all folks ; end of line"
+    statement = CompactStatementLine(source, 0, 6, 7, 10, 11, 16, 19, 30)
+    assert statement.label == "that's"
+    assert statement.mnemonic == "all"
+    assert statement.operands == "folks"
+    assert statement.comment == "end of line"
+    assert statement.isCommentedOperation()
+    assert not statement.isCommentOnly()
+    assert not hasattr(statement, "__dict__")
+
+
+def test_that__CompactStatementLine__supports_missing_parts():
+    statement = CompactStatementLine(" ; comment", -1, -1, -1, -1, -1, -1, 3, 10)
+    assert statement.label == ""
+    assert statement.mnemonic == ""
+    assert statement.operands == ""
+    assert statement.comment == "comment"
+    assert statement.isCommentOnly()
+    assert statement.isNoOperation()
+
+
+def test_that__CompactStatementLine__interns_mnemonics():
+    parser = StatementLinePatternParser(compact=True)
+    first = parser.parse(" move.l d0,d1")
+    second = parser.parse(" " + "move.l d2,d3")
+    assert first.mnemonic is second.mnemonic
+
+
+def test_that__CompactStatementLine__answers_queries_like_StatementLine():
+    rnd = random.Random(68000)
+    alphabet = [" ", "\t", ";", "*", ":", '"', ",", "a", "b"]
+    parser = StatementLinePatternParser()
+    compactParser = StatementLinePatternParser(compact=True)
+    for _ in range(2000):
+        line = "".join(rnd.choice(alphabet) for _ in range(rnd.randint(0, 16)))
+        expected = parser.parse(line)
+        actual = compactParser.parse(line)
+        assert actual.parts == expected.parts
+        for query in QUERIES:
+            assert getattr(actual, query)() == getattr(expected, query)(), line
+
+
+def test_that__StatementLineRenderer_render__supports_CompactStatementLine():
+    line = "that's all folks end of line"
+    expected = StatementLinePatternParser().parse(line)
+    actual = StatementLinePatternParser(compact=True).parse(line)
+    for stylesheet in [SPORNIKET, HERITAGE]:
+        assert StatementLineRenderer().render(
+            actual, stylesheet
+        ) == StatementLineRenderer().render(expected, stylesheet)
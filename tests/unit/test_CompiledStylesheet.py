@@ -0,0 +1,71 @@
+"""
+---
+(c) 2024 David SPORN
+---
+This is part of SPASM -- Sporniket's toolbox for assembly language.
+
+SPASM is free software: you can redistribute it and/or
+modify it under the terms of the GNU General Public License as published by the
+Free Software Foundation, either version 3 of the License, or (at your option)
+any later version.
+
+SPASM is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY
+or FITNESS FOR A PARTICULAR PURPOSE.
+
+See the GNU General Public License for more details.
+You should have received a copy of the GNU General Public License along with SPASM.
+If not, see <https://www.gnu.org/licenses/>. 
+---
+"""
+
+from spasm.pp.processor import SourceProcessor
+from spasm.pp.statement_line import StatementLine, StatementLineRenderer
+from spasm.pp.stylesheet.builtin import SPORNIKET, HERITAGE
+from spasm.pp.stylesheet.compiled import CompiledStylesheet, compile_stylesheet
+
+
+def test_that__CompiledStylesheet__derives_values_from_the_stylesheet():
+    plan = CompiledStylesheet(SPORNIKET)
+    assert plan.tabStopOfLabels == 30
+    assert plan.tabStopOfMnemonic == 30
+    assert plan.tabStopOfOperands == 50
+    assert not plan.isLeftAlign
+    assert plan.paddingOfLabels == " " * 30
+    assert plan.lenOfShortLabel == 28
+    assert plan.ignoreAlignMnemonics == frozenset(["macro", "macro.w", "macro.l"])
+    assert plan.prefixOfCommentLines == "* "
+    assert plan.prefixOfSpecialCommentLines == "** "
+    assert plan.tabAsSpaces == "    "
+
+
+def test_that__CompiledStylesheet__supports_missing_list_of_mnemonics():
+    assert CompiledStylesheet(HERITAGE).ignoreAlignMnemonics == frozenset()
+
+
+def test_that__compile_stylesheet__compiles_once():
+    plan = compile_stylesheet(HERITAGE)
+    assert compile_stylesheet(HERITAGE) is plan
+    assert compile_stylesheet(plan) is plan
+    assert compile_stylesheet(SPORNIKET) is not plan
+
+
+def test_that__StatementLineRenderer_render__gives_same_results_with_compiled_stylesheet():
+    statement = StatementLine()
+    statement.label = "that's"
+    statement.mnemonic = "all"
+    statement.operands = "folks"
+    statement.comment = "end of line"
+    for stylesheet in [SPORNIKET, HERITAGE]:
+        assert StatementLineRenderer().render(
+            statement, CompiledStylesheet(stylesheet)
+        ) == StatementLineRenderer().render(statement, stylesheet)
+
+
+def test_that__SourceProcessor_process_comment_line__supports_compiled_stylesheet():
+    assert (
+        SourceProcessor().process_comment_line(
+            ";;\ta comment", CompiledStylesheet(SPORNIKET)
+        )
+        == "**  a comment"
+    )
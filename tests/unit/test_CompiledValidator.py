@@ -0,0 +1,110 @@
+"""
+---
+(c) 2024 David SPORN
+---
+This is part of SPASM -- Sporniket's toolbox for assembly language.
+
+SPASM is free software: you can redistribute it and/or
+modify it under the terms of the GNU General Public License as published by the
+Free Software Foundation, either version 3 of the License, or (at your option)
+any later version.
+
+SPASM is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY
+or FITNESS FOR A PARTICULAR PURPOSE.
+
+See the GNU General Public License for more details.
+You should have received a copy of the GNU General Public License along with SPASM.
+If not, see <https://www.gnu.org/licenses/>. 
+---
+"""
+
+import copy
+
+from spasm.pp.stylesheet.builtin import HERITAGE
+from spasm.pp.stylesheet.validation import (
+    SCHEMA_OF_STYLESHEET,
+    VALIDATOR_OF_STYLESHEET,
+    CompiledValidator,
+    Field,
+    compile_schema,
+)
+
+
+def summary_of(events):
+    return [(e.type, e.path, e.message) for e in events]
+
+
+def test_that_CompiledValidator_perform__copies_valid_values_and_reports_entered_structures():
+    stylesheet = {"comment_lines": {"prefix": ";"}, "labels": {"align": "right"}}
+    recipient = copy.deepcopy(HERITAGE)
+    events = VALIDATOR_OF_STYLESHEET.perform(stylesheet, recipient, stylesheet)
+    assert summary_of(events) == [
+        ("ENTER", "<ROOT>.labels", "Going inside labels"),
+        ("ENTER", "<ROOT>.comment_lines", "Going inside comment_lines"),
+    ]
+    assert recipient["comment_lines"]["prefix"] == ";"
+    assert recipient["labels"]["align"] == "right"
+    assert recipient["labels"]["postfix"] == HERITAGE["labels"]["postfix"]
+
+
+def test_that_CompiledValidator_perform__yields_events_lazily():
+    stylesheet = {"tabulation": {"width": 4}}
+    recipient = {}
+    events = VALIDATOR_OF_STYLESHEET.perform(stylesheet, recipient, stylesheet)
+    assert recipient == {}
+    list(events)
+    assert recipient == {"tabulation": {"width": 4}}
+
+
+def test_that_CompiledValidator_perform__reports_all_errors_in_the_order_of_the_schema():
+    stylesheet = {
+        "tab_stops": {"labels": {"position": 10}, "mnemonic": {"position": 5}},
+        "labels": {"force_postfix": "yes", "ignore_align_mnemonics": ["ok", 1]},
+        "comments": {"margin_space": 0},
+    }
+    events = VALIDATOR_OF_STYLESHEET.perform(stylesheet, {}, stylesheet)
+    assert [e for e in summary_of(events) if e[0] == "ERROR"] == [
+        (
+            "ERROR",
+            "<ROOT>.tab_stops.mnemonic.position",
+            "MUST be >= tab_stops.labels.position",
+        ),
+        ("ERROR", "<ROOT>.labels.force_postfix", "MUST be a bool"),
+        ("ERROR", "<ROOT>.labels.ignore_align_mnemonics", "MUST have str items"),
+        ("ERROR", "<ROOT>.comments.margin_space", "MUST be > 0"),
+    ]
+
+
+def test_that_CompiledValidator_perform__stops_after_the_first_error_when_failing_fast():
+    stylesheet = {"tabulation": {"width": 0}, "comments": {"margin_space": 0}}
+    recipient = {}
+    events = VALIDATOR_OF_STYLESHEET.perform(
+        stylesheet, recipient, stylesheet, failFast=True
+    )
+    assert summary_of(events) == [
+        ("ENTER", "<ROOT>.tabulation", "Going inside tabulation"),
+        ("ERROR", "<ROOT>.tabulation.width", "MUST be > 0"),
+    ]
+    assert "comments" not in recipient
+
+
+def test_that_CompiledValidator_perform__rejects_queries_without_context():
+    stylesheet = {"tab_stops": {"mnemonic": {"position": 5}}}
+    events = VALIDATOR_OF_STYLESHEET.perform(stylesheet, {})
+    assert ("ERROR", "<ROOT>.tab_stops.mnemonic.position") in [
+        e[:2] for e in summary_of(events)
+    ]
+
+
+def test_that_CompiledValidator_perform__reports_unsupported_schema():
+    events = CompiledValidator(Field(typeOfValue=int), "<ROOT>").perform({}, {})
+    assert summary_of(events) == [
+        ("ERROR", "<ROOT>", "CANNOT work on given schema of type Field")
+    ]
+
+
+def test_that_compile_schema__remembers_the_latest_compiled_schema():
+    validator = compile_schema(SCHEMA_OF_STYLESHEET, "<ROOT>")
+    assert compile_schema(SCHEMA_OF_STYLESHEET, "<ROOT>") is validator
+    assert compile_schema(SCHEMA_OF_STYLESHEET, "<OTHER>") is not validator
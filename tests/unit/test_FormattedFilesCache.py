@@ -0,0 +1,124 @@
+"""
+---
+(c) 2024 David SPORN
+---
+This is part of SPASM -- Sporniket's toolbox for assembly language.
+
+SPASM is free software: you can redistribute it and/or
+modify it under the terms of the GNU General Public License as published by the
+Free Software Foundation, either version 3 of the License, or (at your option)
+any later version.
+
+SPASM is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY
+or FITNESS FOR A PARTICULAR PURPOSE.
+
+See the GNU General Public License for more details.
+You should have received a copy of the GNU General Public License along with SPASM.
+If not, see <https://www.gnu.org/licenses/>. 
+---
+"""
+
+import json
+import os
+
+from spasm.pp.cache import (
+    FormattedFilesCache,
+    digest_of_text,
+    fingerprint_of,
+)
+from spasm.pp.stylesheet.builtin import HERITAGE, SPORNIKET
+
+CONTENT = "label move.l d0,d1\n"
+ONE_HOUR_AGO = 3600_000_000_000
+
+
+def given_formatted_file(tmp_path, name="source.s", content=CONTENT) -> str:
+    path = str(tmp_path / name)
+    with open(path, "wt") as f:
+        f.write(content)
+    # old enough to not be racy
+    mtime = os.stat(path).st_mtime_ns - ONE_HOUR_AGO
+    os.utime(path, ns=(mtime, mtime))
+    return path
+
+
+def remember(cache: FormattedFilesCache, path: str, content=CONTENT):
+    cache.remember(path, fingerprint_of(os.stat(path), digest_of_text(content)))
+
+
+def test_that__FormattedFilesCache_isFormatted__recognizes_remembered_files_after_saving(
+    tmp_path,
+):
+    source = given_formatted_file(tmp_path)
+    cachePath = str(tmp_path / "cache" / "formatted.json")
+    cache = FormattedFilesCache(cachePath, HERITAGE, version="1")
+    assert not cache.isFormatted(source)
+    remember(cache, source)
+    cache.save()
+
+    assert FormattedFilesCache(cachePath, HERITAGE, version="1").isFormatted(source)
+    assert not FormattedFilesCache(cachePath, SPORNIKET, version="1").isFormatted(
+        source
+    )
+    assert not FormattedFilesCache(cachePath, HERITAGE, version="2").isFormatted(source)
+
+
+def test_that__FormattedFilesCache_isFormatted__verifies_the_content_when_the_mtime_changed(
+    tmp_path,
+):
+    source = given_formatted_file(tmp_path)
+    cache = FormattedFilesCache(str(tmp_path / "formatted.json"), HERITAGE)
+    remember(cache, source)
+
+    os.utime(source)
+    assert cache.isFormatted(source)
+
+    with open(source, "wt") as f:
+        f.write(CONTENT.replace("d1", "d2"))
+    assert not cache.isFormatted(source)
+
+
+def test_that__FormattedFilesCache_isFormatted__verifies_the_content_of_racy_entries(
+    tmp_path,
+):
+    source = given_formatted_file(tmp_path)
+    cache = FormattedFilesCache(str(tmp_path / "formatted.json"), HERITAGE)
+    remember(cache, source)
+    stat = os.stat(source)
+
+    # modified right after being remembered, same size and same mtime
+    with open(source, "wt") as f:
+        f.write(CONTENT.replace("d1", "d2"))
+    os.utime(source, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    cache._entries[os.path.abspath(source)]["checked"] = stat.st_mtime_ns
+    assert not cache.isFormatted(source)
+
+
+def test_that__FormattedFilesCache_save__merges_the_entries_of_concurrent_runs(
+    tmp_path,
+):
+    sources = [given_formatted_file(tmp_path, f"source{i}.s") for i in range(2)]
+    cachePath = str(tmp_path / "formatted.json")
+    caches = [FormattedFilesCache(cachePath, HERITAGE) for _ in sources]
+    for cache, source in zip(caches, sources):
+        remember(cache, source)
+    for cache in caches:
+        cache.save()
+
+    with open(cachePath, "rt") as f:
+        entries = json.load(f)["entries"]
+    assert sorted(entries.keys()) == sorted(os.path.abspath(s) for s in sources)
+    assert [f for f in os.listdir(tmp_path) if f.endswith(".tmp")] == []
+
+
+def test_that__FormattedFilesCache__ignores_an_unreadable_cache_file(tmp_path):
+    source = given_formatted_file(tmp_path)
+    cachePath = str(tmp_path / "formatted.json")
+    with open(cachePath, "wt") as f:
+        f.write("{ not json")
+    cache = FormattedFilesCache(cachePath, HERITAGE)
+    assert not cache.isFormatted(source)
+    remember(cache, source)
+    cache.save()
+    assert FormattedFilesCache(cachePath, HERITAGE).isFormatted(source)
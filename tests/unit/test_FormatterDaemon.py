@@ -0,0 +1,111 @@
+"""
+---
+(c) 2024 David SPORN
+---
+This is part of SPASM -- Sporniket's toolbox for assembly language.
+
+SPASM is free software: you can redistribute it and/or
+modify it under the terms of the GNU General Public License as published by the
+Free Software Foundation, either version 3 of the License, or (at your option)
+any later version.
+
+SPASM is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY
+or FITNESS FOR A PARTICULAR PURPOSE.
+
+See the GNU General Public License for more details.
+You should have received a copy of the GNU General Public License along with SPASM.
+If not, see <https://www.gnu.org/licenses/>. 
+---
+"""
+
+import io
+import os
+import shutil
+
+from spasm.pp import PrettyPrinterCli
+from spasm.pp.daemon import FormatterDaemon, StylesheetRegistry
+from spasm.pp.processor import SourceProcessor
+from spasm.pp.stylesheet.builtin import HERITAGE
+
+SOURCE_DATA_FILES = os.path.join(".", "tests", "data")
+SOURCE = "label move.l d0,d1 ; comment\n rts\n"
+
+
+def given_daemon() -> FormatterDaemon:
+    cli = PrettyPrinterCli()
+    return FormatterDaemon("unused.sock", cli.retrieveStyleSheet, cli.retrieveLineRange)
+
+
+def test_that__FormatterDaemon_handle__formats_the_source_like_the_standard_input_mode():
+    daemon = given_daemon()
+    assert daemon.handle({"source": SOURCE}) == {
+        "output": "label           move.l  d0,d1   ; comment\n                rts\n"
+    }
+    assert daemon.handle({"source": SOURCE, "lines": "2-2"}) == {
+        "output": "label move.l d0,d1 ; comment\n                rts\n"
+    }
+    assert daemon.handle(
+        {
+            "source": SOURCE,
+            "stylesheet": f"file:{os.path.join(SOURCE_DATA_FILES, 'comment-prefix.json')}",
+        }
+    ) == {"output": "label           move.l  d0,d1   * comment\n                rts\n"}
+
+
+def test_that__FormatterDaemon_handle__reports_errors():
+    daemon = given_daemon()
+    assert daemon.handle({"lines": "1-2"}) == {
+        "error": "ERROR -- wrong request, 'source' is required"
+    }
+    assert daemon.handle({"source": SOURCE, "stylesheet": "builtin:nope"}) == {
+        "error": "ERROR -- wrong value 'builtin:nope' for parameter 'stylesheet'"
+    }
+    assert daemon.handle({"source": SOURCE, "lines": "2"}) == {
+        "error": "ERROR -- wrong value '2' for parameter 'lines'"
+    }
+
+
+def test_that__FormatterDaemon_handle__splits_the_source_like_the_standard_input_mode():
+    source = "lab\x0c move.l d0,d1 ; c\x1c\n rts\u2028 ; x\n"
+    processor = SourceProcessor()
+    expected = "".join(
+        processor.process_line(line, HERITAGE) + "\n"
+        for line in io.StringIO(source, newline=None)
+    )
+    assert expected.count("\n") == 2
+    assert given_daemon().handle({"source": source}) == {"output": expected}
+
+
+def test_that__FormatterDaemon_handle__reports_malformed_requests():
+    daemon = given_daemon()
+    assert daemon.handle({"source": SOURCE, "lines": 5}) == {
+        "error": "ERROR -- wrong request, 'lines' must be a string"
+    }
+    assert daemon.handle({"source": SOURCE, "stylesheet": ["builtin:heritage"]}) == {
+        "error": "ERROR -- wrong request, 'stylesheet' must be a string"
+    }
+    assert daemon.handle({"source": SOURCE, "stylesheet": None, "lines": None}) == {
+        "output": "label           move.l  d0,d1   ; comment\n                rts\n"
+    }
+
+
+def test_that__StylesheetRegistry_get__reloads_a_file_stylesheet_when_it_changes(
+    tmp_path,
+):
+    stylesheetFile = str(tmp_path / "stylesheet.json")
+    shutil.copy(os.path.join(SOURCE_DATA_FILES, "comment-prefix.json"), stylesheetFile)
+    registry = StylesheetRegistry(PrettyPrinterCli().retrieveStyleSheet)
+    spec = f"file:{stylesheetFile}"
+
+    first = registry.get(spec)
+    assert registry.get(spec) is first
+    assert registry.get("builtin:sporniket") is registry.get("builtin:sporniket")
+
+    shutil.copy(os.path.join(SOURCE_DATA_FILES, "margin-comment.json"), stylesheetFile)
+    stat = os.stat(stylesheetFile)
+    os.utime(stylesheetFile, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    second = registry.get(spec)
+    assert second is not first
+    assert second.prefixOfComments == ";"
+    assert second.marginOfComments == 5
@@ -0,0 +1,111 @@
+"""
+---
+(c) 2024 David SPORN
+---
+This is part of SPASM -- Sporniket's toolbox for assembly language.
+
+SPASM is free software: you can redistribute it and/or
+modify it under the terms of the GNU General Public License as published by the
+Free Software Foundation, either version 3 of the License, or (at your option)
+any later version.
+
+SPASM is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY
+or FITNESS FOR A PARTICULAR PURPOSE.
+
+See the GNU General Public License for more details.
+You should have received a copy of the GNU General Public License along with SPASM.
+If not, see <https://www.gnu.org/licenses/>. 
+---
+"""
+
+import copy
+import json
+import pickle
+
+import pytest
+
+from spasm.pp.stylesheet.builtin import HERITAGE, SPORNIKET
+from spasm.pp.stylesheet.compiled import compile_stylesheet
+from spasm.pp.stylesheet.frozen import FrozenStylesheet, freeze
+from spasm.pp.stylesheet.loader import StylesheetLoader
+
+
+def test_that_FrozenStylesheet_gives_values_as_items_and_as_attributes():
+    stylesheet = freeze(SPORNIKET)
+    assert stylesheet["labels"]["align"] == "right"
+    assert stylesheet.labels.align == "right"
+    assert stylesheet.tab_stops.operands.position == 50
+    assert stylesheet.labels.ignore_align_mnemonics == ("macro", "macro.w", "macro.l")
+    with pytest.raises(AttributeError):
+        stylesheet.whatever
+
+
+def test_that_FrozenStylesheet_is_immutable():
+    stylesheet = freeze(HERITAGE)
+    with pytest.raises(TypeError):
+        stylesheet["labels"] = {}
+    with pytest.raises(AttributeError):
+        stylesheet.labels = {}
+    assert copy.deepcopy(stylesheet) is stylesheet
+
+
+def test_that_FrozenStylesheet_keeps_only_the_overrides_of_its_base():
+    base = freeze(HERITAGE)
+    stylesheet = FrozenStylesheet(
+        {"labels": {"align": "right"}, "comments": {}}, base=base
+    )
+    assert stylesheet._values.keys() == {"labels"}
+    assert stylesheet.labels._values == {"align": "right"}
+    assert stylesheet.labels.postfix == ":"
+    assert stylesheet.comments is base.comments
+    assert list(stylesheet) == list(HERITAGE)
+
+
+def test_that_FrozenStylesheet_is_equal_and_hashed_by_value():
+    base = freeze(HERITAGE)
+    overlay = FrozenStylesheet({"tabulation": {"width": 8}}, base=base)
+    flat = FrozenStylesheet(copy.deepcopy(HERITAGE))
+    assert overlay == flat == base == HERITAGE
+    assert hash(overlay) == hash(flat) == hash(base)
+    other = FrozenStylesheet({"tabulation": {"width": 4}}, base=base)
+    assert other != base
+    assert len({overlay, flat, base, other}) == 2
+
+
+def test_that_FrozenStylesheet_toDict_gives_the_validated_stylesheet():
+    stylesheet = FrozenStylesheet(
+        {"labels": {"force_postfix": True}}, freeze(SPORNIKET)
+    )
+    assert stylesheet.toDict() == SPORNIKET
+    assert json.dumps(stylesheet.toDict()) == json.dumps(SPORNIKET)
+
+
+def test_that_FrozenStylesheet_can_be_pickled():
+    stylesheet = FrozenStylesheet({"labels": {"align": "left"}}, freeze(SPORNIKET))
+    restored = pickle.loads(pickle.dumps(stylesheet))
+    assert restored == stylesheet
+    assert restored.labels._values == {"align": "left"}
+
+
+def test_that_freeze_remembers_the_frozen_stylesheets():
+    assert freeze(HERITAGE) is freeze(HERITAGE)
+    assert freeze(freeze(HERITAGE)) is freeze(HERITAGE)
+
+
+def test_that_StylesheetLoader_gives_an_overlay_of_the_reference(tmp_path):
+    pathOfStylesheet = tmp_path / "stylesheet.json"
+    pathOfStylesheet.write_text('{"comments":{"prefix":"*"}}')
+    stylesheet = StylesheetLoader(str(pathOfStylesheet)).perform()
+    assert stylesheet._values.keys() == {"comments"}
+    assert stylesheet.comments.prefix == "*"
+    assert stylesheet.labels is freeze(HERITAGE).labels
+
+
+def test_that_compile_stylesheet_shares_the_plan_of_equal_frozen_stylesheets(tmp_path):
+    pathOfStylesheet = tmp_path / "stylesheet.json"
+    pathOfStylesheet.write_text('{"tabulation":{"width":4}}')
+    first = StylesheetLoader(str(pathOfStylesheet)).perform()
+    second = StylesheetLoader(str(pathOfStylesheet)).perform()
+    assert first is not second
+    assert compile_stylesheet(first) is compile_stylesheet(second)
@@ -0,0 +1,120 @@
+"""
+---
+(c) 2024 David SPORN
+---
+This is part of SPASM -- Sporniket's toolbox for assembly language.
+
+SPASM is free software: you can redistribute it and/or
+modify it under the terms of the GNU General Public License as published by the
+Free Software Foundation, either version 3 of the License, or (at your option)
+any later version.
+
+SPASM is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY
+or FITNESS FOR A PARTICULAR PURPOSE.
+
+See the GNU General Public License for more details.
+You should have received a copy of the GNU General Public License along with SPASM.
+If not, see <https://www.gnu.org/licenses/>. 
+---
+"""
+
+from spasm.pp.batch import MODE__FORMAT, SourceFileFormatter, _create_processor
+from spasm.pp.processor import SourceProcessor
+from spasm.pp.stats import (
+    InstrumentedSourceProcessor,
+    PHASE__FILES,
+    PHASE__PARSE,
+    PHASE__RENDER,
+    ProcessingStats,
+)
+from spasm.pp.stylesheet.builtin import HERITAGE
+
+SOURCE = [
+    "label move.l d0,d1 ; commented operation\n",
+    " ; comment continuation\n",
+    "\n",
+    "* comment line\t with\ttabs\n",
+    " rts  \n",
+]
+
+
+def test_that__InstrumentedSourceProcessor__processes_lines_like_SourceProcessor_and_counts_them():
+    stats = ProcessingStats()
+    processor = InstrumentedSourceProcessor(stats)
+    expected = SourceProcessor()
+
+    assert [processor.process_line(line, HERITAGE) for line in SOURCE] == [
+        expected.process_line(line, HERITAGE) for line in SOURCE
+    ]
+    assert stats.lines == {"statement": 3, "comment": 1, "blank": 1}
+    assert stats.durations[PHASE__PARSE] > 0
+    assert stats.durations[PHASE__RENDER] > 0
+
+
+def test_that_processing_without_stats_is_not_instrumented():
+    assert type(_create_processor("state-machine", "slicing")) is SourceProcessor
+    assert isinstance(
+        _create_processor("state-machine", "slicing", ProcessingStats()),
+        InstrumentedSourceProcessor,
+    )
+
+
+def test_that__ProcessingStats_pop__moves_the_stats_collected_so_far():
+    stats = ProcessingStats()
+    processor = InstrumentedSourceProcessor(stats)
+    for line in SOURCE:
+        processor.process_line(line, HERITAGE)
+    stats.recordFile("a.s", 2.0)
+
+    popped = stats.pop()
+    assert popped.lines == {"statement": 3, "comment": 1, "blank": 1}
+    assert popped.slowestFiles == [(2.0, "a.s")]
+    assert stats.countOfLines == 0
+    assert stats.durations[PHASE__PARSE] == 0
+
+    # the instrumented processor still records into the cleared stats
+    processor.process_line(SOURCE[0], HERITAGE)
+    assert stats.lines["statement"] == 1
+    assert stats.durations[PHASE__PARSE] > 0
+
+
+def test_that__ProcessingStats_merge__adds_the_stats_and_keeps_the_slowest_files():
+    stats = ProcessingStats()
+    for i in range(4):
+        stats.recordFile(f"main{i}.s", float(i))
+    other = ProcessingStats()
+    for i in range(4):
+        other.recordFile(f"worker{i}.s", i + 0.5)
+    other.lines["blank"] = 3
+    other.bytesIn = 10
+
+    stats.merge(other)
+    assert stats.durations[PHASE__FILES] == 0 + 1 + 2 + 3 + 0.5 + 1.5 + 2.5 + 3.5
+    assert stats.lines["blank"] == 3
+    assert stats.bytesIn == 10
+    assert [f["path"] for f in stats.toDict()["slowestFiles"]] == [
+        "worker3.s",
+        "main3.s",
+        "worker2.s",
+        "main2.s",
+        "worker1.s",
+    ]
+
+
+def test_that__ProcessingStats_performOn__measures_a_lazy_output_once_consumed(
+    tmp_path,
+):
+    source = tmp_path / "source.s"
+    source.write_text("".join(SOURCE))
+    stats = ProcessingStats()
+    formatter = SourceFileFormatter(InstrumentedSourceProcessor(stats), HERITAGE)
+
+    result = stats.performOn(formatter, str(source), MODE__FORMAT, lazy=True)
+    assert stats.slowestFiles == []
+    assert stats.bytesIn == len("".join(SOURCE))
+
+    lines = list(result["output"])
+    assert len(lines) == len(SOURCE) + 1
+    assert [path for _, path in stats.slowestFiles] == [str(source)]
+    assert stats.countOfLines == len(SOURCE)
@@ -0,0 +1,170 @@
+"""
+---
+(c) 2024 David SPORN
+---
+This is part of SPASM -- Sporniket's toolbox for assembly language.
+
+SPASM is free software: you can redistribute it and/or
+modify it under the terms of the GNU General Public License as published by the
+Free Software Foundation, either version 3 of the License, or (at your option)
+any later version.
+
+SPASM is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY
+or FITNESS FOR A PARTICULAR PURPOSE.
+
+See the GNU General Public License for more details.
+You should have received a copy of the GNU General Public License along with SPASM.
+If not, see <https://www.gnu.org/licenses/>. 
+---
+"""
+
+from spasm.pp.batch import MODE__FORMAT, SourceFileFormatter
+from spasm.pp.observers import ProcessingObserver
+from spasm.pp.processor import SourceProcessor
+from spasm.pp.statement_line.table import parse_many
+from spasm.pp.stylesheet.builtin import HERITAGE
+
+SOURCE = [
+    "label move.l d0,d1 ; commented operation\n",
+    " ; comment continuation\n",
+    "\n",
+    " rts  \n",
+    " ; loose comment\n",
+    "done rts ; finished\n",
+    " ; end of comment\n",
+]
+
+
+def test_that__SourceProcessor_process_line_range__processes_only_the_given_range_as_the_whole_source():
+    processor = SourceProcessor()
+    expected = [processor.process_line(line, HERITAGE) for line in SOURCE]
+
+    for start in range(len(SOURCE)):
+        for stop in range(start, len(SOURCE) + 1):
+            actual = list(
+                SourceProcessor().process_line_range(
+                    iter(SOURCE), range(start, stop), HERITAGE
+                )
+            )
+            assert actual == [
+                expected[i] if start <= i < stop else line[:-1]
+                for i, line in enumerate(SOURCE)
+            ]
+
+
+def test_that__SourceProcessor_resume__scans_backwards_to_the_nearest_line_setting_the_state():
+    processor = SourceProcessor()
+    processor.resume(SOURCE[:2])
+    commentBlock = processor.process_line(SOURCE[1], HERITAGE)
+    processor.resume(SOURCE[:4])
+    looseComment = processor.process_line(SOURCE[1], HERITAGE)
+    assert commentBlock != looseComment
+
+    processor.resume([])
+    assert processor.process_line(SOURCE[1], HERITAGE) == looseComment
+
+
+def test_that__SourceProcessor_is_comment_block_allowed_after__tells_how_a_line_sets_the_state():
+    processor = SourceProcessor()
+    assert [processor.is_comment_block_allowed_after(line) for line in SOURCE] == [
+        False,
+        None,
+        True,
+        True,
+        None,
+        False,
+        None,
+    ]
+
+
+class RecordingObserver(ProcessingObserver):
+    def __init__(self):
+        self.events = []
+
+    def on_file_start(self, path):
+        self.events.append(("start", path))
+
+    def on_lines_parsed(self, statementLines):
+        self.events.append(("parsed", [i for i, _ in statementLines]))
+
+    def on_lines_rendered(self, lines):
+        self.events.append(("rendered", lines))
+
+    def on_file_end(self, path):
+        self.events.append(("end", path))
+
+
+def test_that__SourceProcessor_add_observer__sends_the_events_by_batches():
+    plainProcessor = SourceProcessor()
+    expected = [plainProcessor.process_line(line, HERITAGE) for line in SOURCE]
+    processor = SourceProcessor(sizeOfBatchOfEvents=3)
+    observer = RecordingObserver()
+    processor.add_observer(observer)
+
+    processor.start_file("a.s")
+    assert [processor.process_line(line, HERITAGE) for line in SOURCE] == expected
+    processor.end_file("a.s")
+    rendered = list(enumerate(expected))
+    assert observer.events == [
+        ("start", "a.s"),
+        ("parsed", [0, 1]),
+        ("rendered", rendered[0:3]),
+        ("parsed", [3, 4, 5]),
+        ("rendered", rendered[3:6]),
+        ("parsed", [6]),
+        ("rendered", rendered[6:]),
+        ("end", "a.s"),
+    ]
+
+
+def test_that__SourceProcessor_process_table__sends_the_same_events_as_process_line():
+    byLine = RecordingObserver()
+    processor = SourceProcessor()
+    processor.add_observer(byLine)
+    for line in SOURCE:
+        processor.process_line(line, HERITAGE)
+    processor.flush_observers()
+
+    byTable = RecordingObserver()
+    processor = SourceProcessor()
+    processor.add_observer(byTable)
+    list(processor.process_table(parse_many(SOURCE), HERITAGE))
+    processor.flush_observers()
+
+    assert byTable.events == byLine.events
+
+
+def test_that__SourceProcessor__is_not_instrumented_without_observers():
+    processor = SourceProcessor()
+    parser = processor._parser
+    observer = RecordingObserver()
+
+    processor.add_observer(observer)
+    assert processor.has_observers()
+    rendered = processor.process_line(SOURCE[0], HERITAGE)
+    processor.remove_observer(observer)
+
+    assert observer.events == [("parsed", [0]), ("rendered", [(0, rendered)])]
+    assert not processor.has_observers()
+    assert "process_line" not in vars(processor)
+    assert "process_table" not in vars(processor)
+    assert processor._parser is parser
+
+
+def test_that__SourceFileFormatter_perform__ends_a_lazy_file_once_consumed(tmp_path):
+    source = tmp_path / "source.s"
+    source.write_text("".join(SOURCE))
+    processor = SourceProcessor()
+    observer = RecordingObserver()
+    processor.add_observer(observer)
+
+    result = SourceFileFormatter(processor, HERITAGE).perform(
+        str(source), MODE__FORMAT, lazy=True
+    )
+    assert observer.events == [("start", str(source))]
+    list(result["output"])
+    assert observer.events[-1] == ("end", str(source))
+    assert [
+        i for kind, indexes in observer.events if kind == "parsed" for i in indexes
+    ] == [0, 1, 3, 4, 5, 6]
@@ -0,0 +1,107 @@
+"""
+---
+(c) 2024 David SPORN
+---
+This is part of SPASM -- Sporniket's toolbox for assembly language.
+
+SPASM is free software: you can redistribute it and/or
+modify it under the terms of the GNU General Public License as published by the
+Free Software Foundation, either version 3 of the License, or (at your option)
+any later version.
+
+SPASM is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY
+or FITNESS FOR A PARTICULAR PURPOSE.
+
+See the GNU General Public License for more details.
+You should have received a copy of the GNU General Public License along with SPASM.
+If not, see <https://www.gnu.org/licenses/>. 
+---
+"""
+
+import os
+import shutil
+
+from unittest.mock import patch
+
+from spasm.pp.batch import SourceFileFormatter
+from spasm.pp.processor import SourceProcessor
+from spasm.pp.stylesheet.builtin import HERITAGE
+from spasm.pp.watch import SourceWatcher
+
+SOURCE_DATA_FILES = os.path.join(".", "tests", "data")
+UNFORMATTED = "label move.l d0,d1\n"
+FORMATTED = "label           move.l  d0,d1\n"
+
+
+def given_watcher(paths):
+    reported = []
+    watcher = SourceWatcher(
+        paths, SourceFileFormatter(SourceProcessor(), HERITAGE), reported.append
+    )
+    return watcher, reported
+
+
+def write(path: str, content: str, mtimeOffset: int = 0):
+    with open(path, "wt") as f:
+        f.write(content)
+    # the mtime of successive writes may be the same
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + mtimeOffset))
+
+
+def read(path: str) -> str:
+    with open(path, "rt") as f:
+        return f.read()
+
+
+def test_that__SourceWatcher_findSources__finds_source_files_recursively(tmp_path):
+    os.makedirs(tmp_path / "sub")
+    for f in ["b.s", "a.s", "notes.txt", os.path.join("sub", "c.s")]:
+        write(str(tmp_path / f), "")
+    watcher, _ = given_watcher([str(tmp_path), str(tmp_path / "notes.txt")])
+    assert watcher.findSources() == [
+        str(tmp_path / "a.s"),
+        str(tmp_path / "b.s"),
+        str(tmp_path / "sub" / "c.s"),
+        str(tmp_path / "notes.txt"),
+    ]
+
+
+def test_that__SourceWatcher_poll__rewrites_modified_files_once_they_settle(tmp_path):
+    source = str(tmp_path / "source.s")
+    write(source, UNFORMATTED)
+    watcher, reported = given_watcher([str(tmp_path)])
+
+    watcher.poll()
+    assert read(source) == FORMATTED
+    assert [r["rewritten"] for r in reported] == [True]
+
+    write(source, UNFORMATTED + UNFORMATTED, 1_000_000_000)
+    watcher.poll()
+    assert read(source) == UNFORMATTED + UNFORMATTED
+    write(source, UNFORMATTED, 2_000_000_000)
+    watcher.poll()
+    assert read(source) == UNFORMATTED
+    watcher.poll()
+    assert read(source) == FORMATTED
+    assert [r["rewritten"] for r in reported] == [True, True]
+
+
+def test_that__SourceWatcher_poll__does_not_parse_again_unchanged_content(tmp_path):
+    source = str(tmp_path / "source.s")
+    write(source, FORMATTED)
+    watcher, reported = given_watcher([source])
+    watcher.poll()
+    assert [r["rewritten"] for r in reported] == [False]
+
+    with patch.object(
+        SourceFileFormatter, "perform", side_effect=AssertionError
+    ) as perform:
+        # untouched, then touched
+        watcher.poll()
+        write(source, FORMATTED, 1_000_000_000)
+        watcher.poll()
+        watcher.poll()
+        assert not perform.called
+    assert len(reported) == 1
@@ -0,0 +1,93 @@
+"""
+---
+(c) 2024 David SPORN
+---
+This is part of SPASM -- Sporniket's toolbox for assembly language.
+
+SPASM is free software: you can redistribute it and/or
+modify it under the terms of the GNU General Public License as published by the
+Free Software Foundation, either version 3 of the License, or (at your option)
+any later version.
+
+SPASM is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY
+or FITNESS FOR A PARTICULAR PURPOSE.
+
+See the GNU General Public License for more details.
+You should have received a copy of the GNU General Public License along with SPASM.
+If not, see <https://www.gnu.org/licenses/>. 
+---
+"""
+
+import random
+
+from spasm.pp.statement_line import (
+    StatementLine,
+    StatementLineColumnRenderer,
+    StatementLineRenderer,
+)
+from spasm.pp.stylesheet.builtin import SPORNIKET, HERITAGE
+
+
+def assert_that_both_engines_agree(statement, stylesheet, commentBlockEnabled=True):
+    expected = StatementLineRenderer()
+    actual = StatementLineColumnRenderer()
+    if not commentBlockEnabled:
+        expected.denyCommentBlock()
+        actual.denyCommentBlock()
+    assert actual.render(statement, stylesheet) == expected.render(
+        statement, stylesheet
+    ), repr(
+        (statement.label, statement.mnemonic, statement.operands, statement.comment)
+    )
+
+
+def test_that__StatementLineColumnRenderer_render__works():
+    statement = StatementLine()
+    statement.label = "that's"
+    statement.mnemonic = "all"
+    statement.operands = "folks"
+    statement.comment = "end of line"
+    assert (
+        StatementLineColumnRenderer().render(statement, SPORNIKET)
+        == "                      that's: all folks           ; end of line"
+    )
+    assert (
+        StatementLineColumnRenderer().render(statement, HERITAGE)
+        == "that's          all     folks   ; end of line"
+    )
+
+
+def test_that__StatementLineColumnRenderer_render__supports_comment_only_statement():
+    statement = StatementLine()
+    statement.comment = "just a comment"
+    renderer = StatementLineColumnRenderer()
+    assert (
+        renderer.render(statement, SPORNIKET)
+        == "                              ; just a comment"
+    )
+    renderer.denyCommentBlock()
+    assert (
+        renderer.render(statement, SPORNIKET)
+        == "                                                  ; just a comment"
+    )
+
+
+def test_that__StatementLineColumnRenderer_render__gives_same_results_as_StatementLineRenderer():
+    rnd = random.Random(68000)
+    alphabet = ["a", "bb", "macro", "move.l", "x" * 20, ":", '"', ";", "\xa0"]
+
+    def randomPart():
+        if rnd.random() < 0.3:
+            return None
+        return "".join(rnd.choice(alphabet) for _ in range(rnd.randint(0, 4)))
+
+    for _ in range(5000):
+        statement = StatementLine()
+        statement.label = randomPart()
+        statement.mnemonic = randomPart()
+        statement.operands = randomPart()
+        statement.comment = randomPart()
+        for stylesheet in [SPORNIKET, HERITAGE]:
+            assert_that_both_engines_agree(statement, stylesheet)
+            assert_that_both_engines_agree(statement, stylesheet, False)
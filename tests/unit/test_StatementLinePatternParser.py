@@ -0,0 +1,100 @@
+"""
+---
+(c) 2024 David SPORN
+---
+This is part of SPASM -- Sporniket's toolbox for assembly language.
+
+SPASM is free software: you can redistribute it and/or
+modify it under the terms of the GNU General Public License as published by the
+Free Software Foundation, either version 3 of the License, or (at your option)
+any later version.
+
+SPASM is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY
+or FITNESS FOR A PARTICULAR PURPOSE.
+
+See the GNU General Public License for more details.
+You should have received a copy of the GNU General Public License along with SPASM.
+If not, see <https://www.gnu.org/licenses/>. 
+---
+"""
+
+import random
+
+from spasm.pp.statement_line import StatementLineParser, StatementLinePatternParser
+
+
+def assert_that_both_engines_agree(line: str):
+    expected = StatementLineParser().parse(line)
+    actual = StatementLinePatternParser().parse(line)
+    assert (actual.label, actual.mnemonic, actual.operands, actual.comment) == (
+        expected.label,
+        expected.mnemonic,
+        expected.operands,
+        expected.comment,
+    ), f"line : {repr(line)}"
+
+
+def test_that__StatementLinePatternParser_parse__captures_all_the_parts():
+    statement = StatementLinePatternParser().parse(
+        "aShortLabel operation operand1,operand2 comment"
+    )
+    assert statement.label == "aShortLabel"
+    assert statement.mnemonic == "operation"
+    assert statement.operands == "operand1,operand2"
+    assert statement.comment == "comment"
+
+
+def test_that__StatementLinePatternParser_parse__supports_label_with_marker():
+    statement = StatementLinePatternParser().parse(" aLabelWithColon: operation")
+    assert statement.label == "aLabelWithColon"
+    assert statement.mnemonic == "operation"
+    assert statement.operands == ""
+    assert statement.comment == ""
+
+
+def test_that__StatementLinePatternParser_parse__supports_comment_only_statement():
+    statement = StatementLinePatternParser().parse(" ; just a semi-colon comment")
+    assert statement.label == ""
+    assert statement.mnemonic == ""
+    assert statement.operands == ""
+    assert statement.comment == "just a semi-colon comment"
+
+
+def test_that__StatementLinePatternParser_parse__keeps_comment_markers_in_string_operands():
+    statement = StatementLinePatternParser().parse(
+        'message dc.b "Done; press * to quit",0 ; the message'
+    )
+    assert statement.label == "message"
+    assert statement.mnemonic == "dc.b"
+    assert statement.operands == '"Done; press * to quit",0'
+    assert statement.comment == "the message"
+
+
+def test_that__StatementLinePatternParser_parse__gives_same_results_as_StatementLineParser():
+    for line in [
+        "",
+        "   ",
+        "aShortLabel operation operand1,operand2 comment",
+        "aVeryLongLabelThatWontFitInTheFirstThirtyCharacters: what ever",
+        " aLabelWithoutFinalColon operation op1,op2 comment",
+        "aSpaceWithinOperand: operation op1, op2 comment",
+        " operation comment missing semi-colon",
+        " do other,thing x",
+        " ;just a comment",
+        'messThatsAll            dc.b                    "Done, press any key to quit.",0',
+        "message dc.b 'single quoted; string',0 ; comment",
+        'message dc.b 0,"mid-operands string",0',
+        "  ::label",
+        "label::mnemonic",
+    ]:
+        assert_that_both_engines_agree(line)
+
+
+def test_that__StatementLinePatternParser_parse__gives_same_results_as_StatementLineParser_on_random_lines():
+    rnd = random.Random(68000)
+    alphabet = [" ", "\t", ";", "*", ":", '"', "'", ",", "a", "b"]
+    for _ in range(5000):
+        assert_that_both_engines_agree(
+            "".join(rnd.choice(alphabet) for _ in range(rnd.randint(0, 16)))
+        )
@@ -0,0 +1,85 @@
+"""
+---
+(c) 2024 David SPORN
+---
+This is part of SPASM -- Sporniket's toolbox for assembly language.
+
+SPASM is free software: you can redistribute it and/or
+modify it under the terms of the GNU General Public License as published by the
+Free Software Foundation, either version 3 of the License, or (at your option)
+any later version.
+
+SPASM is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY
+or FITNESS FOR A PARTICULAR PURPOSE.
+
+See the GNU General Public License for more details.
+You should have received a copy of the GNU General Public License along with SPASM.
+If not, see <https://www.gnu.org/licenses/>. 
+---
+"""
+
+from spasm.pp.processor import SourceProcessor
+from spasm.pp.statement_line import StatementLinePatternParser, parse_many
+from spasm.pp.statement_line.table import (
+    LINE_KIND__BLANK,
+    LINE_KIND__COMMENT_LINE,
+    LINE_KIND__STATEMENT,
+)
+from spasm.pp.stylesheet.builtin import SPORNIKET, HERITAGE
+
+SOURCE = [
+    "aShortLabel operation operand1,operand2 comment\n",
+    "   \n",
+    "* a comment line\n",
+    'message dc.b "Done; press * to quit",0 ; the message\n',
+    " ;just a comment",
+    "",
+]
+
+
+def test_that__parse_many__classifies_lines():
+    table = parse_many(SOURCE)
+    assert len(table) == 6
+    assert list(table.kinds) == [
+        LINE_KIND__STATEMENT,
+        LINE_KIND__BLANK,
+        LINE_KIND__COMMENT_LINE,
+        LINE_KIND__STATEMENT,
+        LINE_KIND__STATEMENT,
+        LINE_KIND__BLANK,
+    ]
+    assert table.line(1) == ""
+    assert table.line(2) == "* a comment line"
+
+
+def test_that__parse_many__gives_same_fields_as_StatementLinePatternParser():
+    table = parse_many(SOURCE)
+    for i, line in enumerate(SOURCE):
+        if table.kinds[i] != LINE_KIND__STATEMENT:
+            continue
+        expected = StatementLinePatternParser().parse(line.rstrip())
+        actual = table.statementLine(i)
+        assert actual.label == expected.label
+        assert actual.mnemonic == expected.mnemonic
+        assert actual.operands == expected.operands
+        assert actual.comment == expected.comment
+    assert table.field(3, "operands") == '"Done; press * to quit",0'
+
+
+def test_that__SourceProcessor_process_table__gives_same_results_as_process_line():
+    lines = [
+        "aShortLabel operation operand1,operand2 comment",
+        " do other,thing a comment",
+        " ;just a comment",
+        "",
+        " ;just a comment",
+        " do something",
+        "*\ta comment line with a tabulation before",
+        "mymacro macro",
+    ]
+    for stylesheet in [SPORNIKET, HERITAGE]:
+        processor = SourceProcessor()
+        expected = [processor.process_line(line, stylesheet) for line in lines]
+        actual = list(SourceProcessor().process_table(parse_many(lines), stylesheet))
+        assert actual == expected
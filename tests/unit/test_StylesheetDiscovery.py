@@ -0,0 +1,161 @@
+"""
+---
+(c) 2024 David SPORN
+---
+This is part of SPASM -- Sporniket's toolbox for assembly language.
+
+SPASM is free software: you can redistribute it and/or
+modify it under the terms of the GNU General Public License as published by the
+Free Software Foundation, either version 3 of the License, or (at your option)
+any later version.
+
+SPASM is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY
+or FITNESS FOR A PARTICULAR PURPOSE.
+
+See the GNU General Public License for more details.
+You should have received a copy of the GNU General Public License along with SPASM.
+If not, see <https://www.gnu.org/licenses/>. 
+---
+"""
+
+import os
+
+import pytest
+
+from spasm.pp import PrettyPrinterCli
+from spasm.pp.cache import digest_of_stylesheet
+from spasm.pp.stylesheet.builtin import HERITAGE
+from spasm.pp.stylesheet.discovery import NAME_OF_STYLESHEET_FILE, StylesheetDiscovery
+from spasm.pp.stylesheet.frozen import freeze
+from spasm.pp.stylesheet.loader import StylesheetLoader
+
+
+def given_tree(tmp_path, stylesheets: dict) -> str:
+    """Creates the given stylesheet files (by folder), and returns the root folder."""
+    for folder, content in stylesheets.items():
+        os.makedirs(tmp_path / folder, exist_ok=True)
+        (tmp_path / folder / NAME_OF_STYLESHEET_FILE).write_text(content)
+    return str(tmp_path)
+
+
+def given_discovery(loaded: list = None) -> StylesheetDiscovery:
+    def load(path):
+        if loaded is not None:
+            loaded.append(path)
+        return StylesheetLoader(path).perform()
+
+    return StylesheetDiscovery(load, freeze(HERITAGE))
+
+
+def test_that_StylesheetDiscovery_stylesheetOf__gives_the_default_without_stylesheet_file(
+    tmp_path,
+):
+    root = given_tree(tmp_path, {})
+    discovery = given_discovery()
+    assert discovery.stylesheetOf(os.path.join(root, "a", "source.s")) is freeze(
+        HERITAGE
+    )
+
+
+def test_that_StylesheetDiscovery_stylesheetOf__uses_the_nearest_stylesheet_file(
+    tmp_path,
+):
+    root = given_tree(
+        tmp_path,
+        {
+            "project": '{"tabulation":{"width":4}}',
+            "project/sub": '{"labels":{"align":"right"}}',
+        },
+    )
+    discovery = given_discovery()
+    ofProject = discovery.stylesheetOf(os.path.join(root, "project", "x", "main.s"))
+    assert ofProject.tabulation.width == 4
+    ofSub = discovery.stylesheetOf(os.path.join(root, "project", "sub", "main.s"))
+    assert ofSub.labels.align == "right"
+    assert ofSub.tabulation.width == HERITAGE["tabulation"]["width"]
+
+
+def test_that_StylesheetDiscovery_stylesheetOf__inherits_from_the_parent_folder_when_asked_to(
+    tmp_path,
+):
+    root = given_tree(
+        tmp_path,
+        {
+            "project": '{"tabulation":{"width":4},"labels":{"align":"right"}}',
+            "project/sub": '{"inherit":true,"labels":{"postfix":":","force_postfix":true}}',
+        },
+    )
+    stylesheet = given_discovery().stylesheetOf(
+        os.path.join(root, "project", "sub", "main.s")
+    )
+    assert stylesheet.tabulation.width == 4
+    assert stylesheet.labels.align == "right"
+    assert stylesheet.labels.force_postfix is True
+    assert "inherit" not in stylesheet
+
+
+def test_that_StylesheetDiscovery_loads_each_stylesheet_file_once(tmp_path):
+    root = given_tree(tmp_path, {"project": '{"tabulation":{"width":4}}'})
+    loaded = []
+    discovery = given_discovery(loaded)
+    sources = [
+        os.path.join(root, "project", folder, f"source{i}.s")
+        for folder in ["a", "b", "."]
+        for i in range(100)
+    ]
+    assert len({discovery.stylesheetOf(s) for s in sources}) == 1
+    assert loaded == [os.path.join(root, "project", NAME_OF_STYLESHEET_FILE)]
+
+
+def test_that_StylesheetDiscovery_group__groups_sources_by_effective_stylesheet(
+    tmp_path,
+):
+    root = given_tree(
+        tmp_path,
+        {
+            "a": '{"tabulation":{"width":4}}',
+            "b": '{"labels":{"align":"right"}}',
+            "c": '{"tabulation":{"width":4}}',
+        },
+    )
+    sources = [
+        os.path.join(root, folder, "main.s") for folder in ["a", "b", "c", "d", "d"]
+    ]
+    discovery = given_discovery()
+    assert [g for _, g in discovery.group(sources)] == [
+        [sources[0], sources[2]],
+        [sources[1]],
+        [sources[3], sources[4]],
+    ]
+    assert [g for _, g in discovery.group(sources, consecutive=True)] == [
+        [sources[0]],
+        [sources[1]],
+        [sources[2]],
+        [sources[3], sources[4]],
+    ]
+
+
+def test_that_StylesheetDiscovery_reports_invalid_stylesheet_files(tmp_path):
+    root = given_tree(tmp_path, {"a": '{"inherit":"yes"}'})
+    with pytest.raises(ValueError) as error:
+        given_discovery().stylesheetOf(os.path.join(root, "a", "main.s"))
+    assert str(error.value).endswith("* inherit MUST be a bool")
+
+
+def test_that_an_explicit_stylesheet_file_ignores_inherit(tmp_path):
+    withInherit = tmp_path / "with.json"
+    withInherit.write_text('{"comments": {"prefix": "*"}, "inherit": true}')
+    withoutInherit = tmp_path / "without.json"
+    withoutInherit.write_text('{"comments": {"prefix": "*"}}')
+    cli = PrettyPrinterCli()
+
+    stylesheet = cli.retrieveStyleSheet(f"file:{withInherit}")
+    assert "inherit" not in stylesheet
+    assert stylesheet == cli.retrieveStyleSheet(f"file:{withoutInherit}")
+    assert hash(stylesheet) == hash(cli.retrieveStyleSheet(f"file:{withoutInherit}"))
+    assert digest_of_stylesheet(stylesheet) == digest_of_stylesheet(
+        cli.retrieveStyleSheet(f"file:{withoutInherit}")
+    )
+    # kept for the discovery
+    assert cli.loadStylesheetFile(str(withInherit))["inherit"] is True
@@ -0,0 +1,132 @@
+"""
+---
+(c) 2024 David SPORN
+---
+This is part of SPASM -- Sporniket's toolbox for assembly language.
+
+SPASM is free software: you can redistribute it and/or
+modify it under the terms of the GNU General Public License as published by the
+Free Software Foundation, either version 3 of the License, or (at your option)
+any later version.
+
+SPASM is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY
+or FITNESS FOR A PARTICULAR PURPOSE.
+
+See the GNU General Public License for more details.
+You should have received a copy of the GNU General Public License along with SPASM.
+If not, see <https://www.gnu.org/licenses/>. 
+---
+"""
+
+import os
+from unittest.mock import patch
+
+import pytest
+
+from spasm.pp.cache import ValidatedStylesheetsCache
+from spasm.pp.stylesheet.builtin import HERITAGE, SPORNIKET
+from spasm.pp.stylesheet.frozen import freeze
+from spasm.pp.stylesheet.loader import StylesheetLoader
+
+CONTENT = '{"labels":{"align":"right"},"tabulation":{"width":4}}'
+ONE_HOUR_AGO = 3600_000_000_000
+
+
+def given_stylesheet_file(tmp_path, content=CONTENT, *, old=True) -> str:
+    path = str(tmp_path / "stylesheet.json")
+    with open(path, "wt") as f:
+        f.write(content)
+    if old:
+        # old enough to not be racy
+        mtime = os.stat(path).st_mtime_ns - ONE_HOUR_AGO
+        os.utime(path, ns=(mtime, mtime))
+    return path
+
+
+def given_cache(tmp_path, version="1") -> ValidatedStylesheetsCache:
+    return ValidatedStylesheetsCache(str(tmp_path / "cache"), version=version)
+
+
+def test_that__ValidatedStylesheetsCache_load__gives_the_same_stylesheet_as_StylesheetLoader(
+    tmp_path,
+):
+    path = given_stylesheet_file(tmp_path)
+    for reference in [HERITAGE, SPORNIKET]:
+        expected = StylesheetLoader(path, reference=reference).perform()
+        assert given_cache(tmp_path).load(path, reference=reference) == expected
+        stylesheet = given_cache(tmp_path).load(path, reference=reference)
+        assert stylesheet == expected
+        assert stylesheet.comments is freeze(reference).comments
+
+
+def test_that__ValidatedStylesheetsCache_load__does_not_read_a_known_file_again(
+    tmp_path,
+):
+    path = given_stylesheet_file(tmp_path)
+    given_cache(tmp_path).load(path)
+    realOpen = open
+
+    def openAnythingButTheStylesheet(file, *args, **kwargs):
+        assert file != path
+        return realOpen(file, *args, **kwargs)
+
+    with patch("builtins.open", side_effect=openAnythingButTheStylesheet):
+        assert given_cache(tmp_path).load(path).labels.align == "right"
+
+
+def test_that__ValidatedStylesheetsCache_load__verifies_a_racy_file_by_digest(
+    tmp_path,
+):
+    path = given_stylesheet_file(tmp_path, old=False)
+    given_cache(tmp_path).load(path)
+    with patch.object(StylesheetLoader, "performOn", side_effect=AssertionError):
+        assert given_cache(tmp_path).load(path).tabulation.width == 4
+
+
+def test_that__ValidatedStylesheetsCache_load__validates_a_modified_file_again(
+    tmp_path,
+):
+    path = given_stylesheet_file(tmp_path)
+    given_cache(tmp_path).load(path)
+    path = given_stylesheet_file(tmp_path, '{"tabulation":{"width":2}}')
+    assert given_cache(tmp_path).load(path).tabulation.width == 2
+
+
+def test_that__ValidatedStylesheetsCache_load__ignores_entries_of_other_versions(
+    tmp_path,
+):
+    path = given_stylesheet_file(tmp_path)
+    given_cache(tmp_path, version="1").load(path)
+    with patch.object(
+        StylesheetLoader, "performOn", side_effect=AssertionError
+    ) as performOn:
+        with pytest.raises(AssertionError):
+            given_cache(tmp_path, version="2").load(path)
+        assert performOn.called
+
+
+def test_that__ValidatedStylesheetsCache_load__ignores_corrupted_entries(tmp_path):
+    path = given_stylesheet_file(tmp_path)
+    cache = given_cache(tmp_path)
+    cache.load(path)
+    with open(cache.pathOfEntry(path), "wb") as f:
+        f.write(b"garbage")
+    assert given_cache(tmp_path).load(path).labels.align == "right"
+
+
+def test_that__ValidatedStylesheetsCache_load__reports_errors_like_StylesheetLoader(
+    tmp_path,
+):
+    path = given_stylesheet_file(tmp_path, '{"tabulation":{"width":0}}')
+    with pytest.raises(ValueError) as expected:
+        StylesheetLoader(path).perform()
+    for _ in range(2):
+        with pytest.raises(ValueError) as error:
+            given_cache(tmp_path).load(path)
+        assert str(error.value) == str(expected.value)
+    assert not os.path.exists(given_cache(tmp_path).pathOfEntry(path))
+
+    with pytest.raises(ValueError) as error:
+        given_cache(tmp_path).load(str(tmp_path / "missing.json"))
+    assert str(error.value).startswith("File not found or not a regular file")
@@ -0,0 +1,198 @@
+"""
+---
+(c) 2024 David SPORN
+---
+This is part of SPASM -- Sporniket's toolbox for assembly language.
+
+SPASM is free software: you can redistribute it and/or
+modify it under the terms of the GNU General Public License as published by the
+Free Software Foundation, either version 3 of the License, or (at your option)
+any later version.
+
+SPASM is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY
+or FITNESS FOR A PARTICULAR PURPOSE.
+
+See the GNU General Public License for more details.
+You should have received a copy of the GNU General Public License along with SPASM.
+If not, see <https://www.gnu.org/licenses/>. 
+---
+"""
+
+import json
+
+import pytest
+
+from spasm.pp.benchmark.compare import (
+    STATUS__IMPROVEMENT,
+    STATUS__MISSING,
+    STATUS__OK,
+    STATUS__REGRESSION,
+    ComparisonCli,
+    compare_results,
+    spread_of,
+)
+
+
+def results_of(*timingsByBenchmark, corpus=None) -> dict:
+    return {
+        "version": 1,
+        "corpus": corpus or {"lines": 100, "seed": 1},
+        "parser": "state-machine",
+        "renderer": "slicing",
+        "repeat": 5,
+        "results": [
+            {"benchmark": benchmark, "stylesheet": stylesheet, "timings": timings}
+            for benchmark, stylesheet, timings in timingsByBenchmark
+        ],
+    }
+
+
+def test_that_spread_of_gives_the_median_absolute_deviation():
+    assert spread_of([1.0, 1.0, 1.0]) == 0
+    assert spread_of([1.0, 1.1, 0.9, 1.0, 5.0]) == pytest.approx(0.1)
+
+
+def test_that_compare_results_detects_regressions_beyond_the_threshold_and_the_noise():
+    baseline = results_of(
+        ("parse", None, [1.0, 1.0, 1.0]),
+        ("render", "heritage", [1.0, 1.0, 1.0]),
+        ("render", "sporniket", [1.0, 0.5, 1.5]),
+        ("stdin", "heritage", [1.0, 1.0, 1.0]),
+        ("rewrite", "heritage", [1.0, 1.0, 1.0]),
+    )
+    current = results_of(
+        ("parse", None, [1.2, 1.2, 1.2]),
+        ("render", "heritage", [1.05, 1.05, 1.05]),
+        ("render", "sporniket", [1.2, 1.2, 1.2]),
+        ("stdin", "heritage", [0.5, 0.5, 0.5]),
+    )
+    comparisons = compare_results(baseline, current, 10)
+    assert [c["status"] for c in comparisons] == [
+        STATUS__REGRESSION,
+        STATUS__OK,  # under the threshold
+        STATUS__OK,  # under the noise
+        STATUS__IMPROVEMENT,
+        STATUS__MISSING,
+    ]
+    assert comparisons[0]["change"] == pytest.approx(20)
+
+
+def given_results_file(tmp_path, name: str, results: dict) -> str:
+    path = str(tmp_path / name)
+    with open(path, "wt") as f:
+        json.dump(results, f)
+    return path
+
+
+def test_that_ComparisonCli_fails_when_a_metric_regresses(tmp_path, capsys):
+    baseline = given_results_file(
+        tmp_path, "baseline.json", results_of(("parse", None, [1.0, 1.0, 1.0]))
+    )
+    current = given_results_file(
+        tmp_path, "current.json", results_of(("parse", None, [1.5, 1.5, 1.5]))
+    )
+    assert ComparisonCli().run([baseline, current]) == 1
+    out, err = capsys.readouterr()
+    assert out.splitlines()[1].split() == [
+        "parse",
+        "-",
+        "1000.0±0.0ms",
+        "1500.0±0.0ms",
+        "+50.0%",
+        "REGRESSION",
+    ]
+    assert (
+        err
+        == "ERROR -- some metrics regress by more than 10.0% :\n* parse (-) : +50.0%\n"
+    )
+
+    assert ComparisonCli().run([baseline, current, "--threshold", "60"]) == 0
+
+
+def test_that_ComparisonCli_rejects_results_of_different_corpus(tmp_path, capsys):
+    baseline = given_results_file(
+        tmp_path, "baseline.json", results_of(("parse", None, [1.0]))
+    )
+    current = given_results_file(
+        tmp_path,
+        "current.json",
+        results_of(("parse", None, [1.0]), corpus={"lines": 100, "seed": 2}),
+    )
+    assert ComparisonCli().run([baseline, current]) == 1
+    assert capsys.readouterr().err.startswith(
+        "ERROR -- the results are not comparable, the corpus differs"
+    )
+
+
+def test_that_ComparisonCli_runs_the_benchmarks_of_the_baseline_again(tmp_path, capsys):
+    baseline = given_results_file(
+        tmp_path,
+        "baseline.json",
+        results_of(("parse", None, [60.0]), ("render", "sporniket", [60.0])),
+    )
+    output = str(tmp_path / "current.json")
+    assert ComparisonCli().run([baseline, "--repeat", "2", "--output", output]) == 0
+    with open(output) as f:
+        current = json.load(f)
+    assert current["corpus"] == {"lines": 100, "seed": 1}
+    assert [(r["benchmark"], r["stylesheet"]) for r in current["results"]] == [
+        ("parse", None),
+        ("render", "sporniket"),
+    ]
+    assert [line.split()[-1] for line in capsys.readouterr().out.splitlines()[1:]] == [
+        STATUS__IMPROVEMENT,
+        STATUS__IMPROVEMENT,
+    ]
+
+
+def test_that_ComparisonCli_fails_when_a_metric_is_missing(tmp_path, capsys):
+    baseline = given_results_file(
+        tmp_path,
+        "baseline.json",
+        results_of(("parse", None, [1.0]), ("render", "heritage", [1.0])),
+    )
+    current = given_results_file(
+        tmp_path, "current.json", results_of(("parse", None, [1.0]))
+    )
+    assert ComparisonCli().run([baseline, current]) == 1
+    assert (
+        capsys.readouterr().err
+        == "ERROR -- some metrics of the baseline are missing :\n* render (heritage)\n"
+    )
+
+    assert ComparisonCli().run([baseline, current, "--allow-missing"]) == 0
+    assert capsys.readouterr().err == ""
+
+
+def test_that_ComparisonCli_rejects_a_baseline_median_of_zero(tmp_path, capsys):
+    baseline = given_results_file(
+        tmp_path, "baseline.json", results_of(("parse", None, [0.0, 0.0, 1.0]))
+    )
+    current = given_results_file(
+        tmp_path, "current.json", results_of(("parse", None, [1.0]))
+    )
+    assert ComparisonCli().run([baseline, current]) == 1
+    assert (
+        capsys.readouterr().err
+        == "ERROR -- wrong baseline results, the median duration of parse (-) must be positive\n"
+    )
+
+
+@pytest.mark.parametrize("key", ["results", "corpus", "repeat", "timings"])
+def test_that_ComparisonCli_rejects_results_with_a_missing_key(tmp_path, capsys, key):
+    results = results_of(("parse", None, [1.0]))
+    if key == "timings":
+        del results["results"][0]["timings"]
+    else:
+        del results[key]
+    baseline = given_results_file(
+        tmp_path, "baseline.json", results_of(("parse", None, [1.0]))
+    )
+    current = given_results_file(tmp_path, "current.json", results)
+    assert ComparisonCli().run([baseline, current]) == 1
+    assert capsys.readouterr().err.startswith("ERROR -- wrong current results")
+    # when used as the baseline, including for a fresh run
+    assert ComparisonCli().run([current, baseline]) == 1
+    assert ComparisonCli().run([current]) == 1
+    assert capsys.readouterr().err.startswith("ERROR -- wrong baseline results")
@@ -0,0 +1,54 @@
+"""
+---
+(c) 2024 David SPORN
+---
+This is part of SPASM -- Sporniket's toolbox for assembly language.
+
+SPASM is free software: you can redistribute it and/or
+modify it under the terms of the GNU General Public License as published by the
+Free Software Foundation, either version 3 of the License, or (at your option)
+any later version.
+
+SPASM is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY
+or FITNESS FOR A PARTICULAR PURPOSE.
+
+See the GNU General Public License for more details.
+You should have received a copy of the GNU General Public License along with SPASM.
+If not, see <https://www.gnu.org/licenses/>. 
+---
+"""
+
+from spasm.pp.benchmark.corpus import generate_lines
+from spasm.pp.processor import SourceProcessor
+from spasm.pp.stylesheet.builtin import HERITAGE, SPORNIKET
+
+
+def test_that_generate_lines_gives_the_same_lines_for_the_same_seed():
+    assert generate_lines(500, seed=1) == generate_lines(500, seed=1)
+    assert generate_lines(500, seed=1) != generate_lines(500, seed=2)
+
+
+def test_that_generate_lines_gives_the_given_count_of_lines_with_line_feed():
+    lines = generate_lines(1234)
+    assert len(lines) == 1234
+    assert all(line.endswith("\n") and "\n" not in line[:-1] for line in lines)
+
+
+def test_that_generate_lines_gives_a_realistic_mix_of_lines():
+    lines = [line.rstrip() for line in generate_lines(2000)]
+    assert any(len(line) == 0 for line in lines)
+    assert any(line.startswith("*") and "\t" in line for line in lines)
+    assert any(line.startswith(";") for line in lines)
+    assert any('"' in line and "; not a comment" in line for line in lines)
+    assert any("macro" in line for line in lines)
+    assert any(line.strip().endswith("endm") for line in lines)
+    labels = {len(line.split()[0]) for line in lines if line[:1].isalpha()}
+    assert min(labels) < 8 and max(labels) > 30
+
+
+def test_that_generated_lines_can_be_pretty_printed():
+    lines = generate_lines(2000)
+    for stylesheet in [HERITAGE, SPORNIKET]:
+        processor = SourceProcessor()
+        assert len([processor.process_line(line, stylesheet) for line in lines]) == 2000
@@ -0,0 +1,58 @@
+"""
+---
+(c) 2024 David SPORN
+---
+This is part of SPASM -- Sporniket's toolbox for assembly language.
+
+SPASM is free software: you can redistribute it and/or
+modify it under the terms of the GNU General Public License as published by the
+Free Software Foundation, either version 3 of the License, or (at your option)
+any later version.
+
+SPASM is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY
+or FITNESS FOR A PARTICULAR PURPOSE.
+
+See the GNU General Public License for more details.
+You should have received a copy of the GNU General Public License along with SPASM.
+If not, see <https://www.gnu.org/licenses/>. 
+---
+"""
+
+from spasm.pp.batch import split_at_state_resets
+from spasm.pp.processor import SourceProcessor
+from spasm.pp.stylesheet.builtin import SPORNIKET
+
+LINES = [
+    " move.l d0,d1 ; commented operation",
+    " ; comment continuation",
+    " move.l d1,d2",
+    " ; not a continuation",
+    " move.l d2,d3 ; commented operation",
+    " ; comment continuation",
+    "",
+    " ; not a continuation",
+]
+
+
+def test_that__split_at_state_resets__starts_chunks_after_reset_lines():
+    chunks = split_at_state_resets(LINES, 1, SourceProcessor())
+    assert chunks == [range(0, 3), range(3, 7), range(7, 8)]
+
+
+def test_that__split_at_state_resets__makes_chunks_of_at_least_given_size():
+    chunks = split_at_state_resets(LINES, 4, SourceProcessor())
+    assert chunks == [range(0, 7), range(7, 8)]
+
+
+def test_that__split_at_state_resets__gives_chunks_processable_independently():
+    processor = SourceProcessor()
+    expected = [processor.process_line(line, SPORNIKET) for line in LINES]
+    actual = []
+    for chunk in split_at_state_resets(LINES, 1, SourceProcessor()):
+        processor = SourceProcessor()
+        actual += [
+            processor.process_line(line, SPORNIKET)
+            for line in LINES[chunk.start : chunk.stop]
+        ]
+    assert actual == expected